@@ -0,0 +1,29 @@
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.respostas import resposta_json
+from app.db.replicas import get_db_roteado
+from app.schemas.auditoria import AuditoriaOut
+from app.services import auditoria
+
+router = APIRouter(prefix="/auditoria", tags=["Auditoria"])
+
+@router.get("/{entidade}/{ref_id}", response_model=List[AuditoriaOut])
+def historico(
+    entidade: Literal["licitacoes", "contratos"],
+    ref_id: int,
+    response: Response,
+    antes_de: Optional[int] = Query(None, description="Cursor X-Next-Cursor da página anterior"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db_roteado),
+):
+    """Alterações de uma licitação ou contrato, da mais recente para a mais antiga.
+
+    A gravação é assíncrona: uma alteração aparece aqui até AUDITORIA_INTERVALO
+    segundos depois do commit.
+    """
+    entradas = auditoria.historico(db, entidade, ref_id, antes_de, limit)
+    if len(entradas) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(entradas[-1]["id"])
+    return resposta_json(entradas, response)
@@ -0,0 +1,32 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.replicas import get_db_roteado
+from app.schemas.busca import BuscaOut
+from app.services import busca
+
+router = APIRouter(prefix="/busca", tags=["Busca"])
+
+@router.get("", response_model=BuscaOut)
+def buscar(
+    q: str = Query(..., min_length=2, max_length=200),
+    tipo: Literal["licitacoes", "contratos", "ambos"] = "ambos",
+    offset: int = Query(0, ge=0, lt=settings.BUSCA_MAX_CANDIDATOS),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db_roteado),
+):
+    """Busca textual no objeto, órgão e fornecedor, ordenada por relevância.
+
+    O ranking cobre as BUSCA_MAX_CANDIDATOS ocorrências mais recentes de cada
+    fonte, então a paginação para em `max_resultados`; para ir além, refine os termos.
+    """
+    max_resultados = settings.BUSCA_MAX_CANDIDATOS
+    limit = min(limit, max_resultados - offset)
+    resultados = busca.buscar(db, q, tipo, offset, limit)
+    tem_mais = len(resultados) > limit and offset + limit < max_resultados
+    return {
+        "resultados": resultados[:limit],
+        "proximo_offset": offset + limit if tem_mais else None,
+        "max_resultados": max_resultados,
+    }
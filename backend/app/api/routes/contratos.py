@@ -1,69 +1,248 @@
-from fastapi import APIRouter, Depends, HTTPException
+from types import SimpleNamespace
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Response, UploadFile
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 
-from app.db.session import get_db
+from app.core import cache_http
+from app.core.respostas import colunas_de, linhas_como_dicts, resposta_json
+from app.db.replicas import get_db_roteado
+from app.db.upsert import violacao_de_unicidade
 from app.models.contrato import Contrato
 from app.schemas.contrato import ContratoCreate, ContratoOut, ContratoUpdate
+from app.services import auditoria, fornecedores, idempotencia, importacao, resumo, sincronizacao
 
 router = APIRouter(prefix="/contratos", tags=["contratos"])
 
+COLUNAS_CONTRATO = colunas_de(Contrato, ContratoOut)
+ESCOPO_CRIACAO = "POST /contratos"
+NUMERO_REPETIDO = "Já existe um contrato com este número"
+
+def _versoes_do_if_match(if_match: Optional[str]) -> Optional[List[int]]:
+    """Versões aceitas pelo If-Match ("<versao>", separadas por vírgula); None aceita qualquer uma"""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    valores = (valor.strip().removeprefix("W/").strip('"') for valor in if_match.split(","))
+    # Valor que não é versão não casa com nenhuma: lista vazia, 412
+    return [int(valor) for valor in valores if valor.isdigit()]
+
+def _sem_linha_alterada(db: Session, contrato_id: int, condicional: bool = True):
+    """O UPDATE/DELETE condicional não achou a linha: 404 se ela não existe,
+    senão 412 (ou 409, quando o cliente não mandou If-Match)"""
+    atual = db.scalar(select(Contrato.versao).where(Contrato.id == contrato_id))
+    if atual is None:
+        raise HTTPException(status_code=404, detail="Contrato não encontrado")
+    raise HTTPException(
+        status_code=412 if condicional else 409,
+        detail=f"Contrato alterado por outra requisição (versão atual: {atual})",
+    )
+
+def _executar_escrita(db: Session, stmt):
+    """Executa o comando com a violação de número único traduzida em 400"""
+    try:
+        return db.execute(stmt)
+    except IntegrityError as exc:
+        db.rollback()
+        if violacao_de_unicidade(exc, "numero_contrato"):
+            raise HTTPException(status_code=400, detail=NUMERO_REPETIDO)
+        raise
+
+def resposta_do_contrato(linha, if_none_match: Optional[str]):
+    """Contrato com ETag "<versao>" (o If-Match das escritas); 304 se o cliente já tem essa versão"""
+    if linha is None:
+        raise HTTPException(status_code=404, detail="Contrato não encontrado")
+    etag = cache_http.etag_de_versao(linha.versao)
+    if if_none_match and cache_http.casa(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    resposta = resposta_json(linha._asdict())
+    resposta.headers["ETag"] = etag
+    return resposta
+
 @router.post("/", response_model=ContratoOut)
-def criar_contrato(contrato: ContratoCreate, db: Session = Depends(get_db)):
-    """Criar um novo contrato"""
-    # Verificar se já existe um contrato com o mesmo número
-    existing_contrato = db.query(Contrato).filter(Contrato.numero_contrato == contrato.numero_contrato).first()
-    if existing_contrato:
-        raise HTTPException(status_code=400, detail="Já existe um contrato com este número")
-    
-    db_contrato = Contrato(**contrato.dict())
+def criar_contrato(
+    contrato: ContratoCreate,
+    db: Session = Depends(get_db_roteado),
+    idempotency_key: Optional[str] = Header(None, alias=idempotencia.IDEMPOTENCIA_HEADER, max_length=200),
+):
+    """Criar um novo contrato.
+
+    Com Idempotency-Key, repetir a requisição (ex.: retry depois de um timeout)
+    devolve o contrato criado na primeira vez em vez de tentar criá-lo de novo.
+    """
+    if idempotency_key:
+        impressao = idempotencia.impressao(contrato)
+        anterior = idempotencia.buscar(db, ESCOPO_CRIACAO, idempotency_key, impressao)
+        if anterior is not None:
+            return anterior
+
+    # Número repetido é barrado pela restrição UNIQUE no commit, sem consulta prévia
+    db_contrato = Contrato(
+        **contrato.dict(exclude={"fornecedor_cnpj"}),
+        fornecedor_id=fornecedores.resolver(db, contrato.fornecedor, contrato.fornecedor_cnpj),
+    )
     db.add(db_contrato)
-    db.commit()
+    resumo.ajustar_contrato(db, db_contrato, 1)
+    fornecedores.ajustar_contrato(db, db_contrato, 1)
+    try:
+        if idempotency_key:
+            db.flush()
+            idempotencia.guardar(
+                db, ESCOPO_CRIACAO, idempotency_key, impressao, 200, ContratoOut.model_validate(db_contrato)
+            )
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if idempotency_key:
+            # Uma requisição com a mesma chave terminou primeiro: devolve a resposta dela
+            anterior = idempotencia.buscar(db, ESCOPO_CRIACAO, idempotency_key, impressao)
+            if anterior is not None:
+                return anterior
+        if violacao_de_unicidade(exc, "numero_contrato"):
+            raise HTTPException(status_code=400, detail=NUMERO_REPETIDO)
+        raise
+    cache_http.invalidar("contratos")
     db.refresh(db_contrato)
     return db_contrato
 
+@router.post("/bulk")
+def importar_contratos_em_lote(
+    arquivo: UploadFile = File(...),
+    formato: Optional[Literal["ndjson", "csv"]] = None,
+    lote: int = Query(1000, ge=1, le=10000),
+    conflito: Literal["erro", "ignorar", "atualizar"] = "erro",
+    db: Session = Depends(get_db_roteado),
+):
+    """Importar contratos de um arquivo NDJSON ou CSV, gravando em lotes"""
+    formato = formato or ("csv" if (arquivo.filename or "").lower().endswith(".csv") else "ndjson")
+    try:
+        return importacao.importar(
+            db, arquivo.file, formato, ContratoCreate, importacao.processar_lote_contratos, lote, conflito
+        )
+    finally:
+        cache_http.invalidar("contratos")
+
 @router.get("/", response_model=List[ContratoOut])
-def listar_contratos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Listar todos os contratos"""
-    contratos = db.query(Contrato).offset(skip).limit(limit).all()
-    return contratos
+def listar_contratos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db_roteado)):
+    """Listar todos os contratos.
+
+    A `versao` de cada item é o ETag do contrato: If-Match: "<versao>" no PUT/DELETE.
+    """
+    stmt = select(*COLUNAS_CONTRATO).order_by(Contrato.id).offset(skip).limit(limit)
+    return resposta_json(linhas_como_dicts(db.execute(stmt)))
 
 @router.get("/{contrato_id}", response_model=ContratoOut)
-def obter_contrato(contrato_id: int, db: Session = Depends(get_db)):
-    """Obter um contrato específico"""
-    contrato = db.query(Contrato).filter(Contrato.id == contrato_id).first()
-    if not contrato:
-        raise HTTPException(status_code=404, detail="Contrato não encontrado")
-    return contrato
+def obter_contrato(
+    contrato_id: int,
+    db: Session = Depends(get_db_roteado),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Obter um contrato específico, com ETag: "<versao>" """
+    linha = db.execute(select(*COLUNAS_CONTRATO).where(Contrato.id == contrato_id)).first()
+    return resposta_do_contrato(linha, if_none_match)
 
 @router.put("/{contrato_id}", response_model=ContratoOut)
-def atualizar_contrato(contrato_id: int, contrato: ContratoUpdate, db: Session = Depends(get_db)):
-    """Atualizar um contrato"""
-    db_contrato = db.query(Contrato).filter(Contrato.id == contrato_id).first()
-    if not db_contrato:
-        raise HTTPException(status_code=404, detail="Contrato não encontrado")
-    
+def atualizar_contrato(
+    contrato_id: int,
+    contrato: ContratoUpdate,
+    db: Session = Depends(get_db_roteado),
+    if_match: Optional[str] = Header(None),
+):
+    """Atualizar um contrato.
+
+    Com If-Match: "<versao>" (o ETag do GET) a alteração só vale se ninguém mudou
+    o contrato depois; senão 412. É um único UPDATE ... WHERE versao = ?, que
+    devolve (RETURNING) a linha nova e a anterior para os contadores e a
+    auditoria. Sem o cabeçalho, a versão conferida é a lida no próprio UPDATE:
+    no Postgres (READ COMMITTED) uma edição concorrente confirmada entre a
+    leitura e a escrita zera o UPDATE, que então é repetido uma vez com um
+    snapshot novo em vez de responder 412 a quem não pediu precondição.
+    """
     update_data = contrato.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_contrato, field, value)
-    
+    cnpj = update_data.pop("fornecedor_cnpj", None)
+    if "fornecedor" in update_data:
+        update_data["fornecedor_id"] = fornecedores.resolver(db, update_data["fornecedor"], cnpj)
+
+    # Linha anterior lida no mesmo comando; MATERIALIZED faz o SQLite lê-la antes
+    # da alteração (no Postgres a CTE já vê o snapshot do início do comando)
+    antigo = select(*Contrato.__table__.c).where(Contrato.id == contrato_id).cte("antigo").prefix_with("MATERIALIZED")
+    stmt = (
+        update(Contrato)
+        .add_cte(antigo)
+        .where(Contrato.id == contrato_id, Contrato.versao == select(antigo.c.versao).scalar_subquery())
+        .values(**update_data, versao=Contrato.versao + 1)
+        .returning(
+            *COLUNAS_CONTRATO,
+            *(select(coluna).scalar_subquery().label(f"antigo_{coluna.name}") for coluna in antigo.c),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    versoes = _versoes_do_if_match(if_match)
+    if versoes is not None:
+        stmt = stmt.where(Contrato.versao.in_(versoes))
+    for _ in range(1 if versoes is not None else 2):
+        linha = _executar_escrita(db, stmt).first()
+        if linha is not None:
+            break
+    else:
+        _sem_linha_alterada(db, contrato_id, condicional=versoes is not None)
+
+    valores = linha._asdict()
+    anterior = {
+        campo.removeprefix("antigo_"): valores.pop(campo) for campo in list(valores) if campo.startswith("antigo_")
+    }
+    if cnpj and "fornecedor" not in update_data:
+        # Só o CNPJ mudou: o nome vem da linha gravada, e a linha já está travada por este UPDATE
+        valores["fornecedor_id"] = fornecedores.resolver(db, valores["fornecedor"], cnpj)
+        db.execute(
+            update(Contrato).where(Contrato.id == contrato_id).values(fornecedor_id=valores["fornecedor_id"])
+            .execution_options(synchronize_session=False)
+        )
+    for linha_do_contrato, sinal in ((SimpleNamespace(**anterior), -1), (SimpleNamespace(**valores), 1)):
+        resumo.ajustar_contrato(db, linha_do_contrato, sinal)
+        fornecedores.ajustar_contrato(db, linha_do_contrato, sinal)
+    auditoria.registrar(db, "contratos", contrato_id, auditoria.ALTERACAO, auditoria.diferencas(anterior, valores))
+
     db.commit()
-    db.refresh(db_contrato)
-    return db_contrato
+    cache_http.invalidar("contratos")
+    resposta = resposta_json(valores)
+    resposta.headers["ETag"] = cache_http.etag_de_versao(valores["versao"])
+    return resposta
 
 @router.delete("/{contrato_id}")
-def deletar_contrato(contrato_id: int, db: Session = Depends(get_db)):
-    """Deletar um contrato"""
-    db_contrato = db.query(Contrato).filter(Contrato.id == contrato_id).first()
-    if not db_contrato:
-        raise HTTPException(status_code=404, detail="Contrato não encontrado")
-    
-    db.delete(db_contrato)
+def deletar_contrato(
+    contrato_id: int,
+    db: Session = Depends(get_db_roteado),
+    if_match: Optional[str] = Header(None),
+):
+    """Deletar um contrato (com If-Match, só se ainda estiver na versão informada).
+
+    Um único DELETE ... WHERE versao = ? RETURNING, sem consulta prévia.
+    """
+    stmt = delete(Contrato).where(Contrato.id == contrato_id)
+    versoes = _versoes_do_if_match(if_match)
+    if versoes is not None:
+        stmt = stmt.where(Contrato.versao.in_(versoes))
+    linha = db.execute(
+        stmt.returning(*Contrato.__table__.c).execution_options(synchronize_session=False)
+    ).first()
+    if linha is None:
+        _sem_linha_alterada(db, contrato_id)
+
+    anterior = linha._asdict()
+    resumo.ajustar_contrato(db, linha, -1)
+    fornecedores.ajustar_contrato(db, linha, -1)
+    auditoria.registrar(
+        db, "contratos", contrato_id, auditoria.EXCLUSAO,
+        auditoria.valores({campo: valor for campo, valor in anterior.items() if campo != "id"}),
+    )
+    sincronizacao.registrar_exclusao(db, "contratos", contrato_id)
     db.commit()
+    cache_http.invalidar("contratos")
     return {"message": "Contrato deletado com sucesso"}
 
 @router.get("/licitacao/{licitacao_id}", response_model=List[ContratoOut])
-def listar_contratos_por_licitacao(licitacao_id: int, db: Session = Depends(get_db)):
+def listar_contratos_por_licitacao(licitacao_id: int, db: Session = Depends(get_db_roteado)):
     """Listar contratos de uma licitação específica"""
-    contratos = db.query(Contrato).filter(Contrato.licitacao_id == licitacao_id).all()
-    return contratos
\ No newline at end of file
+    stmt = select(*COLUNAS_CONTRATO).where(Contrato.licitacao_id == licitacao_id)
+    return resposta_json(linhas_como_dicts(db.execute(stmt)))
\ No newline at end of file
@@ -0,0 +1,79 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.db.replicas import get_db_roteado
+from app.models.licitacao import Licitacao
+from app.models.resumo import ResumoDashboard
+from app.schemas.dashboard import ResumoDashboardOut
+from app.services import resumo
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+@router.get("/resumo", response_model=ResumoDashboardOut)
+def obter_resumo(ano: Optional[int] = None, db: Session = Depends(get_db_roteado)):
+    """Indicadores do dashboard lidos da tabela de contadores agregados"""
+    ano = ano or date.today().year
+
+    totais = {
+        entidade: (quantidade or 0, valor or 0)
+        for entidade, quantidade, valor in db.execute(
+            select(
+                ResumoDashboard.entidade,
+                func.sum(ResumoDashboard.quantidade),
+                func.sum(ResumoDashboard.valor_total),
+            ).group_by(ResumoDashboard.entidade)
+        )
+    }
+
+    licitacoes_por_mes = [0] * 12
+    contratos_valor_por_mes = [0] * 12
+    for entidade, mes, quantidade, valor in db.execute(
+        select(
+            ResumoDashboard.entidade,
+            ResumoDashboard.mes,
+            func.sum(ResumoDashboard.quantidade),
+            func.sum(ResumoDashboard.valor_total),
+        )
+        .where(
+            ResumoDashboard.entidade.in_([resumo.LICITACOES, resumo.CONTRATOS]),
+            ResumoDashboard.ano == ano,
+        )
+        .group_by(ResumoDashboard.entidade, ResumoDashboard.mes)
+    ):
+        if entidade == resumo.LICITACOES:
+            licitacoes_por_mes[mes - 1] = quantidade
+        else:
+            contratos_valor_por_mes[mes - 1] = valor
+
+    licitacoes_por_status = dict(
+        db.execute(
+            select(ResumoDashboard.status, func.sum(ResumoDashboard.quantidade))
+            .where(ResumoDashboard.entidade == resumo.LICITACOES)
+            .group_by(ResumoDashboard.status)
+            .having(func.sum(ResumoDashboard.quantidade) > 0)
+        ).all()
+    )
+
+    # Últimas licitações via índice (data_abertura, id_licitacao)
+    ultimas = (
+        db.query(Licitacao)
+        .order_by(Licitacao.data_abertura.desc(), Licitacao.id_licitacao.desc())
+        .limit(5)
+        .all()
+    )
+
+    return {
+        "ano": ano,
+        "total_licitacoes": totais.get(resumo.LICITACOES, (0, 0))[0],
+        "total_contratos": totais.get(resumo.CONTRATOS, (0, 0))[0],
+        "valor_total_contratos": totais.get(resumo.CONTRATOS, (0, 0))[1],
+        "total_usuarios": totais.get(resumo.USUARIOS, (0, 0))[0],
+        "notificacoes_nao_lidas": totais.get(resumo.NOTIFICACOES_NAO_LIDAS, (0, 0))[0],
+        "licitacoes_por_mes": licitacoes_por_mes,
+        "licitacoes_por_trimestre": [sum(licitacoes_por_mes[t * 3:t * 3 + 3]) for t in range(4)],
+        "valor_contratos_por_trimestre": [sum(contratos_valor_por_mes[t * 3:t * 3 + 3]) for t in range(4)],
+        "licitacoes_por_status": licitacoes_por_status,
+        "ultimas_licitacoes": ultimas,
+    }
@@ -0,0 +1,95 @@
+"""Push de notificações novas via Server-Sent Events.
+
+Registrado antes dos demais routers para que /notificacoes/stream não seja
+capturado por /notificacoes/{notificacao_id}.
+"""
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.eventos import central_de_eventos
+from app.db.session import SessionLocal
+from app.models.notificacao import Notificacao
+from app.schemas.notificacao import NotificacaoOut
+from app.services import leituras
+
+router = APIRouter(prefix="/notificacoes", tags=["Notificações"])
+
+
+def _evento(evento_id: int, dados: str, tipo: str = "notificacao") -> str:
+    return f"id: {evento_id}\nevent: {tipo}\ndata: {dados}\n\n"
+
+
+def _pendentes(usuario_id: Optional[int], ultimo_id: int):
+    """Notificações criadas depois de `ultimo_id`; None se passarem do limite de reenvio"""
+    # Mesma consulta da listagem: as globais saem com o estado de leitura do usuário
+    stmt = (
+        leituras.consulta_notificacoes(usuario_id)
+        .where(Notificacao.id > ultimo_id)
+        .order_by(None)
+        .order_by(Notificacao.id)
+        .limit(settings.SSE_REPLAY_LIMIT + 1)
+    )
+    db = SessionLocal()
+    try:
+        notificacoes = leituras.montar_notificacoes(db.execute(stmt))
+        if len(notificacoes) > settings.SSE_REPLAY_LIMIT:
+            return None, db.scalar(select(func.max(Notificacao.id)))
+        return [(n["id"], NotificacaoOut.model_validate(n).model_dump_json()) for n in notificacoes], None
+    finally:
+        db.close()
+
+
+@router.get("/stream")
+async def stream_notificacoes(
+    usuario_id: Optional[int] = None,
+    ultimo_id: Optional[int] = None,
+    last_event_id: Optional[int] = Header(None),
+):
+    """Stream das notificações novas do usuário (e das globais).
+
+    Na reconexão o navegador envia Last-Event-ID e as perdidas são reenviadas;
+    `ultimo_id` faz o mesmo na primeira conexão. O evento "sincronizar" pede ao
+    cliente que recarregue a lista (fila cheia ou muitas pendentes).
+    """
+    assinatura = central_de_eventos.assinar(usuario_id)
+    desde = last_event_id if last_event_id is not None else ultimo_id
+
+    async def eventos():
+        try:
+            yield "retry: 3000\n\n"
+            reenviados = set()
+            if desde is not None:
+                pendentes, ultimo = await run_in_threadpool(_pendentes, usuario_id, desde)
+                if pendentes is None:
+                    yield _evento(ultimo, "{}", "sincronizar")
+                else:
+                    for evento_id, dados in pendentes:
+                        reenviados.add(evento_id)
+                        yield _evento(evento_id, dados)
+            while True:
+                try:
+                    evento_id, dados = await asyncio.wait_for(assinatura.fila.get(), settings.SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    # Comentário SSE: mantém proxies e o navegador com a conexão aberta
+                    yield ": ping\n\n"
+                    continue
+                if evento_id not in reenviados:
+                    yield _evento(evento_id, dados)
+                if assinatura.atrasada and assinatura.fila.empty():
+                    # Eventos descartados viram um único aviso para recarregar
+                    assinatura.atrasada = False
+                    yield _evento(assinatura.ultimo_descartado, "{}", "sincronizar")
+        finally:
+            central_de_eventos.cancelar(assinatura)
+
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,55 @@
+from datetime import date
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import OperationalError
+from app.db.replicas import roteador, sessao_para
+from app.services import exportacao
+
+router = APIRouter(prefix="/exportacao", tags=["Exportação"])
+
+@router.get("/{tabela}")
+def exportar_tabela(
+    request: Request,
+    tabela: Literal["licitacoes", "contratos"],
+    formato: Literal["parquet", "arrow"] = "parquet",
+    desde: int = Query(0, ge=0, description="Marca d'água da exportação anterior (X-Export-Watermark)"),
+):
+    """Exporta as linhas com id acima de `desde` em Parquet ou Arrow IPC, em streaming"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise HTTPException(status_code=501, detail="Exportação indisponível: instale o pyarrow")
+    # Leitura longa: sessão própria, viva enquanto o corpo é enviado. A marca
+    # d'água e as linhas saem dela, então da mesma réplica: outra, mais
+    # atrasada, poderia ainda não ter linhas abaixo da marca, que se perderiam
+    db, replica = sessao_para(request)
+    try:
+        # Fixada antes da leitura, com margem para transações ainda abertas: o
+        # que for mais novo que ela fica para a próxima exportação
+        ate = max(exportacao.marca_dagua(db, tabela), desde)
+    except OperationalError:
+        if replica is not None:
+            roteador.marcar_falha(replica)
+        db.close()
+        raise
+    except Exception:
+        db.close()
+        raise
+
+    def conteudo():
+        try:
+            yield from exportacao.exportar(db, tabela, formato, desde, ate)
+        finally:
+            db.close()
+
+    media_type, extensao = exportacao.FORMATOS[formato]
+    nome_arquivo = f"{tabela}_{desde}-{ate}_{date.today().isoformat()}.{extensao}"
+    return StreamingResponse(
+        conteudo(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{nome_arquivo}"',
+            exportacao.MARCA_DAGUA_HEADER: str(ate),
+        },
+    )
@@ -0,0 +1,69 @@
+import re
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.db.replicas import get_db_roteado
+from app.models.fornecedor import Fornecedor, ResumoFornecedor
+from app.schemas.fornecedor import FornecedorOut, RankingFornecedorOut, ResumoFornecedorOut, TotaisFornecedor
+from app.services import fornecedores
+
+router = APIRouter(prefix="/fornecedores", tags=["Fornecedores"])
+
+COLUNAS_TOTAIS = (ResumoFornecedor.ano, ResumoFornecedor.quantidade, ResumoFornecedor.valor_total, ResumoFornecedor.ativos)
+
+@router.get("", response_model=List[FornecedorOut])
+def listar_fornecedores(
+    nome: Optional[str] = None,
+    cnpj: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db_roteado),
+):
+    """Procura fornecedores pelo CNPJ ou pelo início do nome (sem acentos e caixa)"""
+    stmt = select(Fornecedor)
+    if cnpj:
+        stmt = stmt.where(Fornecedor.cnpj == re.sub(r"\D", "", cnpj))
+    if nome:
+        stmt = stmt.where(Fornecedor.nome_normalizado.startswith(fornecedores.normalizar_nome(nome), autoescape=True))
+    return db.scalars(stmt.order_by(Fornecedor.nome_normalizado).limit(limit)).all()
+
+@router.get("/ranking", response_model=List[RankingFornecedorOut])
+def ranking_fornecedores(
+    ano: Optional[int] = None,
+    ordem: Literal["valor_total", "quantidade"] = "valor_total",
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db_roteado),
+):
+    """Maiores fornecedores por valor contratado ou por número de contratos, no ano ou no total"""
+    coluna = getattr(ResumoFornecedor, ordem)
+    linhas = db.execute(
+        select(Fornecedor, *COLUNAS_TOTAIS)
+        .join(Fornecedor, Fornecedor.id == ResumoFornecedor.fornecedor_id)
+        .where(ResumoFornecedor.ano == (ano or fornecedores.TODOS_OS_ANOS), ResumoFornecedor.quantidade > 0)
+        # Mesma ordem do índice (ano, coluna, fornecedor_id): sem ordenação extra
+        .order_by(coluna.desc(), ResumoFornecedor.fornecedor_id.desc())
+        .limit(limit)
+    )
+    return [
+        {"fornecedor": fornecedor, "ano": ano_linha, "quantidade": quantidade, "valor_total": valor, "ativos": ativos}
+        for fornecedor, ano_linha, quantidade, valor, ativos in linhas
+    ]
+
+@router.get("/{fornecedor_id}/resumo", response_model=ResumoFornecedorOut)
+def resumo_fornecedor(fornecedor_id: int, ano: Optional[int] = None, db: Session = Depends(get_db_roteado)):
+    """Contratos, valor total e contratos ativos do fornecedor: no ano pedido (ou em todos) e por ano"""
+    fornecedor = db.get(Fornecedor, fornecedor_id)
+    if not fornecedor:
+        raise HTTPException(status_code=404, detail="Fornecedor não encontrado")
+    totais = {
+        linha.ano: TotaisFornecedor(**linha._mapping)
+        for linha in db.execute(
+            select(*COLUNAS_TOTAIS).where(ResumoFornecedor.fornecedor_id == fornecedor_id).order_by(ResumoFornecedor.ano)
+        )
+    }
+    alvo = ano or fornecedores.TODOS_OS_ANOS
+    return {
+        "fornecedor": fornecedor,
+        "total": totais.get(alvo, TotaisFornecedor(ano=alvo)),
+        "por_ano": [t for a, t in totais.items() if a != fornecedores.TODOS_OS_ANOS and t.quantidade > 0],
+    }
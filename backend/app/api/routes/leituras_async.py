@@ -0,0 +1,117 @@
+"""Versões assíncronas das rotas de leitura, ativadas com ASYNC_DB=true.
+
+São registradas antes dos routers síncronos em main.py e, por terem o mesmo
+caminho e método, atendem os GETs no lugar deles. As escritas continuam nos
+handlers síncronos, que mantêm os contadores do dashboard na mesma transação.
+"""
+from datetime import date
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.core.respostas import linhas_como_dicts, resposta_json
+from app.db.replicas import get_async_db_roteado
+from app.models.contrato import Contrato
+from app.models.licitacao import Licitacao
+from app.models.notificacao import Notificacao
+from app.schemas.contrato import ContratoOut
+from app.schemas.licitacao import LicitacaoDetalhe
+from app.schemas.user import UserOut
+from app.schemas.notificacao import NotificacaoOut
+from app.services import leituras
+from app.api.routes.contratos import COLUNAS_CONTRATO, resposta_do_contrato
+from app.api.routes.licitacoes import consulta_listagem, consulta_resumo_contratos, montar_detalhes, paginar
+from app.api.routes.users import COLUNAS_USUARIO
+
+router = APIRouter()
+
+# Licitações
+@router.get("/licitacoes", tags=["Licitações"])
+async def listar_licitacoes(
+    response: Response,
+    status_filtro: Optional[str] = Query(None, alias="status"),
+    modalidade: Optional[str] = None,
+    orgao_responsavel: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    expand: Optional[Literal["contratos"]] = None,
+    db: AsyncSession = Depends(get_async_db_roteado),
+):
+    stmt = consulta_listagem(status_filtro, modalidade, orgao_responsavel, data_inicio, data_fim, cursor, limit, expand)
+    if expand != "contratos":
+        return resposta_json(linhas_como_dicts(paginar((await db.execute(stmt)).all(), limit, response)), response)
+    licitacoes = paginar((await db.scalars(stmt)).all(), limit, response)
+    if not licitacoes:
+        return licitacoes
+    linhas = (await db.execute(consulta_resumo_contratos([lic.id_licitacao for lic in licitacoes]))).all()
+    return montar_detalhes(licitacoes, linhas)
+
+@router.get("/licitacoes/{id_licitacao}", tags=["Licitações"])
+async def obter_licitacao(id_licitacao: int, db: AsyncSession = Depends(get_async_db_roteado)):
+    lic = await db.get(Licitacao, id_licitacao)
+    if not lic:
+        raise HTTPException(404, "Licitação não encontrada")
+    return lic
+
+@router.get("/licitacoes/{id_licitacao}/detalhe", response_model=LicitacaoDetalhe, tags=["Licitações"])
+async def detalhe_licitacao(id_licitacao: int, db: AsyncSession = Depends(get_async_db_roteado)):
+    lic = await db.scalar(
+        select(Licitacao).options(selectinload(Licitacao.contratos)).where(Licitacao.id_licitacao == id_licitacao)
+    )
+    if not lic:
+        raise HTTPException(404, "Licitação não encontrada")
+    linhas = (await db.execute(consulta_resumo_contratos([id_licitacao]))).all()
+    return montar_detalhes([lic], linhas)[0]
+
+# Contratos
+@router.get("/contratos/", response_model=List[ContratoOut], tags=["contratos"])
+async def listar_contratos(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db_roteado)):
+    """Listar todos os contratos"""
+    stmt = select(*COLUNAS_CONTRATO).order_by(Contrato.id).offset(skip).limit(limit)
+    return resposta_json(linhas_como_dicts(await db.execute(stmt)))
+
+@router.get("/contratos/{contrato_id}", response_model=ContratoOut, tags=["contratos"])
+async def obter_contrato(
+    contrato_id: int,
+    db: AsyncSession = Depends(get_async_db_roteado),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Obter um contrato específico, com ETag: "<versao>" """
+    linha = (await db.execute(select(*COLUNAS_CONTRATO).where(Contrato.id == contrato_id))).first()
+    return resposta_do_contrato(linha, if_none_match)
+
+@router.get("/contratos/licitacao/{licitacao_id}", response_model=List[ContratoOut], tags=["contratos"])
+async def listar_contratos_por_licitacao(licitacao_id: int, db: AsyncSession = Depends(get_async_db_roteado)):
+    """Listar contratos de uma licitação específica"""
+    stmt = select(*COLUNAS_CONTRATO).where(Contrato.licitacao_id == licitacao_id)
+    return resposta_json(linhas_como_dicts(await db.execute(stmt)))
+
+# Notificações
+@router.get("/notificacoes/", response_model=List[NotificacaoOut], tags=["Notificações"])
+async def listar_notificacoes(
+    usuario_id: Optional[int] = None,
+    apenas_nao_lidas: bool = False,
+    db: AsyncSession = Depends(get_async_db_roteado),
+):
+    """Lista notificações. Se usuario_id for fornecido, filtra por usuário específico + globais"""
+    linhas = await db.execute(leituras.consulta_notificacoes(usuario_id, apenas_nao_lidas))
+    return resposta_json(leituras.montar_notificacoes(linhas))
+
+@router.get("/notificacoes/{notificacao_id}", response_model=NotificacaoOut, tags=["Notificações"])
+async def obter_notificacao(notificacao_id: int, db: AsyncSession = Depends(get_async_db_roteado)):
+    """Obtém uma notificação específica"""
+    notificacao = await db.get(Notificacao, notificacao_id)
+    if not notificacao:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Notificação não encontrada"
+        )
+    return notificacao
+
+# Usuários
+@router.get("/usuarios", response_model=List[UserOut], tags=["Usuários"])
+async def listar_usuarios(db: AsyncSession = Depends(get_async_db_roteado)):
+    return resposta_json(linhas_como_dicts(await db.execute(select(*COLUNAS_USUARIO))))
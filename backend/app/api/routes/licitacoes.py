@@ -1,36 +1,184 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from datetime import date
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from sqlalchemy import Select, and_, case, func, or_, select
+from sqlalchemy.orm import Session, selectinload
+from app.core import cache_http
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.core.respostas import colunas_de, linhas_como_dicts, resposta_json
+from app.db.replicas import get_db_roteado
+from app.models.contrato import Contrato
 from app.models.licitacao import Licitacao
-from app.schemas.licitacao import LicitacaoCreate
+from app.schemas.licitacao import LicitacaoCreate, LicitacaoDetalhe, LicitacaoOut, ResumoContratos
+from app.services import importacao, resumo
 
 router = APIRouter(prefix="/licitacoes", tags=["Licitações"])
 
+COLUNAS_LISTAGEM = colunas_de(Licitacao, LicitacaoOut)
+
+def consulta_listagem(
+    status_filtro: Optional[str] = None,
+    modalidade: Optional[str] = None,
+    orgao_responsavel: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    expand: Optional[str] = None,
+) -> Select:
+    """Monta o SELECT da listagem; compartilhado pelas rotas síncronas e assíncronas.
+
+    Sem expand devolve só as colunas de LicitacaoOut, como linhas (db.execute);
+    com expand=contratos devolve objetos Licitacao (db.scalars).
+    """
+    if expand == "contratos":
+        # Um único SELECT ... WHERE licitacao_id IN (...) para a página inteira
+        stmt = select(Licitacao).options(selectinload(Licitacao.contratos))
+    else:
+        stmt = select(*COLUNAS_LISTAGEM)
+
+    if status_filtro:
+        stmt = stmt.where(Licitacao.status == status_filtro)
+    if modalidade:
+        stmt = stmt.where(Licitacao.modalidade == modalidade)
+    if orgao_responsavel:
+        stmt = stmt.where(Licitacao.orgao_responsavel == orgao_responsavel)
+    if data_inicio:
+        stmt = stmt.where(Licitacao.data_abertura >= data_inicio)
+    if data_fim:
+        stmt = stmt.where(Licitacao.data_abertura <= data_fim)
+
+    posicao = decode_cursor(cursor)
+    if posicao:
+        data_ref, id_ref = posicao
+        stmt = stmt.where(
+            or_(
+                Licitacao.data_abertura < data_ref,
+                and_(Licitacao.data_abertura == data_ref, Licitacao.id_licitacao < id_ref),
+            )
+        )
+
+    # Busca uma linha a mais para saber se existe próxima página
+    return (
+        stmt.order_by(Licitacao.data_abertura.desc(), Licitacao.id_licitacao.desc())
+        .limit(limit + 1)
+    )
+
+def paginar(licitacoes: list, limit: int, response: Response) -> list:
+    """Corta a linha extra e devolve o cursor da próxima página no cabeçalho"""
+    if len(licitacoes) > limit:
+        licitacoes = licitacoes[:limit]
+        ultima = licitacoes[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(ultima.data_abertura, ultima.id_licitacao)
+    return licitacoes
+
+def consulta_resumo_contratos(ids: List[int]) -> Select:
+    """Quantidade, valor somado e contratos em vigor por licitação, em uma consulta agrupada"""
+    ativos = func.sum(case((Contrato.status.in_(settings.ALERTA_STATUS_CONTRATO), 1), else_=0))
+    return (
+        select(Contrato.licitacao_id, func.count(Contrato.id), func.sum(Contrato.valor_total), ativos)
+        .where(Contrato.licitacao_id.in_(ids))
+        .group_by(Contrato.licitacao_id)
+    )
+
+def montar_detalhes(licitacoes: list, linhas_resumo) -> List[LicitacaoDetalhe]:
+    """Junta as licitações (com contratos já carregados) aos totais da consulta agrupada"""
+    resumos = {
+        licitacao_id: ResumoContratos(quantidade=quantidade, valor_total=valor_total, ativos=ativos)
+        for licitacao_id, quantidade, valor_total, ativos in linhas_resumo
+    }
+    detalhes = []
+    for lic in licitacoes:
+        detalhe = LicitacaoDetalhe.model_validate(lic)
+        detalhe.resumo_contratos = resumos.get(lic.id_licitacao, ResumoContratos())
+        detalhes.append(detalhe)
+    return detalhes
+
 @router.get("")
-def listar(db: Session = Depends(get_db)):
-    return db.query(Licitacao).all()
+def listar(
+    response: Response,
+    status_filtro: Optional[str] = Query(None, alias="status"),
+    modalidade: Optional[str] = None,
+    orgao_responsavel: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    expand: Optional[Literal["contratos"]] = None,
+    db: Session = Depends(get_db_roteado),
+):
+    """Lista licitações paginadas por cursor (data_abertura desc, id_licitacao desc).
+
+    O cursor da próxima página volta no cabeçalho X-Next-Cursor. Com
+    expand=contratos cada item traz os contratos e o resumo deles.
+    """
+    stmt = consulta_listagem(status_filtro, modalidade, orgao_responsavel, data_inicio, data_fim, cursor, limit, expand)
+    if expand != "contratos":
+        return resposta_json(linhas_como_dicts(paginar(db.execute(stmt).all(), limit, response)), response)
+    licitacoes = paginar(db.scalars(stmt).all(), limit, response)
+    if not licitacoes:
+        return licitacoes
+    linhas = db.execute(consulta_resumo_contratos([lic.id_licitacao for lic in licitacoes])).all()
+    return montar_detalhes(licitacoes, linhas)
 
 @router.post("", status_code=status.HTTP_201_CREATED)
-def criar(payload: LicitacaoCreate, db: Session = Depends(get_db)):
+def criar(payload: LicitacaoCreate, db: Session = Depends(get_db_roteado)):
     if db.query(Licitacao).filter(Licitacao.numero_processo == payload.numero_processo).first():
         raise HTTPException(409, "Número de processo já cadastrado")
     nova = Licitacao(**payload.model_dump())
     db.add(nova)
+    resumo.ajustar_licitacao(db, nova, 1)
     db.commit()
+    cache_http.invalidar("licitacoes")
     db.refresh(nova)
     return nova
 
+@router.post("/bulk")
+def importar_em_lote(
+    arquivo: UploadFile = File(...),
+    formato: Optional[Literal["ndjson", "csv"]] = None,
+    lote: int = Query(1000, ge=1, le=10000),
+    conflito: Literal["erro", "ignorar", "atualizar"] = "erro",
+    db: Session = Depends(get_db_roteado),
+):
+    """Importa licitações de um arquivo NDJSON ou CSV, gravando em lotes.
+
+    Retorna os totais e a lista de erros por linha do arquivo.
+    """
+    formato = formato or ("csv" if (arquivo.filename or "").lower().endswith(".csv") else "ndjson")
+    try:
+        return importacao.importar(
+            db, arquivo.file, formato, LicitacaoCreate, importacao.processar_lote_licitacoes, lote, conflito
+        )
+    finally:
+        # Os lotes já gravados ficam mesmo se a importação parar no meio
+        cache_http.invalidar("licitacoes")
+
 @router.get("/{id_licitacao}")
-def obter(id_licitacao: int, db: Session = Depends(get_db)):
+def obter(id_licitacao: int, db: Session = Depends(get_db_roteado)):
     lic = db.query(Licitacao).get(id_licitacao)
     if not lic:
         raise HTTPException(404, "Licitação não encontrada")
     return lic
 
+@router.get("/{id_licitacao}/detalhe", response_model=LicitacaoDetalhe)
+def detalhe(id_licitacao: int, db: Session = Depends(get_db_roteado)):
+    """Licitação com seus contratos e o resumo deles, em três consultas fixas"""
+    lic = db.scalar(
+        select(Licitacao).options(selectinload(Licitacao.contratos)).where(Licitacao.id_licitacao == id_licitacao)
+    )
+    if not lic:
+        raise HTTPException(404, "Licitação não encontrada")
+    linhas = db.execute(consulta_resumo_contratos([id_licitacao])).all()
+    return montar_detalhes([lic], linhas)[0]
+
 @router.delete("/{id_licitacao}", status_code=status.HTTP_204_NO_CONTENT)
-def excluir(id_licitacao: int, db: Session = Depends(get_db)):
+def excluir(id_licitacao: int, db: Session = Depends(get_db_roteado)):
     lic = db.query(Licitacao).get(id_licitacao)
     if not lic:
         raise HTTPException(404, "Licitação não encontrada")
     db.delete(lic)
+    resumo.ajustar_licitacao(db, lic, -1)
     db.commit()
+    cache_http.invalidar("licitacoes")
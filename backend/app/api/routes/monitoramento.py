@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Response
+from app.core import metricas
+from app.db.replicas import roteador
+from app.db.session import async_engine, engine, estado_do_pool
+
+router = APIRouter(tags=["Monitoramento"])
+
+@router.get("/monitoramento/pool")
+async def pool_de_conexoes():
+    """Uso dos pools de conexão (síncrono e, no modo ASYNC_DB, assíncrono) e das réplicas"""
+    estado = {"sincrono": estado_do_pool(engine)}
+    if async_engine is not None:
+        estado["assincrono"] = estado_do_pool(async_engine)
+    estado["replicas"] = [
+        {
+            "url": replica.engine.url.render_as_string(hide_password=True),
+            "saudavel": replica.saudavel,
+            "sincrono": estado_do_pool(replica.engine),
+            **({"assincrono": estado_do_pool(replica.async_engine)} if replica.async_engine is not None else {}),
+        }
+        for replica in roteador.replicas
+    ]
+    return estado
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metricas_prometheus():
+    """Latência e consultas por rota, consultas lentas e pools, no formato do Prometheus"""
+    pools = {"primario": estado_do_pool(engine)}
+    if async_engine is not None:
+        pools["assincrono"] = estado_do_pool(async_engine)
+    for numero, replica in enumerate(roteador.replicas):
+        pools[f"replica-{numero}"] = estado_do_pool(replica.engine)
+    return Response(metricas.exportar(pools), media_type="text/plain; version=0.0.4")
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, update
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
-from app.db.session import get_db
+from app.core.eventos import publicar_notificacao
+from app.core.respostas import resposta_json
+from app.db.replicas import get_db_roteado
 from app.models.notificacao import Notificacao
-from app.schemas.notificacao import NotificacaoCreate, NotificacaoUpdate, NotificacaoOut
+from app.schemas.notificacao import NotificacaoCreate, NotificacaoUpdate, NotificacaoOut, NotificacaoLote
+from app.services import leituras, resumo
 
 router = APIRouter(prefix="/notificacoes", tags=["Notificações"])
 
@@ -12,25 +16,20 @@ router = APIRouter(prefix="/notificacoes", tags=["Notificações"])
 def listar_notificacoes(
     usuario_id: Optional[int] = None,
     apenas_nao_lidas: bool = False,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_roteado)
 ):
-    """Lista notificações. Se usuario_id for fornecido, filtra por usuário específico + globais"""
-    query = db.query(Notificacao)
-    
-    if usuario_id:
-        # Notificações específicas do usuário + notificações globais
-        query = query.filter(
-            (Notificacao.usuario_id == usuario_id) | 
-            (Notificacao.usuario_id.is_(None))
-        )
-    
-    if apenas_nao_lidas:
-        query = query.filter(Notificacao.lida == False)
-    
-    return query.order_by(Notificacao.data_criacao.desc()).all()
+    """Lista notificações. Se usuario_id for fornecido, filtra por usuário específico + globais,
+    com o estado de leitura das globais calculado para esse usuário"""
+    linhas = db.execute(leituras.consulta_notificacoes(usuario_id, apenas_nao_lidas))
+    return resposta_json(leituras.montar_notificacoes(linhas))
+
+@router.get("/nao-lidas/total")
+def total_nao_lidas(usuario_id: int, db: Session = Depends(get_db_roteado)):
+    """Quantidade de notificações não lidas do usuário (próprias + globais)"""
+    return {"total": leituras.contar_nao_lidas(db, usuario_id)}
 
 @router.get("/{notificacao_id}", response_model=NotificacaoOut)
-def obter_notificacao(notificacao_id: int, db: Session = Depends(get_db)):
+def obter_notificacao(notificacao_id: int, db: Session = Depends(get_db_roteado)):
     """Obtém uma notificação específica"""
     notificacao = db.query(Notificacao).filter(Notificacao.id == notificacao_id).first()
     if not notificacao:
@@ -41,19 +40,21 @@ def obter_notificacao(notificacao_id: int, db: Session = Depends(get_db)):
     return notificacao
 
 @router.post("/", response_model=NotificacaoOut, status_code=status.HTTP_201_CREATED)
-def criar_notificacao(notificacao: NotificacaoCreate, db: Session = Depends(get_db)):
+def criar_notificacao(notificacao: NotificacaoCreate, db: Session = Depends(get_db_roteado)):
     """Cria uma nova notificação"""
     nova_notificacao = Notificacao(**notificacao.dict())
     db.add(nova_notificacao)
+    resumo.ajustar(db, resumo.NOTIFICACOES_NAO_LIDAS, 1)
     db.commit()
     db.refresh(nova_notificacao)
+    publicar_notificacao(nova_notificacao)
     return nova_notificacao
 
 @router.put("/{notificacao_id}", response_model=NotificacaoOut)
 def atualizar_notificacao(
     notificacao_id: int,
     notificacao_update: NotificacaoUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_roteado)
 ):
     """Atualiza uma notificação"""
     notificacao = db.query(Notificacao).filter(Notificacao.id == notificacao_id).first()
@@ -65,6 +66,8 @@ def atualizar_notificacao(
     
     # Atualizar apenas os campos fornecidos
     update_data = notificacao_update.dict(exclude_unset=True)
+    if 'lida' in update_data and bool(update_data['lida']) != bool(notificacao.lida):
+        resumo.ajustar(db, resumo.NOTIFICACOES_NAO_LIDAS, -1 if update_data['lida'] else 1)
     for field, value in update_data.items():
         setattr(notificacao, field, value)
     
@@ -77,43 +80,83 @@ def atualizar_notificacao(
     return notificacao
 
 @router.patch("/{notificacao_id}/marcar-lida")
-def marcar_como_lida(notificacao_id: int, db: Session = Depends(get_db)):
-    """Marca uma notificação como lida"""
-    notificacao = db.query(Notificacao).filter(Notificacao.id == notificacao_id).first()
-    if not notificacao:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Notificação não encontrada"
-        )
-    
-    notificacao.lida = True
-    notificacao.data_leitura = datetime.utcnow()
+def marcar_como_lida(notificacao_id: int, usuario_id: Optional[int] = None, db: Session = Depends(get_db_roteado)):
+    """Marca uma notificação como lida. Com usuario_id, globais são lidas só para esse usuário"""
+    if usuario_id:
+        proprias = leituras.marcar_proprias(db, usuario_id, Notificacao.id == notificacao_id)
+        alteradas = proprias or leituras.confirmar_leitura_globais(db, usuario_id, Notificacao.id == notificacao_id)
+    else:
+        proprias = alteradas = db.execute(
+            update(Notificacao)
+            .where(Notificacao.id == notificacao_id, Notificacao.lida == False)
+            .values(lida=True, data_leitura=datetime.utcnow())
+        ).rowcount
+    if proprias:
+        resumo.ajustar(db, resumo.NOTIFICACOES_NAO_LIDAS, -1)
+    if not alteradas:
+        # Só consulta de novo quando nada foi atualizado: inexistente, já lida
+        # ou (com usuario_id) particular de outro usuário, que ele não enxerga
+        notificacao = db.get(Notificacao, notificacao_id)
+        if notificacao is None or usuario_id and notificacao.usuario_id not in (None, usuario_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Notificação não encontrada"
+            )
     db.commit()
     
     return {"message": "Notificação marcada como lida"}
 
 @router.patch("/marcar-todas-lidas")
-def marcar_todas_como_lidas(usuario_id: Optional[int] = None, db: Session = Depends(get_db)):
-    """Marca todas as notificações como lidas"""
-    query = db.query(Notificacao).filter(Notificacao.lida == False)
-    
+def marcar_todas_como_lidas(usuario_id: Optional[int] = None, db: Session = Depends(get_db_roteado)):
+    """Marca todas as notificações como lidas.
+
+    Com usuario_id, as globais são marcadas avançando a marca de leitura do usuário.
+    """
     if usuario_id:
-        query = query.filter(
-            (Notificacao.usuario_id == usuario_id) | 
-            (Notificacao.usuario_id.is_(None))
-        )
+        proprias = leituras.marcar_proprias(db, usuario_id)
+        total = proprias + leituras.avancar_marca(db, usuario_id)
+    else:
+        proprias = total = db.execute(
+            update(Notificacao)
+            .where(Notificacao.lida == False)
+            .values(lida=True, data_leitura=datetime.utcnow())
+        ).rowcount
+    resumo.ajustar(db, resumo.NOTIFICACOES_NAO_LIDAS, -proprias)
+    db.commit()
     
-    notificacoes = query.all()
-    for notificacao in notificacoes:
-        notificacao.lida = True
-        notificacao.data_leitura = datetime.utcnow()
+    return {"message": f"{total} notificações marcadas como lidas"}
+
+@router.post("/lote")
+def processar_lote(lote: NotificacaoLote, db: Session = Depends(get_db_roteado)):
+    """Marca como lidas ou deleta várias notificações em um único comando"""
+    if lote.acao == "marcar_lida" and lote.usuario_id:
+        nao_lidas = leituras.marcar_proprias(db, lote.usuario_id, Notificacao.id.in_(lote.ids))
+        total = nao_lidas + leituras.confirmar_leitura_globais(db, lote.usuario_id, Notificacao.id.in_(lote.ids))
+        mensagem = f"{total} notificações marcadas como lidas"
+    elif lote.acao == "marcar_lida":
+        total = db.execute(
+            update(Notificacao)
+            .where(Notificacao.id.in_(lote.ids), Notificacao.lida == False)
+            .values(lida=True, data_leitura=datetime.utcnow())
+        ).rowcount
+        nao_lidas = total
+        mensagem = f"{total} notificações marcadas como lidas"
+    else:
+        # RETURNING informa quantas das removidas ainda não estavam lidas
+        lidas = db.scalars(
+            delete(Notificacao).where(Notificacao.id.in_(lote.ids)).returning(Notificacao.lida)
+        ).all()
+        total = len(lidas)
+        nao_lidas = sum(1 for lida in lidas if not lida)
+        mensagem = f"{total} notificações deletadas"
     
+    resumo.ajustar(db, resumo.NOTIFICACOES_NAO_LIDAS, -nao_lidas)
     db.commit()
     
-    return {"message": f"{len(notificacoes)} notificações marcadas como lidas"}
+    return {"message": mensagem, "total": total}
 
 @router.delete("/{notificacao_id}")
-def deletar_notificacao(notificacao_id: int, db: Session = Depends(get_db)):
+def deletar_notificacao(notificacao_id: int, db: Session = Depends(get_db_roteado)):
     """Deleta uma notificação"""
     notificacao = db.query(Notificacao).filter(Notificacao.id == notificacao_id).first()
     if not notificacao:
@@ -122,6 +165,8 @@ def deletar_notificacao(notificacao_id: int, db: Session = Depends(get_db)):
             detail="Notificação não encontrada"
         )
     
+    if not notificacao.lida:
+        resumo.ajustar(db, resumo.NOTIFICACOES_NAO_LIDAS, -1)
     db.delete(notificacao)
     db.commit()
     
@@ -0,0 +1,47 @@
+from datetime import date
+from typing import Literal, Optional
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from app.db.replicas import sessao_para
+from app.services import relatorios
+
+router = APIRouter(prefix="/relatorios", tags=["Relatórios"])
+
+FORMATOS = {
+    "csv": (relatorios.gerar_csv, "text/csv; charset=utf-8"),
+    "ndjson": (relatorios.gerar_ndjson, "application/x-ndjson"),
+    "pdf": (relatorios.gerar_pdf, "application/pdf"),
+}
+
+@router.get("")
+def gerar_relatorio(
+    request: Request,
+    tipo: Literal["licitacoes", "contratos", "ambos"] = "ambos",
+    formato: Literal["csv", "ndjson", "pdf"] = "csv",
+    status: Optional[str] = None,
+    modalidade: Optional[str] = None,
+    orgao: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+):
+    """Gera o relatório filtrado no banco e envia o resultado em streaming"""
+    gerador, media_type = FORMATOS[formato]
+
+    def conteudo():
+        # A sessão vive enquanto o corpo da resposta estiver sendo enviado;
+        # relatórios são leituras pesadas, então vão para uma réplica se houver
+        db, _ = sessao_para(request)
+        try:
+            linhas = relatorios.linhas_relatorio(
+                db, tipo, status, modalidade, orgao, data_inicio, data_fim
+            )
+            yield from gerador(linhas)
+        finally:
+            db.close()
+
+    nome_arquivo = f"relatorio_{tipo}_{date.today().isoformat()}.{formato}"
+    return StreamingResponse(
+        conteudo(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo}"'},
+    )
@@ -0,0 +1,22 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.core.respostas import resposta_json
+from app.db.session import get_db
+from app.schemas.sincronizacao import SyncOut
+from app.services import sincronizacao
+
+router = APIRouter(prefix="/sync", tags=["Sincronização"])
+
+@router.get("", response_model=SyncOut)
+def sincronizar(
+    since: Optional[str] = Query(None, description="Token `proximo` da chamada anterior; sem ele, tudo"),
+    limit: int = Query(500, ge=1, le=5000, description="Máximo de linhas por fonte"),
+    db: Session = Depends(get_db),
+):
+    """Licitações, contratos e usuários alterados e registros excluídos desde o token.
+
+    Repita com `proximo` enquanto `mais` for true. Lê sempre do primário: uma
+    réplica atrasada faria o token passar por alterações que ela ainda não viu.
+    """
+    return resposta_json(sincronizacao.sincronizar(db, since, limit))
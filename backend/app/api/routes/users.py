@@ -1,16 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Form
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from app.core.respostas import colunas_de, linhas_como_dicts, resposta_json
 from app.db.session import get_db
 from app.models.user import Usuario
 from app.schemas.user import UserCreate, UserLogin, Token, UserOut
-from app.core.auth import get_password_hash, verify_password, create_access_token
+from app.core.auth import get_password_hash, autenticar_usuario, create_access_token, get_current_user
+from app.services import resumo
 from datetime import timedelta
+from typing import List
 
 router = APIRouter(prefix="/usuarios", tags=["Usuários"])
 
-@router.get("")
+# Só os campos públicos: o hash da senha não sai na listagem
+COLUNAS_USUARIO = colunas_de(Usuario, UserOut)
+
+@router.get("", response_model=List[UserOut])
 def listar_usuarios(db: Session = Depends(get_db)):
-    return db.query(Usuario).all()
+    return resposta_json(linhas_como_dicts(db.execute(select(*COLUNAS_USUARIO))))
+
+@router.get("/me", response_model=UserOut)
+def usuario_atual(user: UserOut = Depends(get_current_user)):
+    """Retorna o usuário autenticado pelo token"""
+    return user
 
 @router.post("", status_code=status.HTTP_201_CREATED)
 def criar_usuario(user: UserCreate, db: Session = Depends(get_db)):
@@ -23,30 +35,15 @@ def criar_usuario(user: UserCreate, db: Session = Depends(get_db)):
     hashed_password = get_password_hash(user.password)
     novo = Usuario(username=user.username, email=user.email, password=hashed_password)
     db.add(novo)
+    resumo.ajustar(db, resumo.USUARIOS, 1)
     db.commit()
     db.refresh(novo)
     return {"id": novo.id, "username": novo.username, "email": novo.email}
 
 @router.post("/login", response_model=Token)
-def login(username: str = Form(), password: str = Form(), db: Session = Depends(get_db)):
+async def login(username: str = Form(), password: str = Form(), db: Session = Depends(get_db)):
     """Rota de login - autentica usuário e retorna token JWT"""
-    # Buscar usuário no banco
-    user = db.query(Usuario).filter(Usuario.username == username).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Username ou senha incorretos",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Verificar senha
-    if not verify_password(password, user.password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Username ou senha incorretos",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user = await autenticar_usuario(db, username, password)
     
     # Criar token
     access_token_expires = timedelta(minutes=30)
@@ -1,24 +1,64 @@
+import asyncio
+import contextvars
+import threading
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import HTTPException, status
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from starlette.concurrency import run_in_threadpool
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.hashing import pool_de_hash, pwd_context, verificar_senha
+from app.db.session import SessionLocal
+from app.models.user import Usuario
+from app.schemas.user import UserOut
 
 # Configurações
 SECRET_KEY = "seu_secret_key_super_seguro_aqui_123456789"  # Em produção, use uma chave mais segura
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Context para hash de senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Limite de logins simultâneos neste processo
+_admissao_login = asyncio.Semaphore(settings.LOGIN_MAX_CONCURRENT)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica se a senha está correta"""
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Gera o hash da senha"""
-    return pwd_context.hash(password)
+    """Gera o hash da senha no pool de processos do bcrypt"""
+    return pool_de_hash.gerar_hash(password)
+
+async def autenticar_usuario(db: Session, username: str, password: str):
+    """Busca o usuário e confere a senha sem ocupar o threadpool durante o bcrypt.
+
+    Sem vaga, o login espera até LOGIN_ESPERA_MAXIMA segundos na fila do
+    semáforo antes do 503: um pico curto é absorvido em vez de recusado.
+    """
+    try:
+        await asyncio.wait_for(_admissao_login.acquire(), timeout=settings.LOGIN_ESPERA_MAXIMA)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Muitos logins simultâneos, tente novamente em instantes",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        user = await run_in_threadpool(
+            lambda: db.query(Usuario).filter(Usuario.username == username).first()
+        )
+        if not user or not await verificar_senha(username, password, user.password):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Username ou senha incorretos",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return user
+    finally:
+        _admissao_login.release()
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Cria um token JWT"""
@@ -49,4 +89,106 @@ def verify_token(token: str):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+
+# Principais já resolvidos: sub do token -> UserOut (sem sessão/ORM associado)
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+usuarios_em_cache = TTLCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
+
+# Geração do cache, avançada a cada invalidação: get_current_user só guarda o
+# que leu se nenhuma invalidação aconteceu desde antes da leitura. Sem isso, uma
+# leitura anterior a um commit concorrente recolocaria a linha antiga no cache
+_geracao = 0
+_trava_geracao = threading.Lock()
+
+def invalidar_usuario(username: str):
+    """Remove o principal do cache; chamado sempre que um usuário muda"""
+    global _geracao
+    with _trava_geracao:
+        _geracao += 1
+        usuarios_em_cache.pop(username)
+
+def _guardar_se_atual(username: str, principal: UserOut, geracao: int):
+    with _trava_geracao:
+        if _geracao == geracao:
+            usuarios_em_cache.set(username, principal)
+
+# Usernames alterados na transação da sessão, invalidados só no commit: antes
+# dele, um get_current_user concorrente ainda leria (e guardaria) a linha antiga
+USUARIOS_ALTERADOS = "usuarios_alterados"
+
+@event.listens_for(Usuario, "after_insert")
+@event.listens_for(Usuario, "after_update")
+@event.listens_for(Usuario, "after_delete")
+def _anotar_alteracao(mapper, connection, target):
+    sessao = object_session(target)
+    if sessao is None:
+        return
+    alterados = sessao.info.setdefault(USUARIOS_ALTERADOS, set())
+    alterados.add(target.username)
+    # Cobre também a troca de username
+    alterados.update(inspect(target).attrs.username.history.deleted or ())
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_ao_confirmar(session):
+    for username in session.info.pop(USUARIOS_ALTERADOS, ()):
+        invalidar_usuario(username)
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_alteracoes(session):
+    session.info.pop(USUARIOS_ALTERADOS, None)
+
+def get_current_user(token: str = Depends(oauth2_scheme)) -> UserOut:
+    """Valida o token e resolve o usuário, consultando o banco só quando não está em cache"""
+    username = verify_token(token)
+    principal = usuarios_em_cache.get(username)
+    if principal is None:
+        geracao = _geracao
+        with SessionLocal() as db:
+            user = db.query(Usuario).filter(Usuario.username == username).first()
+            if not user:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token inválido",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            principal = UserOut(id=user.id, username=user.username, email=user.email)
+        _guardar_se_atual(username, principal, geracao)
+    return principal
+
+# Quem fez a escrita em andamento, para a trilha de auditoria. As rotas de
+# escrita não exigem login: o token, se vier, só identifica o autor
+_usuario_da_requisicao: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "usuario_da_requisicao", default=None
+)
+
+def usuario_da_requisicao() -> Optional[str]:
+    """Username do token da requisição atual; None sem token válido ou fora de uma requisição"""
+    return _usuario_da_requisicao.get()
+
+class IdentificacaoMiddleware:
+    """Middleware ASGI: guarda o username do token Bearer das escritas (sem consultar o banco)"""
+
+    METODOS_DE_LEITURA = {"GET", "HEAD", "OPTIONS"}
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in self.METODOS_DE_LEITURA:
+            return await self.app(scope, receive, send)
+        username = None
+        for nome, valor in scope["headers"]:
+            if nome == b"authorization":
+                esquema, _, token = valor.decode("latin-1").partition(" ")
+                if esquema.lower() == "bearer":
+                    try:
+                        username = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+                    except JWTError:
+                        pass
+                break
+        token_ctx = _usuario_da_requisicao.set(username)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _usuario_da_requisicao.reset(token_ctx)
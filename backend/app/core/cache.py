@@ -0,0 +1,47 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Cache LRU em memória com expiração por tempo, seguro entre threads"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._dados: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave: Hashable, padrao: Any = None) -> Any:
+        with self._lock:
+            item = self._dados.get(chave)
+            if item is None:
+                return padrao
+            valor, expira_em = item
+            if expira_em < time.monotonic():
+                del self._dados[chave]
+                return padrao
+            self._dados.move_to_end(chave)
+            return valor
+
+    def set(self, chave: Hashable, valor: Any, ttl: Optional[float] = None):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._dados[chave] = (valor, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.maxsize:
+                self._dados.popitem(last=False)
+
+    def pop(self, chave: Hashable, padrao: Any = None) -> Any:
+        with self._lock:
+            item = self._dados.pop(chave, None)
+        return padrao if item is None else item[0]
+
+    def clear(self):
+        with self._lock:
+            self._dados.clear()
+
+    def __len__(self) -> int:
+        return len(self._dados)
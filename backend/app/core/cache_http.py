@@ -0,0 +1,205 @@
+"""Cache HTTP das leituras: ETag por versão do recurso, 304 e corpos em LRU.
+
+Cada recurso (licitacoes, contratos) tem um contador de versão que as rotas de
+escrita incrementam depois do commit. O ETag de um GET é o hash das versões
+dos recursos da rota + caminho + query string, então dá para responder 304 ou
+devolver o corpo guardado sem abrir sessão no banco. Só rotas sem autenticação
+passam por aqui: a chave não distingue usuários.
+
+Leituras atendidas por uma réplica (ver app/db/replicas.py) só ganham ETag e
+entram no cache quando a última escrita no recurso é mais antiga que
+REPLICA_ATRASO_MAXIMO; antes disso a réplica pode não ter recebido a escrita.
+
+Uma rota que define o próprio ETag (ex.: GET /contratos/{id}, com a versão do
+contrato, a mesma do If-Match das escritas) responde o 304 ela mesma: o
+middleware não troca esse ETag nem guarda a resposta.
+
+O armazenamento padrão vale por processo. Com vários workers, uma escrita em um
+deles não invalida os outros; nesse caso troque por um armazenamento
+compartilhado com configurar_armazenamento (ex.: Redis, com INCR para as
+versões e SET/GET com expiração para os corpos).
+"""
+import hashlib
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# (status, cabeçalhos, corpo) de uma resposta 200 já serializada
+RespostaGuardada = Tuple[int, list, bytes]
+
+# Cabeçalhos da resposta original que voltam junto com o corpo guardado
+CABECALHOS_GUARDADOS = {b"content-type", b"content-length", b"x-next-cursor"}
+
+# Marcado em request.state pela dependency quando a leitura foi para uma réplica
+LIDO_DA_REPLICA = "lido_da_replica"
+# Marcado aqui quando a resposta sai do cache, sem passar por uma rota
+RESPONDIDO_PELO_CACHE = "respondido_pelo_cache"
+
+
+class ArmazenamentoDeCache(ABC):
+    """Interface do armazenamento: versões por recurso e respostas por ETag"""
+
+    @abstractmethod
+    def versao(self, recurso: str) -> str:
+        ...
+
+    @abstractmethod
+    def incrementar(self, recurso: str):
+        ...
+
+    @abstractmethod
+    def alterado_em(self, recurso: str) -> float:
+        """Momento (time.time) da última escrita no recurso; 0 se nunca mudou"""
+
+    @abstractmethod
+    def obter(self, etag: str) -> Optional[RespostaGuardada]:
+        ...
+
+    @abstractmethod
+    def guardar(self, etag: str, resposta: RespostaGuardada):
+        ...
+
+
+class ArmazenamentoEmMemoria(ArmazenamentoDeCache):
+    def __init__(self, tamanho: int, ttl: float):
+        # Muda a cada início do processo: ETags de antes do restart não casam
+        self.instancia = uuid.uuid4().hex
+        self.versoes: Dict[str, int] = {}
+        self.alteracoes: Dict[str, float] = {}
+        self.respostas = TTLCache(tamanho, ttl)
+        self._lock = threading.Lock()
+
+    def versao(self, recurso: str) -> str:
+        return f"{self.instancia}.{self.versoes.get(recurso, 0)}"
+
+    def incrementar(self, recurso: str):
+        with self._lock:
+            self.versoes[recurso] = self.versoes.get(recurso, 0) + 1
+            self.alteracoes[recurso] = time.time()
+
+    def alterado_em(self, recurso: str) -> float:
+        return self.alteracoes.get(recurso, 0.0)
+
+    def obter(self, etag: str) -> Optional[RespostaGuardada]:
+        return self.respostas.get(etag)
+
+    def guardar(self, etag: str, resposta: RespostaGuardada):
+        self.respostas.set(etag, resposta)
+
+
+armazenamento: ArmazenamentoDeCache = ArmazenamentoEmMemoria(
+    settings.RESPOSTA_CACHE_SIZE, settings.RESPOSTA_CACHE_TTL
+)
+
+
+def configurar_armazenamento(novo: ArmazenamentoDeCache):
+    global armazenamento
+    armazenamento = novo
+
+
+def invalidar(*recursos: str):
+    """Chamado pelas rotas de escrita depois do commit"""
+    for recurso in recursos:
+        armazenamento.incrementar(recurso)
+
+
+def calcular_etag(recursos: Iterable[str], caminho: str, query: bytes) -> str:
+    versoes = "|".join(armazenamento.versao(r) for r in recursos)
+    chave = f"{versoes}|{caminho}?{query.decode('latin-1')}".encode()
+    return '"' + hashlib.blake2b(chave, digest_size=16).hexdigest() + '"'
+
+
+def _replica_pode_estar_atrasada(scope, recursos) -> bool:
+    if not scope.get("state", {}).get(LIDO_DA_REPLICA):
+        return False
+    ultima = max(armazenamento.alterado_em(r) for r in recursos)
+    return time.time() - ultima < settings.REPLICA_ATRASO_MAXIMO
+
+
+def etag_de_versao(versao: int) -> str:
+    """ETag de um registro com coluna de versão: "<versao>", o valor aceito no If-Match"""
+    return f'"{versao}"'
+
+
+def casa(if_none_match: str, etag: str) -> bool:
+    """Se o If-None-Match lista o ETag (comparação fraca) ou aceita qualquer um (*)"""
+    for candidato in if_none_match.split(","):
+        candidato = candidato.strip()
+        if candidato == "*" or candidato.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class CacheHttpMiddleware:
+    """Middleware ASGI para GETs cujas rotas começam por um dos prefixos dados.
+
+    `recursos` mapeia prefixo -> recursos cujas escritas mudam a resposta.
+    """
+
+    def __init__(self, app, recursos: Dict[str, Tuple[str, ...]]):
+        self.app = app
+        self.recursos = recursos
+
+    def _recursos_da_rota(self, caminho: str) -> Optional[Tuple[str, ...]]:
+        for prefixo, recursos in self.recursos.items():
+            if caminho == prefixo or caminho.startswith(prefixo + "/"):
+                return recursos
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+        recursos = self._recursos_da_rota(scope["path"])
+        if recursos is None:
+            return await self.app(scope, receive, send)
+
+        etag = calcular_etag(recursos, scope["path"], scope["query_string"])
+        validacao = [(b"etag", etag.encode()), (b"cache-control", b"no-cache")]
+        if_none_match = dict(scope["headers"]).get(b"if-none-match")
+        if if_none_match and casa(if_none_match.decode("latin-1"), etag):
+            scope.setdefault("state", {})[RESPONDIDO_PELO_CACHE] = True
+            await send({"type": "http.response.start", "status": 304, "headers": validacao})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        guardada = armazenamento.obter(etag)
+        if guardada is not None:
+            scope.setdefault("state", {})[RESPONDIDO_PELO_CACHE] = True
+            status, cabecalhos, corpo = guardada
+            await send({"type": "http.response.start", "status": status, "headers": cabecalhos})
+            await send({"type": "http.response.body", "body": corpo})
+            return
+
+        inicio = {}
+        partes = []
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                inicio.update(mensagem)
+                # ETag definido pela rota vale no lugar do calculado aqui
+                etag_da_rota = any(nome.lower() == b"etag" for nome, _ in mensagem.get("headers", []))
+                inicio["cacheavel"] = (
+                    mensagem["status"] == 200
+                    and not etag_da_rota
+                    and not _replica_pode_estar_atrasada(scope, recursos)
+                )
+                if inicio["cacheavel"]:
+                    mensagem["headers"] = [*mensagem.get("headers", []), *validacao]
+            elif mensagem["type"] == "http.response.body" and inicio.get("cacheavel"):
+                partes.append(mensagem.get("body", b""))
+                if not mensagem.get("more_body", False):
+                    corpo = b"".join(partes)
+                    if len(corpo) <= settings.RESPOSTA_CACHE_MAX_BYTES:
+                        cabecalhos = [
+                            (nome, valor) for nome, valor in inicio.get("headers", [])
+                            if nome.lower() in CABECALHOS_GUARDADOS
+                        ]
+                        armazenamento.guardar(etag, (200, [*cabecalhos, *validacao], corpo))
+            await send(mensagem)
+
+        await self.app(scope, receive, enviar)
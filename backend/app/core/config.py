@@ -5,6 +5,84 @@ load_dotenv()
 
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./licitacoes.db")
+    # Réplicas de leitura (URLs separadas por vírgula; vazio = tudo no primário)
+    DATABASE_REPLICA_URLS: list[str] = [u for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+    # Intervalo da verificação das réplicas (s), atraso máximo aceito no Postgres (s),
+    # janela de read-your-writes após uma escrita (s; no mínimo o atraso máximo)
+    # e clientes lembrados por worker
+    REPLICA_VERIFICACAO_INTERVALO: float = float(os.getenv("REPLICA_VERIFICACAO_INTERVALO", "10"))
+    REPLICA_ATRASO_MAXIMO: float = float(os.getenv("REPLICA_ATRASO_MAXIMO", "30"))
+    REPLICA_JANELA_ESCRITA: float = float(os.getenv("REPLICA_JANELA_ESCRITA", "30"))
+    REPLICA_CLIENTES: int = int(os.getenv("REPLICA_CLIENTES", "10000"))
     ALLOWED_ORIGINS: list[str] = os.getenv("ALLOWED_ORIGINS", "http://localhost:5173,http://localhost:5174,http://localhost:5175,http://localhost:5176,http://127.0.0.1:5173,http://127.0.0.1:5174,http://127.0.0.1:5175,http://127.0.0.1:5176").split(",")
+    # Modo assíncrono opcional (AsyncEngine com aiosqlite/asyncpg nas rotas de leitura)
+    ASYNC_DB: bool = os.getenv("ASYNC_DB", "false").lower() in ("1", "true", "yes")
+    # Pool de conexões (SQLite em arquivo e Postgres); recycle em segundos
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+    # Postgres: tempo máximo de um comando (ms; 0 desabilita)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    # SQLite: mmap (bytes), cache de páginas (negativo = KiB) e espera por lock (ms)
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    # Pool de processos do bcrypt e controle de admissão do login
+    HASH_WORKERS: int = int(os.getenv("HASH_WORKERS", "2"))
+    HASH_QUEUE_LIMIT: int = int(os.getenv("HASH_QUEUE_LIMIT", "64"))
+    LOGIN_MAX_CONCURRENT: int = int(os.getenv("LOGIN_MAX_CONCURRENT", "32"))
+    # Segundos que um login espera na fila por uma vaga antes do 503
+    LOGIN_ESPERA_MAXIMA: float = float(os.getenv("LOGIN_ESPERA_MAXIMA", "2"))
+    # Cache de verificações recentes (segundos; 0 desabilita)
+    LOGIN_CACHE_TTL: float = float(os.getenv("LOGIN_CACHE_TTL", "60"))
+    LOGIN_CACHE_SIZE: int = int(os.getenv("LOGIN_CACHE_SIZE", "10000"))
+    # Cache do usuário autenticado resolvido a partir do token
+    USER_CACHE_TTL: float = float(os.getenv("USER_CACHE_TTL", "60"))
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    # Push de notificações (SSE): fila por conexão, limite de conexões por worker,
+    # intervalo do keep-alive (segundos) e máximo de eventos reenviados na reconexão
+    SSE_QUEUE_SIZE: int = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+    SSE_MAX_SUBSCRIBERS: int = int(os.getenv("SSE_MAX_SUBSCRIBERS", "10000"))
+    SSE_KEEPALIVE: float = float(os.getenv("SSE_KEEPALIVE", "15"))
+    SSE_REPLAY_LIMIT: int = int(os.getenv("SSE_REPLAY_LIMIT", "200"))
+    # Busca textual: quantas ocorrências (as mais recentes) entram no ranking;
+    # também é o máximo de offset + limit da paginação
+    BUSCA_MAX_CANDIDATOS: int = int(os.getenv("BUSCA_MAX_CANDIDATOS", "1000"))
+    # Alertas de vencimento: intervalo da varredura em segundos (0 desabilita),
+    # horizontes em dias, tamanho do lote e status considerados em aberto
+    ALERTA_INTERVALO: float = float(os.getenv("ALERTA_INTERVALO", "3600"))
+    ALERTA_HORIZONTES: list[int] = sorted(int(d) for d in os.getenv("ALERTA_HORIZONTES", "90,30,7").split(","))
+    ALERTA_LOTE: int = int(os.getenv("ALERTA_LOTE", "500"))
+    ALERTA_STATUS_CONTRATO: list[str] = os.getenv("ALERTA_STATUS_CONTRATO", "Ativo,Vigente").split(",")
+    ALERTA_STATUS_LICITACAO: list[str] = os.getenv("ALERTA_STATUS_LICITACAO", "Aberto,Aberta,Em andamento").split(",")
+    # Cache HTTP das leituras (ETag/304): respostas guardadas, validade em
+    # segundos e tamanho máximo de um corpo guardado (bytes)
+    RESPOSTA_CACHE_SIZE: int = int(os.getenv("RESPOSTA_CACHE_SIZE", "1000"))
+    RESPOSTA_CACHE_TTL: float = float(os.getenv("RESPOSTA_CACHE_TTL", "300"))
+    RESPOSTA_CACHE_MAX_BYTES: int = int(os.getenv("RESPOSTA_CACHE_MAX_BYTES", "1048576"))
+    # Contratos ligados por lote ao fornecedor normalizado, em segundo plano ao subir; 0 desliga
+    FORNECEDOR_PREENCHIMENTO_LOTE: int = int(os.getenv("FORNECEDOR_PREENCHIMENTO_LOTE", "1000"))
+    # DDL ao subir: "migrar" (alembic upgrade head), "create_all" (banco
+    # novo em desenvolvimento) ou "nenhum" (esquema aplicado no deploy); ver
+    # app/db/migracoes.py
+    DB_ESQUEMA: str = os.getenv("DB_ESQUEMA", "migrar")
+    # Comandos SQL acima deste tempo (ms) vão para o log de consultas lentas; 0 desliga
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+    # GET /sync só entrega alterações com mais de SYNC_MARGEM segundos, e a
+    # marca d'água da exportação só cobre linhas criadas antes disso, para
+    # não pular transações ainda abertas; lápides de exclusão ficam
+    # SYNC_RETENCAO_DIAS dias (0 = para sempre)
+    SYNC_MARGEM: float = float(os.getenv("SYNC_MARGEM", "5"))
+    SYNC_RETENCAO_DIAS: int = int(os.getenv("SYNC_RETENCAO_DIAS", "30"))
+    # Trilha de auditoria: as alterações confirmadas são gravadas em lotes de
+    # até AUDITORIA_LOTE a cada AUDITORIA_INTERVALO segundos, fora da
+    # requisição; 0 grava logo após cada commit
+    AUDITORIA_INTERVALO: float = float(os.getenv("AUDITORIA_INTERVALO", "1"))
+    AUDITORIA_LOTE: int = int(os.getenv("AUDITORIA_LOTE", "500"))
+    # Por quanto tempo (segundos) a resposta de um POST com Idempotency-Key é
+    # reaproveitada; as chaves vencidas são apagadas de hora em hora
+    IDEMPOTENCIA_TTL: int = int(os.getenv("IDEMPOTENCIA_TTL", "86400"))
 
 settings = Settings()
@@ -0,0 +1,98 @@
+"""Central de eventos em processo para o push de notificações (SSE).
+
+Cada conexão tem uma fila limitada. Se o cliente não acompanha, os eventos
+novos são descartados e ele recebe um único aviso "sincronizar" para buscar a
+lista de novo. O id do evento é o id da notificação, então um cliente que
+reconecta com Last-Event-ID recupera o que perdeu direto do banco.
+
+A central vive em um worker; com vários workers cada um só entrega o que foi
+criado nele, e o restante chega na próxima reconexão.
+"""
+import asyncio
+from typing import Dict, Optional, Set
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.schemas.notificacao import NotificacaoOut
+
+
+class Assinatura:
+    """Uma conexão SSE: fila limitada + indicador de eventos descartados"""
+
+    def __init__(self, usuario_id: Optional[int], tamanho_fila: int):
+        self.usuario_id = usuario_id
+        self.fila: asyncio.Queue = asyncio.Queue(maxsize=tamanho_fila)
+        self.atrasada = False
+        self.ultimo_descartado = 0
+
+    def entregar(self, evento: tuple):
+        try:
+            self.fila.put_nowait(evento)
+        except asyncio.QueueFull:
+            self.atrasada = True
+            self.ultimo_descartado = max(self.ultimo_descartado, evento[0])
+
+
+class CentralDeEventos:
+    def __init__(self, tamanho_fila: int, max_assinantes: int):
+        self.tamanho_fila = tamanho_fila
+        self.max_assinantes = max_assinantes
+        # usuario_id -> conexões; a chave None recebe tudo (visão sem usuário)
+        self.assinaturas: Dict[Optional[int], Set[Assinatura]] = {}
+        self.total = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def assinar(self, usuario_id: Optional[int]) -> Assinatura:
+        if self.total >= self.max_assinantes:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Limite de conexões de notificação atingido",
+                headers={"Retry-After": "5"},
+            )
+        self._loop = asyncio.get_running_loop()
+        assinatura = Assinatura(usuario_id, self.tamanho_fila)
+        self.assinaturas.setdefault(usuario_id, set()).add(assinatura)
+        self.total += 1
+        return assinatura
+
+    def cancelar(self, assinatura: Assinatura):
+        conjunto = self.assinaturas.get(assinatura.usuario_id)
+        if conjunto and assinatura in conjunto:
+            conjunto.discard(assinatura)
+            self.total -= 1
+            if not conjunto:
+                del self.assinaturas[assinatura.usuario_id]
+
+    def _distribuir(self, evento_id: int, usuario_id: Optional[int], dados: str):
+        evento = (evento_id, dados)
+        if usuario_id is None:
+            destinos = [a for conjunto in self.assinaturas.values() for a in conjunto]
+        else:
+            destinos = [*self.assinaturas.get(usuario_id, ()), *self.assinaturas.get(None, ())]
+        for assinatura in destinos:
+            assinatura.entregar(evento)
+
+    def publicar(self, evento_id: int, usuario_id: Optional[int], dados: str):
+        """Pode ser chamado das rotas síncronas (threadpool); a entrega roda no event loop"""
+        if self._loop is None or not self.total:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._distribuir, evento_id, usuario_id, dados)
+        except RuntimeError:
+            # Loop já encerrado (shutdown)
+            self._loop = None
+
+
+central_de_eventos = CentralDeEventos(settings.SSE_QUEUE_SIZE, settings.SSE_MAX_SUBSCRIBERS)
+
+
+def publicar_notificacao(notificacao):
+    """Serializa a notificação uma vez e entrega a todas as conexões interessadas"""
+    if central_de_eventos.total:
+        dados = NotificacaoOut.model_validate(notificacao)
+        if notificacao.usuario_id is None:
+            # Uma global recém-criada está acima da marca de todo usuário e sem
+            # confirmação: não lida para todos, seja qual for a coluna compartilhada
+            dados = dados.model_copy(update={"lida": False, "data_leitura": None})
+        central_de_eventos.publicar(notificacao.id, notificacao.usuario_id, dados.model_dump_json())
@@ -0,0 +1,110 @@
+import asyncio
+import hashlib
+import hmac
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Context para hash de senhas
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Executadas dentro dos processos do pool
+def _verificar(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+def _gerar(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+class PoolDeHash:
+    """Pool de processos dedicado ao bcrypt, com limite de tarefas pendentes.
+
+    Quando a fila está cheia a chamada falha na hora com 503, em vez de
+    acumular requisições esperando CPU.
+    """
+
+    def __init__(self, workers: int, limite_fila: int):
+        self.workers = workers
+        self.limite_fila = limite_fila
+        self.pendentes = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn evita herdar threads/conexões do processo do servidor
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _reservar(self):
+        with self._lock:
+            if self.pendentes >= self.limite_fila:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Servidor ocupado, tente novamente em instantes",
+                    headers={"Retry-After": "1"},
+                )
+            self.pendentes += 1
+
+    def _liberar(self, _future=None):
+        with self._lock:
+            self.pendentes -= 1
+
+    def _enviar(self, funcao, *args):
+        self._reservar()
+        try:
+            future = self.executor.submit(funcao, *args)
+        except Exception:
+            self._liberar()
+            raise
+        future.add_done_callback(self._liberar)
+        return future
+
+    async def verificar(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._enviar(_verificar, plain_password, hashed_password))
+
+    def gerar_hash(self, password: str) -> str:
+        """Versão bloqueante para handlers síncronos (a CPU fica no pool)"""
+        return self._enviar(_gerar, password).result()
+
+    def encerrar(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+pool_de_hash = PoolDeHash(settings.HASH_WORKERS, settings.HASH_QUEUE_LIMIT)
+
+# Verificações bem-sucedidas recentes: (username, hash) -> HMAC da senha.
+# A senha em claro nunca é guardada; o segredo do HMAC vive só neste processo.
+_segredo_cache = os.urandom(32)
+credenciais_verificadas = TTLCache(settings.LOGIN_CACHE_SIZE, settings.LOGIN_CACHE_TTL)
+
+def _digest(password: str) -> bytes:
+    return hmac.new(_segredo_cache, password.encode(), hashlib.sha256).digest()
+
+async def verificar_senha(username: str, plain_password: str, hashed_password: str) -> bool:
+    """Verifica a senha no pool de processos, usando o cache de credenciais quando habilitado"""
+    chave = (username, hashed_password)
+    if settings.LOGIN_CACHE_TTL > 0:
+        digest = credenciais_verificadas.get(chave)
+        if digest is not None and hmac.compare_digest(digest, _digest(plain_password)):
+            return True
+
+    valida = await pool_de_hash.verificar(plain_password, hashed_password)
+    if valida and settings.LOGIN_CACHE_TTL > 0:
+        credenciais_verificadas.set(chave, _digest(plain_password))
+    return valida
@@ -0,0 +1,213 @@
+"""Instrumentação das requisições: latência por rota, consultas SQL e log de lentas.
+
+O middleware abre uma contagem por requisição (contextvar, que acompanha a
+rota até a threadpool) e os eventos de cursor do SQLAlchemy somam nela cada
+comando e o tempo gasto no banco. Os totais saem no cabeçalho Server-Timing e
+em histogramas por rota, exportados no formato texto do Prometheus em /metrics.
+Um número de consultas que cresce com o tamanho da página indica N+1.
+"""
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.cache_http import RESPONDIDO_PELO_CACHE
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_CONSULTAS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(nomes: Tuple[str, ...], valores: tuple, le: Optional[str] = None) -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if le is not None:
+        pares.append(f'le="{le}"')
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+class Histograma:
+    def __init__(self, nome: str, ajuda: str, rotulos: Tuple[str, ...], limites: tuple):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = rotulos
+        self.limites = limites
+        # rótulos -> [contagem por faixa..., acima do último limite], soma
+        self.series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valores: tuple, valor: float):
+        faixa = bisect.bisect_left(self.limites, valor)
+        with self._lock:
+            serie = self.series.setdefault(valores, [[0] * (len(self.limites) + 1), 0.0])
+            serie[0][faixa] += 1
+            serie[1] += valor
+
+    def exportar(self) -> List[str]:
+        linhas = [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} histogram"]
+        with self._lock:
+            series = [(valores, list(contagens), soma) for valores, (contagens, soma) in self.series.items()]
+        for valores, contagens, soma in sorted(series):
+            acumulado = 0
+            for limite, contagem in zip(self.limites, contagens):
+                acumulado += contagem
+                linhas.append(f"{self.nome}_bucket{_rotulos(self.rotulos, valores, str(limite))} {acumulado}")
+            total = acumulado + contagens[-1]
+            linhas.append(f"{self.nome}_bucket{_rotulos(self.rotulos, valores, '+Inf')} {total}")
+            linhas.append(f"{self.nome}_sum{_rotulos(self.rotulos, valores)} {soma}")
+            linhas.append(f"{self.nome}_count{_rotulos(self.rotulos, valores)} {total}")
+        return linhas
+
+
+class Contador:
+    def __init__(self, nome: str, ajuda: str, rotulos: Tuple[str, ...] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = rotulos
+        self.valores: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def somar(self, valores: tuple = (), quantidade: float = 1):
+        with self._lock:
+            self.valores[valores] = self.valores.get(valores, 0) + quantidade
+
+    def exportar(self) -> List[str]:
+        with self._lock:
+            itens = sorted(self.valores.items())
+        return [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} counter"] + [
+            f"{self.nome}{_rotulos(self.rotulos, valores)} {valor}" for valores, valor in itens
+        ]
+
+
+ROTULOS_ROTA = ("method", "route", "status")
+
+latencia = Histograma(
+    "http_request_duration_seconds", "Latência das requisições por rota", ROTULOS_ROTA, LIMITES_LATENCIA
+)
+consultas_por_requisicao = Histograma(
+    "http_request_db_statements", "Comandos SQL por requisição", ROTULOS_ROTA, LIMITES_CONSULTAS
+)
+tempo_no_banco = Contador("http_request_db_seconds_total", "Tempo gasto no banco pelas requisições", ROTULOS_ROTA)
+consultas_lentas = Contador("db_slow_queries_total", "Comandos acima de SLOW_QUERY_MS")
+
+
+class ContagemDaRequisicao:
+    __slots__ = ("consultas", "tempo_db")
+
+    def __init__(self):
+        self.consultas = 0
+        self.tempo_db = 0.0
+
+
+_requisicao_atual: contextvars.ContextVar[Optional[ContagemDaRequisicao]] = contextvars.ContextVar(
+    "requisicao_atual", default=None
+)
+
+
+# O início fica no contexto de execução do próprio comando: um comando que
+# falha (sem after_cursor_execute) não deixa nada para trás na conexão
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_do_comando(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._inicio_comando = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _depois_do_comando(conn, cursor, statement, parameters, context, executemany):
+    inicio = getattr(context, "_inicio_comando", None)
+    if inicio is None:
+        return
+    duracao = time.perf_counter() - inicio
+    contagem = _requisicao_atual.get()
+    if contagem is not None:
+        contagem.consultas += 1
+        contagem.tempo_db += duracao
+    if settings.SLOW_QUERY_MS > 0 and duracao * 1000 >= settings.SLOW_QUERY_MS:
+        consultas_lentas.somar()
+        # Valores dos parâmetros ficam de fora do log (podem ter dados pessoais)
+        quantidade = len(parameters) if isinstance(parameters, (list, tuple, dict)) else 0
+        logger.warning(
+            "Consulta lenta (%.1f ms, %s%d parâmetros omitidos): %s",
+            duracao * 1000, "executemany, " if executemany else "", quantidade, " ".join(statement.split()),
+        )
+
+
+class MetricasMiddleware:
+    """Middleware ASGI: mede cada requisição e escreve o cabeçalho Server-Timing"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        inicio = time.perf_counter()
+        contagem = ContagemDaRequisicao()
+        token = _requisicao_atual.set(contagem)
+        status = [500]
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                status[0] = mensagem["status"]
+                total = (time.perf_counter() - inicio) * 1000
+                tempo = (
+                    f'db;dur={contagem.tempo_db * 1000:.2f};desc="{contagem.consultas} consultas", '
+                    f"total;dur={total:.2f}"
+                )
+                mensagem["headers"] = [*mensagem.get("headers", []), (b"server-timing", tempo.encode())]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _requisicao_atual.reset(token)
+            rota = scope.get("route")
+            if rota is not None:
+                nome_rota = getattr(rota, "path", str(rota))
+            elif scope.get("state", {}).get(RESPONDIDO_PELO_CACHE):
+                nome_rota = "cache_http"
+            else:
+                # Sem rota (404, preflight): agrupado para não criar uma série por URL
+                nome_rota = "sem_rota"
+            valores = (scope["method"], nome_rota, status[0])
+            latencia.observar(valores, time.perf_counter() - inicio)
+            consultas_por_requisicao.observar(valores, contagem.consultas)
+            tempo_no_banco.somar(valores, contagem.tempo_db)
+
+
+def _pool_em_linhas(pools: Dict[str, dict]) -> List[str]:
+    medidas = [
+        ("db_pool_size", "gauge", "tamanho", 1),
+        ("db_pool_checked_out", "gauge", "em_uso", 1),
+        ("db_pool_overflow", "gauge", "overflow", 1),
+        ("db_pool_checkouts_total", "counter", "checkouts", 1),
+        ("db_pool_timeouts_total", "counter", "timeouts", 1),
+        ("db_pool_checkout_wait_seconds_total", "counter", "espera_total_ms", 0.001),
+    ]
+    linhas = []
+    for nome, tipo, chave, escala in medidas:
+        linhas.append(f"# TYPE {nome} {tipo}")
+        for engine, estado in pools.items():
+            if chave in estado:
+                linhas.append(f'{nome}{{engine="{engine}"}} {estado[chave] * escala}')
+    return linhas
+
+
+def exportar(pools: Optional[Dict[str, dict]] = None) -> str:
+    """Todas as métricas no formato texto do Prometheus"""
+    linhas = []
+    for metrica in (latencia, consultas_por_requisicao, tempo_no_banco, consultas_lentas):
+        linhas.extend(metrica.exportar())
+    if pools:
+        linhas.extend(_pool_em_linhas(pools))
+    return "\n".join(linhas) + "\n"
@@ -0,0 +1,26 @@
+import base64
+from datetime import date
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+# Cabeçalho usado para devolver o cursor da próxima página
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(data_ref: date, id_ref: int) -> str:
+    """Gera um cursor opaco a partir da última linha retornada"""
+    raw = f"{data_ref.isoformat()}|{id_ref}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[date, int]]:
+    """Decodifica um cursor gerado por encode_cursor"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data_ref, id_ref = base64.urlsafe_b64decode(padded).decode().split("|")
+        return date.fromisoformat(data_ref), int(id_ref)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(400, "Cursor inválido")
@@ -0,0 +1,44 @@
+"""Resposta JSON rápida para as listagens grandes.
+
+As rotas selecionam só as colunas do schema de saída (linhas, sem hidratar
+objetos ORM) e devolvem resposta_json, que serializa direto com orjson. Isso
+pula a validação linha a linha no Pydantic e o jsonable_encoder do FastAPI.
+Decimal sai como string, igual ao Pydantic, para não mudar o formato da API.
+"""
+from decimal import Decimal
+from typing import Any, List, Optional, Type
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _padrao(valor):
+    if isinstance(valor, Decimal):
+        return str(valor)
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_padrao, option=orjson.OPT_NON_STR_KEYS)
+
+
+def colunas_de(modelo, schema: Type[BaseModel], excluir: tuple = ()) -> List:
+    """Colunas do modelo com os mesmos nomes (e ordem) dos campos do schema"""
+    return [getattr(modelo, campo) for campo in schema.model_fields if campo not in excluir]
+
+
+def resposta_json(conteudo: Any, response: Optional[Response] = None) -> ORJSONResponse:
+    """Devolve a resposta pronta, levando os cabeçalhos já definidos em `response`"""
+    return ORJSONResponse(conteudo, headers=response.headers if response is not None else None)
+
+
+def linhas_como_dicts(linhas) -> List[dict]:
+    """Linhas de um SELECT de colunas em dicts; as chaves são lidas uma vez só"""
+    linhas = list(linhas)
+    if not linhas:
+        return []
+    chaves = linhas[0]._fields
+    return [dict(zip(chaves, linha)) for linha in linhas]
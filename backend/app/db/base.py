@@ -6,5 +6,11 @@ class Base(DeclarativeBase):
 # importe os modelos aqui para o create_all encontrar
 from app.models.user import Usuario  # noqa
 from app.models.licitacao import Licitacao  # noqa
+from app.models.fornecedor import Fornecedor, ResumoFornecedor  # noqa
 from app.models.contrato import Contrato  # noqa
-from app.models.notificacao import Notificacao  # noqa
\ No newline at end of file
+from app.models.notificacao import Notificacao, NotificacaoLeitura, NotificacaoMarcaLeitura  # noqa
+from app.models.resumo import ResumoDashboard  # noqa
+from app.models.alerta import AlertaEnviado  # noqa
+from app.models.exclusao import Exclusao  # noqa
+from app.models.auditoria import Auditoria  # noqa
+from app.models.idempotencia import ChaveIdempotencia  # noqa
@@ -0,0 +1,54 @@
+"""Esquema do banco na inicialização (DB_ESQUEMA) e migrações pelo Alembic.
+
+- migrar (padrão): `alembic upgrade head` ao subir. Com vários workers, rode
+  o comando no deploy: workers migrando juntos disputam o mesmo DDL.
+- create_all: cria tabelas e índices que faltarem, como antes das migrações.
+  Não altera tabelas que já existem (colunas novas ficam de fora); um banco
+  novo criado assim é marcado na última migração.
+- nenhum: sobe sem DDL; o esquema é aplicado no deploy com `alembic upgrade head`.
+
+Bancos criados pelo create_all antes das migrações não têm alembic_version:
+passam pela baseline inteira, que só cria o que faltar (IF NOT EXISTS), e
+seguem dali.
+"""
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from app.db.base import Base
+from app.services.busca import garantir_indice_busca
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MODOS = ("create_all", "migrar", "nenhum")
+
+
+def configuracao(engine: Engine) -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.attributes["logs_do_app"] = True
+    # O ConfigParser interpreta "%": senhas com escape de URL precisam dobrá-lo
+    config.set_main_option("sqlalchemy.url", engine.url.render_as_string(hide_password=False).replace("%", "%%"))
+    return config
+
+
+def migrar(engine: Engine):
+    """Leva o banco até a última migração"""
+    command.upgrade(configuracao(engine), "head")
+
+
+def preparar_esquema(engine: Engine, modo: str):
+    if modo not in MODOS:
+        raise ValueError(f"DB_ESQUEMA inválido: {modo!r} (use {', '.join(MODOS)})")
+    if modo == "create_all":
+        with engine.connect() as conexao:
+            novo = "licitacoes" not in inspect(conexao).get_table_names()
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            garantir_indice_busca(conn)
+        if novo:
+            command.stamp(configuracao(engine), "head")
+    elif modo == "migrar":
+        migrar(engine)
@@ -0,0 +1,71 @@
+"""Pools de conexão com métricas: conexões em uso, overflow e espera no checkout.
+
+As classes só acrescentam a medição ao _do_get do QueuePool (o ponto onde o
+checkout espera por uma conexão livre); o comportamento do pool é o mesmo.
+"""
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class MetricasDoPool:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+
+    def registrar(self, espera: float, timeout: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timeout
+            self.espera_total += espera
+            self.espera_max = max(self.espera_max, espera)
+
+    def como_dict(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "espera_total_ms": round(self.espera_total * 1000, 3),
+                "espera_media_ms": round(self.espera_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "espera_max_ms": round(self.espera_max * 1000, 3),
+            }
+
+
+class _ComMetricas:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metricas = MetricasDoPool()
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super()._do_get()
+        except PoolTimeout:
+            self.metricas.registrar(time.perf_counter() - inicio, timeout=True)
+            raise
+        self.metricas.registrar(time.perf_counter() - inicio)
+        return conexao
+
+    def estado(self) -> dict:
+        return {
+            "tamanho": self.size(),
+            "em_uso": self.checkedout(),
+            "livres": self.checkedin(),
+            # overflow() começa em -tamanho; só o que passa de zero são conexões extras abertas
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            **self.metricas.como_dict(),
+        }
+
+
+class QueuePoolComMetricas(_ComMetricas, QueuePool):
+    pass
+
+
+class AsyncQueuePoolComMetricas(_ComMetricas, AsyncAdaptedQueuePool):
+    pass
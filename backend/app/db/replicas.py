@@ -0,0 +1,209 @@
+"""Roteamento de leituras para réplicas (DATABASE_REPLICA_URLS).
+
+GET/HEAD vão para a próxima réplica saudável (round-robin); o resto vai para o
+primário. Uma verificação periódica tira do rodízio as réplicas que não
+respondem (ou, no Postgres, que estão atrasadas demais) e devolve as que
+voltaram. Sem réplica saudável, a leitura cai no primário.
+
+Read-your-writes: depois de uma escrita o cliente lê do primário por
+REPLICA_JANELA_ESCRITA segundos, nunca menos que REPLICA_ATRASO_MAXIMO (senão
+uma réplica "saudável" ainda poderia estar antes da escrita). O cliente é
+lembrado no processo (pelo token ou IP) e também por um cookie com a mesma
+validade, que vale em qualquer worker. O cookie sai pelo
+LeituraDoPrimarioMiddleware, então vale também para rotas que devolvem a
+própria Response; o navegador só o envia de volta com credentials: "include"
+e com o front no mesmo site da API (ex.: os dois em 127.0.0.1).
+"""
+import asyncio
+import logging
+import threading
+from typing import List, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import TTLCache
+from app.core.cache_http import LIDO_DA_REPLICA
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, SessionLocal, criar_engine
+
+logger = logging.getLogger(__name__)
+
+METODOS_LEITURA = {"GET", "HEAD"}
+COOKIE_ESCRITA = "ler_do_primario"
+# Marca em request.state de que a requisição escreveu no primário
+ESCRITA_REGISTRADA = "escrita_registrada"
+
+
+def janela_de_escrita() -> float:
+    """REPLICA_JANELA_ESCRITA, com o atraso máximo tolerado das réplicas como mínimo"""
+    return max(settings.REPLICA_JANELA_ESCRITA, settings.REPLICA_ATRASO_MAXIMO)
+
+
+def _cabecalho_do_cookie() -> bytes:
+    resposta = Response()
+    resposta.set_cookie(COOKIE_ESCRITA, "1", max_age=int(janela_de_escrita()), httponly=True, samesite="lax")
+    return next(valor for nome, valor in resposta.raw_headers if nome == b"set-cookie")
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.engine = criar_engine(url)
+        self.sessoes = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.async_engine = None
+        self.async_sessoes = None
+        if settings.ASYNC_DB:
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+
+            self.async_engine = criar_engine(url, assincrono=True)
+            self.async_sessoes = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+        self.saudavel = True
+
+    def verificar(self) -> bool:
+        try:
+            with self.engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    atraso = conn.execute(text(
+                        "SELECT coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)"
+                    )).scalar()
+                    return atraso <= settings.REPLICA_ATRASO_MAXIMO
+                # Lê o schema: no SQLite um SELECT 1 passa mesmo com o arquivo inválido
+                conn.execute(text("SELECT count(*) FROM sqlite_master" if conn.dialect.name == "sqlite" else "SELECT 1"))
+            return True
+        except DBAPIError:
+            return False
+
+
+class RoteadorDeLeitura:
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        if self.replicas and settings.REPLICA_JANELA_ESCRITA < settings.REPLICA_ATRASO_MAXIMO:
+            logger.warning(
+                "REPLICA_JANELA_ESCRITA (%ss) menor que REPLICA_ATRASO_MAXIMO (%ss); usando %ss",
+                settings.REPLICA_JANELA_ESCRITA, settings.REPLICA_ATRASO_MAXIMO, janela_de_escrita(),
+            )
+        self.escritas_recentes = TTLCache(settings.REPLICA_CLIENTES, janela_de_escrita())
+        self._proxima = 0
+        self._lock = threading.Lock()
+
+    def proxima(self) -> Optional[Replica]:
+        saudaveis = [r for r in self.replicas if r.saudavel]
+        if not saudaveis:
+            return None
+        with self._lock:
+            self._proxima = (self._proxima + 1) % len(saudaveis)
+            return saudaveis[self._proxima]
+
+    @staticmethod
+    def _cliente(request: Request) -> str:
+        return request.headers.get("authorization") or (request.client.host if request.client else "")
+
+    def registrar_escrita(self, request: Request):
+        if not self.replicas:
+            return
+        self.escritas_recentes.set(self._cliente(request), True)
+        # O cookie é posto pelo LeituraDoPrimarioMiddleware na resposta
+        setattr(request.state, ESCRITA_REGISTRADA, True)
+
+    def escreveu_recentemente(self, request: Request) -> bool:
+        return COOKIE_ESCRITA in request.cookies or bool(self.escritas_recentes.get(self._cliente(request)))
+
+    def replica_para(self, request: Request) -> Optional[Replica]:
+        """Réplica que atende a requisição, ou None para usar o primário"""
+        if not self.replicas or request.method not in METODOS_LEITURA or self.escreveu_recentemente(request):
+            return None
+        return self.proxima()
+
+    def marcar_falha(self, replica: Replica):
+        if replica.saudavel:
+            logger.warning("Réplica fora do rodízio: %s", replica.engine.url)
+            replica.saudavel = False
+
+    def verificar(self):
+        for replica in self.replicas:
+            if not replica.verificar():
+                self.marcar_falha(replica)
+            elif not replica.saudavel:
+                logger.info("Réplica de volta ao rodízio: %s", replica.engine.url)
+                replica.saudavel = True
+
+    async def agendar_verificacao(self, intervalo: float):
+        """Verifica as réplicas em uma thread a cada `intervalo` segundos"""
+        while True:
+            try:
+                await asyncio.to_thread(self.verificar)
+            except Exception:
+                logger.exception("Falha na verificação das réplicas")
+            await asyncio.sleep(intervalo)
+
+    async def encerrar(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+            if replica.async_engine is not None:
+                await replica.async_engine.dispose()
+
+
+roteador = RoteadorDeLeitura(settings.DATABASE_REPLICA_URLS)
+
+
+class LeituraDoPrimarioMiddleware:
+    """Middleware ASGI: põe o cookie de read-your-writes na resposta de quem escreveu.
+
+    Feito aqui, e não no `response` injetado na rota, porque uma rota que
+    devolve a própria Response (resposta_json, 304...) descartaria o cookie.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.cookie = _cabecalho_do_cookie()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in METODOS_LEITURA or not roteador.replicas:
+            return await self.app(scope, receive, send)
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start" and scope.get("state", {}).get(ESCRITA_REGISTRADA):
+                mensagem["headers"] = [*mensagem.get("headers", []), (b"set-cookie", self.cookie)]
+            await send(mensagem)
+
+        await self.app(scope, receive, enviar)
+
+
+def sessao_para(request: Request):
+    """Sessão da réplica escolhida para a requisição (ou do primário) e a réplica usada"""
+    replica = roteador.replica_para(request)
+    if replica is not None:
+        setattr(request.state, LIDO_DA_REPLICA, True)
+    return (replica.sessoes if replica else SessionLocal)(), replica
+
+
+# Dependency p/ FastAPI: leituras em réplica, escritas no primário
+def get_db_roteado(request: Request):
+    if request.method not in METODOS_LEITURA:
+        roteador.registrar_escrita(request)
+    db, replica = sessao_para(request)
+    try:
+        yield db
+    except OperationalError:
+        # Réplica fora do ar: sai do rodízio até a próxima verificação
+        if replica is not None:
+            roteador.marcar_falha(replica)
+        raise
+    finally:
+        db.close()
+
+
+# Dependency assíncrona: as rotas de ASYNC_DB são todas de leitura
+async def get_async_db_roteado(request: Request):
+    replica = roteador.replica_para(request)
+    if replica is not None:
+        setattr(request.state, LIDO_DA_REPLICA, True)
+    async with (replica.async_sessoes if replica else AsyncSessionLocal)() as db:
+        try:
+            yield db
+        except OperationalError:
+            if replica is not None:
+                roteador.marcar_falha(replica)
+            raise
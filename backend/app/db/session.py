@@ -1,9 +1,85 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.pool import AsyncQueuePoolComMetricas, QueuePoolComMetricas
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+def _pragmas_sqlite() -> list:
+    return [
+        # Leitores não bloqueiam o escritor (e vice-versa)
+        "PRAGMA journal_mode=WAL",
+        # Seguro com WAL: só perde a última transação se o sistema cair
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+    ]
+
+def _perfil_sqlite(url, assincrono: bool) -> dict:
+    if url.database in (None, "", ":memory:"):
+        # Banco em memória: mantém o pool padrão (uma conexão por thread)
+        return {}
+    return {
+        "poolclass": AsyncQueuePoolComMetricas if assincrono else QueuePoolComMetricas,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+def _perfil_postgres(url, assincrono: bool) -> dict:
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+    if assincrono:
+        connect_args = {"server_settings": {"statement_timeout": str(timeout)}}
+    else:
+        connect_args = {"options": f"-c statement_timeout={timeout}"}
+    return {
+        "poolclass": AsyncQueuePoolComMetricas if assincrono else QueuePoolComMetricas,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        # Reabre conexões antigas antes que o servidor ou um proxy as derrube
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args if timeout > 0 else {},
+    }
+
+PERFIS = {
+    "sqlite": _perfil_sqlite,
+    "postgresql": _perfil_postgres,
+}
+
+def criar_engine(url: str, assincrono: bool = False):
+    """Cria a engine (síncrona ou assíncrona) com o perfil de pool e conexão do banco"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    perfil = PERFIS[backend](parsed, assincrono) if backend in PERFIS else {"pool_pre_ping": True}
+    if assincrono:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        nova = create_async_engine(async_database_url(url), **perfil)
+        eventos = nova.sync_engine
+    else:
+        nova = create_engine(url, **perfil)
+        eventos = nova
+    if backend == "sqlite":
+        pragmas = _pragmas_sqlite()
+
+        @event.listens_for(eventos, "connect")
+        def aplicar_pragmas(conexao_dbapi, _registro):
+            cursor = conexao_dbapi.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+    return nova
+
+def estado_do_pool(engine_ou_async) -> dict:
+    """Uso do pool de uma engine; vazio se ela não usa um pool com métricas"""
+    if engine_ou_async is None:
+        return {}
+    pool = getattr(engine_ou_async, "sync_engine", engine_ou_async).pool
+    return pool.estado() if hasattr(pool, "estado") else {"status": pool.status()}
+
+engine = criar_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Dependency p/ FastAPI
@@ -13,3 +89,32 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Drivers assíncronos usados no modo ASYNC_DB
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """Converte a DATABASE_URL síncrona para o driver assíncrono equivalente"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Banco sem driver assíncrono configurado: {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.ASYNC_DB:
+    # Importado só no modo assíncrono: aiosqlite/asyncpg são opcionais
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = criar_engine(settings.DATABASE_URL, assincrono=True)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Dependency assíncrona p/ FastAPI
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
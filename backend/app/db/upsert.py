@@ -0,0 +1,22 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+
+def insert_com_conflito(db: Session, modelo):
+    """INSERT do dialeto atual, com suporte a ON CONFLICT (SQLite e Postgres)"""
+    if db.get_bind().dialect.name == "postgresql":
+        return pg_insert(modelo)
+    return sqlite_insert(modelo)
+
+
+def violacao_de_unicidade(exc: IntegrityError, coluna: str) -> bool:
+    """Se o IntegrityError veio de uma restrição UNIQUE sobre a coluna (SQLite e Postgres)"""
+    mensagem = str(exc.orig)
+    # Postgres: SQLSTATE 23505, com "Key (coluna)=(...)" no DETAIL
+    codigo = getattr(exc.orig, "pgcode", None) or getattr(exc.orig, "sqlstate", None)
+    if codigo is not None:
+        return codigo == "23505" and f"({coluna})" in mensagem
+    # SQLite: "UNIQUE constraint failed: tabela.coluna"
+    return "UNIQUE constraint failed" in mensagem and f".{coluna}" in mensagem
@@ -2,20 +2,49 @@ from fastapi import FastAPI, Form, HTTPException, status, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 
+from app.core.cache_http import CacheHttpMiddleware
 from app.core.config import settings
-from app.db.session import engine, get_db
-from app.db import base  # importa modelos para o create_all
+from app.core.metricas import MetricasMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.session import SessionLocal, async_engine, engine, get_db
+from app.db import migracoes
+from app.db.replicas import LeituraDoPrimarioMiddleware, roteador
 from app.api.routes.users import router as users_router
 from app.api.routes.licitacoes import router as licitacoes_router
 from app.api.routes.contratos import router as contratos_router
 from app.api.routes.notificacoes import router as notificacoes_router
-from app.models.user import Usuario
-from app.core.auth import verify_password, create_access_token
+from app.api.routes.dashboard import router as dashboard_router
+from app.api.routes.relatorios import router as relatorios_router
+from app.api.routes.eventos import router as eventos_router
+from app.api.routes.busca import router as busca_router
+from app.api.routes.fornecedores import router as fornecedores_router
+from app.api.routes.exportacao import router as exportacao_router
+from app.api.routes.sincronizacao import router as sincronizacao_router
+from app.api.routes.monitoramento import router as monitoramento_router
+from app.api.routes.auditoria import router as auditoria_router
+from app.core.auth import IdentificacaoMiddleware, autenticar_usuario, create_access_token
+from app.core.hashing import pool_de_hash
 from app.schemas.user import Token
+from app.services import alertas, auditoria, fornecedores, idempotencia, resumo, sincronizacao
+from app.services.exportacao import MARCA_DAGUA_HEADER
 from datetime import timedelta
+import asyncio
 
 app = FastAPI(title="Monitoramento de Licitações e Contratos")
 
+# ETag/304 nas leituras de licitações e contratos. Adicionado antes do CORS
+# para ficar por dentro dele: as respostas do cache também levam os cabeçalhos
+app.add_middleware(
+    CacheHttpMiddleware,
+    recursos={
+        # A listagem com expand=contratos e o detalhe mudam com os contratos
+        "/licitacoes": ("licitacoes", "contratos"),
+        "/contratos": ("contratos",),
+        # Os totais por fornecedor mudam com as escritas de contratos
+        "/fornecedores": ("contratos",),
+    },
+)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -32,37 +61,75 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        NEXT_CURSOR_HEADER, MARCA_DAGUA_HEADER, idempotencia.REPETIDA_HEADER, "ETag", "Server-Timing",
+    ],
 )
 
-# cria tabelas (simples – depois você pode migrar para Alembic)
+# Cookie de read-your-writes nas respostas das escritas (réplicas de leitura)
+app.add_middleware(LeituraDoPrimarioMiddleware)
+
+# Autor das escritas para a trilha de auditoria (lê só o token, sem banco)
+app.add_middleware(IdentificacaoMiddleware)
+
+# Por último para ficar por fora de todos: mede também o cache e o CORS
+app.add_middleware(MetricasMiddleware)
+
+# Esquema conforme DB_ESQUEMA: create_all, migrações do Alembic ou nenhum DDL
 @app.on_event("startup")
 def on_startup():
-    base.Base.metadata.create_all(bind=engine)
+    migracoes.preparar_esquema(engine, settings.DB_ESQUEMA)
+    db = SessionLocal()
+    try:
+        resumo.garantir_resumo(db)
+    finally:
+        db.close()
+
+# Tarefas periódicas que rodam junto com o app
+tarefas_em_segundo_plano = []
+
+@app.on_event("startup")
+async def iniciar_tarefas():
+    if settings.ALERTA_INTERVALO > 0:
+        tarefas_em_segundo_plano.append(
+            asyncio.create_task(alertas.agendar_varredura(settings.ALERTA_INTERVALO))
+        )
+    if settings.FORNECEDOR_PREENCHIMENTO_LOTE > 0:
+        tarefas_em_segundo_plano.append(
+            asyncio.create_task(fornecedores.preencher_em_segundo_plano(settings.FORNECEDOR_PREENCHIMENTO_LOTE))
+        )
+    if settings.AUDITORIA_INTERVALO > 0:
+        tarefas_em_segundo_plano.append(
+            asyncio.create_task(auditoria.agendar_gravacao(settings.AUDITORIA_INTERVALO))
+        )
+    if settings.IDEMPOTENCIA_TTL > 0:
+        tarefas_em_segundo_plano.append(asyncio.create_task(idempotencia.agendar_limpeza()))
+    if settings.SYNC_RETENCAO_DIAS > 0:
+        tarefas_em_segundo_plano.append(asyncio.create_task(sincronizacao.agendar_limpeza()))
+    if roteador.replicas:
+        tarefas_em_segundo_plano.append(
+            asyncio.create_task(roteador.agendar_verificacao(settings.REPLICA_VERIFICACAO_INTERVALO))
+        )
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    for tarefa in tarefas_em_segundo_plano:
+        tarefa.cancel()
+    # Depois de parar a tarefa: grava o que ainda está na fila
+    auditoria.encerrar()
+    pool_de_hash.encerrar()
+    await roteador.encerrar()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 @app.get("/")
 def root():
     return {"message": "API rodando"}
 
 @app.post("/login", response_model=Token)
-def login_global(username: str = Form(), password: str = Form(), db: Session = Depends(get_db)):
+async def login_global(username: str = Form(), password: str = Form(), db: Session = Depends(get_db)):
     """Rota de login global - autentica usuário e retorna token JWT"""
-    # Buscar usuário no banco
-    user = db.query(Usuario).filter(Usuario.username == username).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Username ou senha incorretos",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Verificar senha
-    if not verify_password(password, user.password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Username ou senha incorretos",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user = await autenticar_usuario(db, username, password)
     
     # Criar token
     access_token_expires = timedelta(minutes=30)
@@ -81,7 +148,20 @@ def login_global(username: str = Form(), password: str = Form(), db: Session = D
     }
 
 # rotas
+app.include_router(eventos_router)
+if settings.ASYNC_DB:
+    # Registradas antes para atender os GETs no lugar das versões síncronas
+    from app.api.routes.leituras_async import router as leituras_async_router
+    app.include_router(leituras_async_router)
 app.include_router(users_router)
 app.include_router(licitacoes_router)
 app.include_router(contratos_router)
 app.include_router(notificacoes_router)
+app.include_router(dashboard_router)
+app.include_router(relatorios_router)
+app.include_router(busca_router)
+app.include_router(fornecedores_router)
+app.include_router(exportacao_router)
+app.include_router(sincronizacao_router)
+app.include_router(auditoria_router)
+app.include_router(monitoramento_router)
@@ -0,0 +1,14 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime
+from app.db.base import Base
+
+class AlertaEnviado(Base):
+    """Registro dos alertas já gerados: cada (entidade, registro, horizonte, data) dispara uma vez"""
+    __tablename__ = "alertas_enviados"
+
+    entidade = Column(String(20), primary_key=True)  # "contrato" ou "licitacao"
+    ref_id = Column(Integer, primary_key=True)
+    horizonte = Column(Integer, primary_key=True)  # dias antes do vencimento; 0 = prazo já passou
+    # Data que originou o alerta: se o contrato for prorrogado, os horizontes valem de novo
+    data_referencia = Column(Date, primary_key=True)
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from app.db.base import Base
+
+class Auditoria(Base):
+    """Alteração em uma licitação ou contrato; só recebe inserções, nunca é alterada"""
+    __tablename__ = "auditoria"
+
+    id = Column(Integer, primary_key=True)
+    entidade = Column(String(20), nullable=False)  # "licitacoes" ou "contratos"
+    ref_id = Column(Integer, nullable=False)
+    acao = Column(String(10), nullable=False)  # "inclusao", "alteracao" ou "exclusao"
+    usuario = Column(String(50), nullable=True)  # username do token; nulo sem autenticação
+    alterado_em = Column(DateTime, nullable=False)
+    # JSON só com os campos alterados: {"campo": [antes, depois]} na alteração,
+    # {"campo": valor} na inclusão e na exclusão
+    alteracoes = Column(Text, nullable=False)
+
+    __table_args__ = (
+        # Histórico de um registro, do mais recente para o mais antigo
+        Index("ix_auditoria_entidade_ref_id", "entidade", "ref_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
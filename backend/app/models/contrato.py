@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Date, Text, ForeignKey, DECIMAL
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, ForeignKey, DECIMAL, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -9,12 +10,33 @@ class Contrato(Base):
     numero_contrato = Column(String(50), unique=True, nullable=False, index=True)
     licitacao_id = Column(Integer, ForeignKey("licitacoes.id_licitacao"), nullable=False)
     fornecedor = Column(String(200), nullable=False)
+    # Preenchido na gravação; contratos antigos pelo preenchimento em segundo plano
+    fornecedor_id = Column(Integer, ForeignKey("fornecedores.id", name="fk_contratos_fornecedor_id"), nullable=True)
     objeto = Column(Text, nullable=False)
     valor_total = Column(DECIMAL(15, 2), nullable=False)
     data_assinatura = Column(Date, nullable=False)
     data_inicio = Column(Date, nullable=False)
     data_fim = Column(Date, nullable=True)
     status = Column(String(30), nullable=False, default="Ativo")
+    # Nulos nas linhas anteriores ao controle de alterações (GET /sync)
+    criado_em = Column(DateTime, default=datetime.utcnow)
+    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Controle de concorrência otimista: é o ETag do contrato. PUT/DELETE gravam
+    # com UPDATE/DELETE ... WHERE id = ? AND versao = ? (If-Match); escritas
+    # pelo ORM fazem o mesmo via version_id_col
+    versao = Column(Integer, nullable=False, default=1, server_default="1")
     
     # Relacionamento com licitação
-    licitacao = relationship("Licitacao", back_populates="contratos")
\ No newline at end of file
+    licitacao = relationship("Licitacao", back_populates="contratos")
+
+    __table_args__ = (
+        # Varredura de vencimentos por faixa de data_fim
+        Index("ix_contratos_fim_id", "data_fim", "id"),
+        # Contratos de uma licitação (detalhe, expand=contratos, resumo e exclusão)
+        Index("ix_contratos_licitacao_id", "licitacao_id"),
+        # Contratos de um fornecedor e os ainda sem fornecedor_id (preenchimento)
+        Index("ix_contratos_fornecedor_id", "fornecedor_id"),
+        # Alterações desde um token de sincronização
+        Index("ix_contratos_atualizado_id", "atualizado_em", "id"),
+    )
+    __mapper_args__ = {"version_id_col": versao}
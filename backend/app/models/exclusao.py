@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.db.base import Base
+
+class Exclusao(Base):
+    """Lápide de um registro excluído: quem sincroniza (GET /sync) fica sabendo da exclusão"""
+    __tablename__ = "exclusoes"
+
+    id = Column(Integer, primary_key=True)
+    entidade = Column(String(20), nullable=False)  # "licitacoes", "contratos" ou "usuarios"
+    ref_id = Column(Integer, nullable=False)
+    excluido_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Exclusões desde um token de sincronização; limpeza das antigas
+        Index("ix_exclusoes_excluido_id", "excluido_em", "id"),
+        {"sqlite_autoincrement": True},
+    )
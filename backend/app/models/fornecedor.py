@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DECIMAL, Index
+from app.db.base import Base
+
+class Fornecedor(Base):
+    """Fornecedor identificado pelo CNPJ ou, sem ele, pelo nome normalizado"""
+    __tablename__ = "fornecedores"
+
+    id = Column(Integer, primary_key=True)
+    cnpj = Column(String(14), nullable=True, unique=True)  # só dígitos
+    nome = Column(String(200), nullable=False)  # como apareceu no primeiro contrato
+    nome_normalizado = Column(String(200), nullable=False)  # sem acentos, pontuação e caixa
+
+    __table_args__ = (
+        # Um fornecedor sem CNPJ por nome; com CNPJ, o nome pode repetir
+        Index(
+            "uq_fornecedores_nome_sem_cnpj", "nome_normalizado", unique=True,
+            sqlite_where=cnpj.is_(None), postgresql_where=cnpj.is_(None),
+        ),
+        Index("ix_fornecedores_nome_normalizado", "nome_normalizado"),
+    )
+
+
+class ResumoFornecedor(Base):
+    """Totais por fornecedor e ano de assinatura (ano = 0 é o total geral), mantidos incrementalmente"""
+    __tablename__ = "resumo_fornecedores"
+
+    fornecedor_id = Column(Integer, primary_key=True)
+    ano = Column(Integer, primary_key=True)
+    quantidade = Column(Integer, nullable=False, default=0)
+    valor_total = Column(DECIMAL(17, 2), nullable=False, default=0)
+    ativos = Column(Integer, nullable=False, default=0)  # status em ALERTA_STATUS_CONTRATO
+
+    __table_args__ = (
+        # Ranking por ano: lê os N primeiros do índice, sem ordenar
+        Index("ix_resumo_fornecedores_ano_valor", "ano", "valor_total", "fornecedor_id"),
+        Index("ix_resumo_fornecedores_ano_quantidade", "ano", "quantidade", "fornecedor_id"),
+    )
@@ -0,0 +1,19 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from app.db.base import Base
+
+class ChaveIdempotencia(Base):
+    """Resposta de um POST atendido com Idempotency-Key, devolvida de novo nas repetições"""
+    __tablename__ = "chaves_idempotencia"
+
+    escopo = Column(String(50), primary_key=True)  # rota, ex.: "POST /contratos"
+    chave = Column(String(200), primary_key=True)
+    impressao = Column(String(64), nullable=False)  # sha256 do corpo da requisição
+    status_code = Column(Integer, nullable=False)
+    resposta = Column(Text, nullable=False)
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Limpeza das chaves vencidas (IDEMPOTENCIA_TTL)
+        Index("ix_chaves_idempotencia_criado_em", "criado_em"),
+    )
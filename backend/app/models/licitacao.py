@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Date, UniqueConstraint
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -6,15 +7,29 @@ class Licitacao(Base):
     __tablename__ = "licitacoes"
 
     id_licitacao = Column(Integer, primary_key=True, index=True)
-    numero_processo = Column(String(50), nullable=False, unique=True)
+    numero_processo = Column(String(50), nullable=False)
     modalidade = Column(String(30), nullable=False)
     objeto = Column(String, nullable=False)
     orgao_responsavel = Column(String(100), nullable=False)
     data_abertura = Column(Date, nullable=False)
     data_encerramento = Column(Date, nullable=True)
     status = Column(String(20), nullable=False)
+    # Nulos nas linhas anteriores ao controle de alterações (GET /sync)
+    criado_em = Column(DateTime, default=datetime.utcnow)
+    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relacionamento com contratos
     contratos = relationship("Contrato", back_populates="licitacao")
 
-    __table_args__ = (UniqueConstraint("numero_processo", name="uq_numero_processo"),)
+    __table_args__ = (
+        UniqueConstraint("numero_processo", name="uq_numero_processo"),
+        # Índices compostos para a paginação por cursor com filtros
+        Index("ix_licitacoes_abertura_id", "data_abertura", "id_licitacao"),
+        Index("ix_licitacoes_status_abertura_id", "status", "data_abertura", "id_licitacao"),
+        Index("ix_licitacoes_modalidade_abertura_id", "modalidade", "data_abertura", "id_licitacao"),
+        Index("ix_licitacoes_orgao_abertura_id", "orgao_responsavel", "data_abertura", "id_licitacao"),
+        # Licitações abertas com data de encerramento vencida
+        Index("ix_licitacoes_status_encerramento_id", "status", "data_encerramento", "id_licitacao"),
+        # Alterações desde um token de sincronização
+        Index("ix_licitacoes_atualizado_id", "atualizado_em", "id_licitacao"),
+    )
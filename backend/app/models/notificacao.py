@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from datetime import datetime
@@ -16,4 +16,29 @@ class Notificacao(Base):
     data_leitura = Column(DateTime, nullable=True)
     
     # Relacionamento com usuário (opcional)
-    usuario = relationship("Usuario", back_populates="notificacoes")
\ No newline at end of file
+    usuario = relationship("Usuario", back_populates="notificacoes")
+
+    __table_args__ = (
+        # Listagem por usuário filtrando não lidas, ordenada por data
+        Index("ix_notificacoes_usuario_lida_criacao", "usuario_id", "lida", "data_criacao"),
+        # Varredura das globais acima da marca de leitura de um usuário
+        Index("ix_notificacoes_usuario_id_id", "usuario_id", "id"),
+        # Ids nunca reaproveitados: a marca de leitura depende disso
+        {"sqlite_autoincrement": True},
+    )
+
+class NotificacaoLeitura(Base):
+    """Confirmação de leitura de uma notificação global por um usuário"""
+    __tablename__ = "notificacoes_leituras"
+
+    usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="CASCADE"), primary_key=True)
+    notificacao_id = Column(Integer, ForeignKey("notificacoes.id", ondelete="CASCADE"), primary_key=True)
+    data_leitura = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class NotificacaoMarcaLeitura(Base):
+    """Todas as notificações globais com id <= lida_ate_id estão lidas para o usuário"""
+    __tablename__ = "notificacoes_marcas_leitura"
+
+    usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="CASCADE"), primary_key=True)
+    lida_ate_id = Column(Integer, nullable=False, default=0)
+    atualizado_em = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, DECIMAL
+from app.db.base import Base
+
+class ResumoDashboard(Base):
+    """Contadores agregados mantidos incrementalmente para o dashboard"""
+    __tablename__ = "resumo_dashboard"
+
+    entidade = Column(String(30), primary_key=True)  # "licitacoes", "contratos", "usuarios", "notificacoes_nao_lidas"
+    ano = Column(Integer, primary_key=True)  # 0 quando a entidade não é agrupada por data
+    mes = Column(Integer, primary_key=True)
+    status = Column(String(30), primary_key=True)  # "" quando a entidade não tem status
+    quantidade = Column(Integer, nullable=False, default=0)
+    valor_total = Column(DECIMAL(17, 2), nullable=False, default=0)
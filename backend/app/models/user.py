@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -8,6 +9,14 @@ class Usuario(Base):
     username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(120), unique=True, nullable=False)
     password = Column(String(255), nullable=False)
+    # Nulos nas linhas anteriores ao controle de alterações (GET /sync)
+    criado_em = Column(DateTime, default=datetime.utcnow)
+    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relacionamento com notificações
     notificacoes = relationship("Notificacao", back_populates="usuario")
+
+    __table_args__ = (
+        # Alterações desde um token de sincronização
+        Index("ix_usuarios_atualizado_id", "atualizado_em", "id"),
+    )
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class AuditoriaOut(BaseModel):
+    id: int
+    acao: str
+    usuario: Optional[str] = None
+    alterado_em: datetime
+    # {"campo": [antes, depois]} na alteração; {"campo": valor} na inclusão e na exclusão
+    alteracoes: dict
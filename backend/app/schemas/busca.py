@@ -0,0 +1,19 @@
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel
+
+class ResultadoBusca(BaseModel):
+    tipo: str  # "licitacao" ou "contrato"
+    id: int
+    numero: str
+    objeto: str
+    orgao_responsavel: Optional[str] = None
+    fornecedor: Optional[str] = None
+    data: date
+    status: str
+    relevancia: float
+
+class BuscaOut(BaseModel):
+    resultados: List[ResultadoBusca]
+    proximo_offset: Optional[int] = None  # None quando não há mais páginas
+    max_resultados: int  # offset + limit não passa daqui (BUSCA_MAX_CANDIDATOS)
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+import re
+from pydantic import BaseModel, field_validator
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 
 class ContratoBase(BaseModel):
@@ -14,8 +15,20 @@ class ContratoBase(BaseModel):
     data_fim: Optional[date] = None
     status: str = "Ativo"
 
+def _cnpj(valor: Optional[str]) -> Optional[str]:
+    """Aceita o CNPJ com ou sem máscara e guarda só os dígitos"""
+    if valor is None or not valor.strip():
+        return None
+    digitos = re.sub(r"\D", "", valor)
+    if len(digitos) != 14:
+        raise ValueError("CNPJ deve ter 14 dígitos")
+    return digitos
+
 class ContratoCreate(ContratoBase):
-    pass
+    # Identifica o fornecedor; sem ele, o fornecedor é reconhecido pelo nome
+    fornecedor_cnpj: Optional[str] = None
+
+    _normalizar_cnpj = field_validator("fornecedor_cnpj")(_cnpj)
 
 class ContratoUpdate(BaseModel):
     numero_contrato: Optional[str] = None
@@ -26,9 +39,17 @@ class ContratoUpdate(BaseModel):
     data_inicio: Optional[date] = None
     data_fim: Optional[date] = None
     status: Optional[str] = None
+    fornecedor_cnpj: Optional[str] = None
+
+    _normalizar_cnpj = field_validator("fornecedor_cnpj")(_cnpj)
 
 class ContratoOut(ContratoBase):
     id: int
+    fornecedor_id: Optional[int] = None
+    criado_em: Optional[datetime] = None
+    atualizado_em: Optional[datetime] = None
+    # Enviada de volta em If-Match no PUT/DELETE
+    versao: int
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Dict, List
+from decimal import Decimal
+from app.schemas.licitacao import LicitacaoOut
+
+class ResumoDashboardOut(BaseModel):
+    ano: int
+    total_licitacoes: int
+    total_contratos: int
+    valor_total_contratos: Decimal
+    total_usuarios: int
+    notificacoes_nao_lidas: int
+    licitacoes_por_mes: List[int]  # janeiro..dezembro do ano consultado
+    licitacoes_por_trimestre: List[int]
+    valor_contratos_por_trimestre: List[Decimal]
+    licitacoes_por_status: Dict[str, int]
+    ultimas_licitacoes: List[LicitacaoOut]
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from decimal import Decimal
+
+class FornecedorOut(BaseModel):
+    id: int
+    cnpj: Optional[str] = None
+    nome: str
+
+    class Config:
+        from_attributes = True
+
+class TotaisFornecedor(BaseModel):
+    ano: int  # 0 = todos os anos
+    quantidade: int = 0
+    valor_total: Decimal = Decimal("0")
+    ativos: int = 0
+
+class ResumoFornecedorOut(BaseModel):
+    fornecedor: FornecedorOut
+    total: TotaisFornecedor  # do ano pedido, ou de todos os anos
+    por_ano: List[TotaisFornecedor]
+
+class RankingFornecedorOut(TotaisFornecedor):
+    fornecedor: FornecedorOut
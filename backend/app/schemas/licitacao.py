@@ -1,6 +1,8 @@
 from pydantic import BaseModel
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
+from app.schemas.contrato import ContratoOut
 
 class LicitacaoCreate(BaseModel):
     numero_processo: str
@@ -13,3 +15,17 @@ class LicitacaoCreate(BaseModel):
 
 class LicitacaoOut(LicitacaoCreate):
     id_licitacao: int
+    criado_em: Optional[datetime] = None
+    atualizado_em: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ResumoContratos(BaseModel):
+    quantidade: int = 0
+    valor_total: Decimal = Decimal("0")
+    ativos: int = 0
+
+class LicitacaoDetalhe(LicitacaoOut):
+    contratos: List[ContratoOut] = []
+    resumo_contratos: ResumoContratos = ResumoContratos()
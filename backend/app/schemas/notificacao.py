@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 class NotificacaoBase(BaseModel):
@@ -17,6 +17,11 @@ class NotificacaoUpdate(BaseModel):
     tipo: Optional[str] = None
     lida: Optional[bool] = None
 
+class NotificacaoLote(BaseModel):
+    ids: List[int]
+    acao: Literal["marcar_lida", "deletar"]
+    usuario_id: Optional[int] = None  # marca as globais como lidas só para este usuário
+
 class NotificacaoOut(NotificacaoBase):
     id: int
     lida: bool
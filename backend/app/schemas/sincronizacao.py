@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+from app.schemas.contrato import ContratoOut
+from app.schemas.licitacao import LicitacaoOut
+from app.schemas.user import UserOut
+
+class UsuarioSync(UserOut):
+    criado_em: Optional[datetime] = None
+    atualizado_em: Optional[datetime] = None
+
+class ExclusaoOut(BaseModel):
+    entidade: str
+    id: int
+    excluido_em: datetime
+
+class SyncOut(BaseModel):
+    licitacoes: List[LicitacaoOut] = []
+    contratos: List[ContratoOut] = []
+    usuarios: List[UsuarioSync] = []
+    excluidos: List[ExclusaoOut] = []
+    # Token para a próxima chamada (since); com mais = true, chame de novo já
+    proximo: str
+    mais: bool
@@ -0,0 +1,162 @@
+"""Varredura periódica de vencimentos que gera notificações globais.
+
+Contratos em vigor com data_fim dentro de um dos horizontes (ALERTA_HORIZONTES)
+e licitações ainda abertas com data_encerramento vencida. Cada alerta é
+registrado em alertas_enviados com ON CONFLICT DO NOTHING, então ele sai uma
+vez só, mesmo que a varredura rode de novo ou em vários workers ao mesmo tempo.
+"""
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.eventos import publicar_notificacao
+from app.db.session import SessionLocal
+from app.db.upsert import insert_com_conflito
+from app.models.alerta import AlertaEnviado
+from app.models.contrato import Contrato
+from app.models.licitacao import Licitacao
+from app.models.notificacao import Notificacao
+from app.services import resumo
+
+logger = logging.getLogger(__name__)
+
+CONTRATO = "contrato"
+LICITACAO = "licitacao"
+
+
+def _em_lotes(db: Session, stmt, coluna_data, coluna_id, tamanho: int) -> Iterator[list]:
+    """Percorre o resultado em lotes por keyset em (data, id), sem OFFSET.
+
+    As linhas do SELECT devem ter o id na primeira coluna e a data na última.
+    """
+    posicao = None
+    while True:
+        consulta = stmt
+        if posicao:
+            data_ref, id_ref = posicao
+            consulta = consulta.where(or_(
+                coluna_data > data_ref,
+                and_(coluna_data == data_ref, coluna_id > id_ref),
+            ))
+        linhas = db.execute(consulta.order_by(coluna_data, coluna_id).limit(tamanho)).all()
+        if not linhas:
+            return
+        yield linhas
+        posicao = (linhas[-1][-1], linhas[-1][0])
+
+
+def _horizonte(dias_restantes: int, horizontes: List[int]) -> int:
+    """Menor horizonte que já alcançou o vencimento (os maiores ficam para trás)"""
+    return next(h for h in horizontes if dias_restantes <= h)
+
+
+def _alertas_contratos(linhas, hoje: date, horizontes: List[int]) -> List[Tuple[dict, dict]]:
+    alertas = []
+    for contrato_id, numero, fornecedor, data_fim in linhas:
+        dias = (data_fim - hoje).days
+        horizonte = _horizonte(dias, horizontes)
+        prazo = "hoje" if dias == 0 else f"em {dias} dia{'s' if dias > 1 else ''}"
+        alertas.append((
+            {"entidade": CONTRATO, "ref_id": contrato_id, "horizonte": horizonte, "data_referencia": data_fim},
+            {
+                "titulo": f"Contrato {numero} vence {prazo}",
+                "mensagem": f"O contrato {numero} ({fornecedor}) termina em {data_fim:%d/%m/%Y}.",
+                "tipo": "warning" if horizonte <= 30 else "info",
+                "usuario_id": None,
+            },
+        ))
+    return alertas
+
+
+def _alertas_licitacoes(linhas) -> List[Tuple[dict, dict]]:
+    alertas = []
+    for licitacao_id, numero, status, data_encerramento in linhas:
+        alertas.append((
+            {"entidade": LICITACAO, "ref_id": licitacao_id, "horizonte": 0, "data_referencia": data_encerramento},
+            {
+                "titulo": f"Licitação {numero} com prazo encerrado",
+                "mensagem": (
+                    f"A licitação {numero} passou da data de encerramento ({data_encerramento:%d/%m/%Y}) "
+                    f"e ainda está com status '{status}'."
+                ),
+                "tipo": "warning",
+                "usuario_id": None,
+            },
+        ))
+    return alertas
+
+
+def _emitir(db: Session, alertas: List[Tuple[dict, dict]]) -> list:
+    """Registra os alertas e cria as notificações só dos que ainda não tinham saído"""
+    if not alertas:
+        return []
+    stmt = insert_com_conflito(db, AlertaEnviado).on_conflict_do_nothing().returning(
+        AlertaEnviado.entidade, AlertaEnviado.ref_id, AlertaEnviado.horizonte, AlertaEnviado.data_referencia
+    )
+    novos = {tuple(linha) for linha in db.execute(stmt, [chave for chave, _ in alertas])}
+    linhas = [
+        notificacao for chave, notificacao in alertas
+        if (chave["entidade"], chave["ref_id"], chave["horizonte"], chave["data_referencia"]) in novos
+    ]
+    if not linhas:
+        return []
+    notificacoes = db.scalars(insert(Notificacao).returning(Notificacao), linhas).all()
+    resumo.ajustar(db, resumo.NOTIFICACOES_NAO_LIDAS, len(notificacoes))
+    return notificacoes
+
+
+def varrer(db: Session, hoje: Optional[date] = None) -> dict:
+    """Uma passada completa, com commit por lote; devolve quantas notificações foram criadas"""
+    hoje = hoje or date.today()
+    horizontes = settings.ALERTA_HORIZONTES
+    totais = {"contratos": 0, "licitacoes": 0}
+
+    contratos = select(Contrato.id, Contrato.numero_contrato, Contrato.fornecedor, Contrato.data_fim).where(
+        Contrato.data_fim >= hoje,
+        Contrato.data_fim <= hoje + timedelta(days=max(horizontes)),
+        Contrato.status.in_(settings.ALERTA_STATUS_CONTRATO),
+    )
+    for linhas in _em_lotes(db, contratos, Contrato.data_fim, Contrato.id, settings.ALERTA_LOTE):
+        notificacoes = _emitir(db, _alertas_contratos(linhas, hoje, horizontes))
+        db.commit()
+        totais["contratos"] += len(notificacoes)
+        for notificacao in notificacoes:
+            publicar_notificacao(notificacao)
+
+    licitacoes = select(
+        Licitacao.id_licitacao, Licitacao.numero_processo, Licitacao.status, Licitacao.data_encerramento
+    ).where(
+        Licitacao.status.in_(settings.ALERTA_STATUS_LICITACAO),
+        Licitacao.data_encerramento < hoje,
+    )
+    for linhas in _em_lotes(db, licitacoes, Licitacao.data_encerramento, Licitacao.id_licitacao, settings.ALERTA_LOTE):
+        notificacoes = _emitir(db, _alertas_licitacoes(linhas))
+        db.commit()
+        totais["licitacoes"] += len(notificacoes)
+        for notificacao in notificacoes:
+            publicar_notificacao(notificacao)
+
+    return totais
+
+
+def _varrer_com_sessao() -> dict:
+    db = SessionLocal()
+    try:
+        return varrer(db)
+    finally:
+        db.close()
+
+
+async def agendar_varredura(intervalo: float):
+    """Roda a varredura em uma thread a cada `intervalo` segundos, sem ocupar o event loop"""
+    while True:
+        try:
+            await asyncio.to_thread(_varrer_com_sessao)
+        except Exception:
+            logger.exception("Falha na varredura de vencimentos")
+        await asyncio.sleep(intervalo)
@@ -0,0 +1,193 @@
+"""Trilha de auditoria de licitações e contratos: quem alterou o quê e quando.
+
+Os eventos da sessão capturam, a cada flush, só os campos que mudaram
+(histórico dos atributos do ORM) e guardam as entradas em session.info. No
+commit elas vão para uma fila em memória; no rollback são descartadas. A
+gravação em `auditoria` sai da requisição: a tarefa agendar_gravacao esvazia a
+fila em lotes (um INSERT com vários valores) a cada AUDITORIA_INTERVALO
+segundos, e o encerramento do app grava o que sobrou. A requisição paga só a
+comparação dos atributos e um append na fila.
+
+Entradas ainda na fila se perdem se o processo morrer sem encerrar; com
+AUDITORIA_INTERVALO=0 elas são gravadas logo após cada commit, ainda na
+requisição, em transação própria.
+
+As importações em lote gravam com INSERT/upsert do Core, sem passar pelo
+histórico do ORM, e registram as entradas com registrar(). O preenchimento de
+contratos.fornecedor_id (derivado do nome/CNPJ) não é auditado.
+"""
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+import orjson
+from sqlalchemy import event, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.auth import usuario_da_requisicao
+from app.core.config import settings
+from app.db.session import engine
+from app.models.auditoria import Auditoria
+from app.models.contrato import Contrato
+from app.models.licitacao import Licitacao
+
+logger = logging.getLogger(__name__)
+
+INCLUSAO = "inclusao"
+ALTERACAO = "alteracao"
+EXCLUSAO = "exclusao"
+
+# Preenchidos pelo próprio banco/ORM a cada escrita: só ocupariam espaço
+IGNORADOS = {"criado_em", "atualizado_em", "versao"}
+
+PENDENTES = "auditoria_pendente"
+
+
+def _campos(modelo) -> list:
+    mapper = inspect(modelo)
+    chaves = {coluna.key for coluna in mapper.primary_key}
+    return [atributo.key for atributo in mapper.column_attrs if atributo.key not in chaves | IGNORADOS]
+
+
+# modelo -> (entidade, atributo do id, campos auditados)
+ENTIDADES = {
+    Licitacao: ("licitacoes", "id_licitacao", _campos(Licitacao)),
+    Contrato: ("contratos", "id", _campos(Contrato)),
+}
+
+# Entradas confirmadas esperando a gravação; deque aceita append de várias threads
+_fila: deque = deque()
+_gravacao_em_segundo_plano = False
+_lock_gravacao = threading.Lock()
+
+
+def diferencas(antigo: dict, novo: dict) -> dict:
+    """{campo: [antes, depois]} dos campos de `novo` com valor diferente do antigo"""
+    return {
+        campo: [antigo.get(campo), valor] for campo, valor in novo.items()
+        if campo not in IGNORADOS and antigo.get(campo) != valor
+    }
+
+
+def valores(linha: dict) -> dict:
+    """Campos preenchidos de uma inclusão ou exclusão"""
+    return {campo: valor for campo, valor in linha.items() if campo not in IGNORADOS and valor is not None}
+
+
+def registrar(db: Session, entidade: str, ref_id: int, acao: str, alteracoes: dict):
+    """Anota uma entrada na transação atual; vai para a fila no commit e some no rollback"""
+    if alteracoes or acao != ALTERACAO:
+        db.info.setdefault(PENDENTES, []).append({
+            "entidade": entidade,
+            "ref_id": ref_id,
+            "acao": acao,
+            "usuario": usuario_da_requisicao(),
+            "alterado_em": datetime.utcnow(),
+            "alteracoes": alteracoes,
+        })
+
+
+@event.listens_for(Session, "after_flush")
+def _capturar(session, contexto_flush):
+    # Ainda com o estado de antes do flush: new/dirty/deleted e o histórico
+    # dos atributos valem, e os objetos novos já têm id
+    for objetos, acao in ((session.new, INCLUSAO), (session.dirty, ALTERACAO), (session.deleted, EXCLUSAO)):
+        for obj in objetos:
+            auditada = ENTIDADES.get(type(obj))
+            if auditada is None:
+                continue
+            entidade, atributo_id, campos = auditada
+            estado = inspect(obj)
+            if acao == ALTERACAO:
+                alteracoes = {}
+                for campo in campos:
+                    mudanca = estado.attrs[campo].history
+                    if mudanca.has_changes():
+                        alteracoes[campo] = [
+                            mudanca.deleted[0] if mudanca.deleted else None,
+                            mudanca.added[0] if mudanca.added else None,
+                        ]
+            else:
+                alteracoes = valores({campo: estado.dict.get(campo) for campo in campos})
+            registrar(session, entidade, getattr(obj, atributo_id), acao, alteracoes)
+
+
+@event.listens_for(Session, "after_commit")
+def _confirmar(session):
+    entradas = session.info.pop(PENDENTES, None)
+    if not entradas:
+        return
+    if _gravacao_em_segundo_plano:
+        _fila.extend(entradas)
+    else:
+        _gravar(session.get_bind(), entradas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar(session):
+    session.info.pop(PENDENTES, None)
+
+
+def _gravar(bind, entradas: list):
+    # Decimal vira string, como nas respostas da API
+    linhas = [
+        {**entrada, "alteracoes": orjson.dumps(entrada["alteracoes"], default=str).decode()}
+        for entrada in entradas
+    ]
+    with bind.connect() as conexao:
+        conexao.execute(insert(Auditoria), linhas)
+        conexao.commit()
+
+
+def descarregar() -> int:
+    """Grava a fila em lotes de AUDITORIA_LOTE; devolve quantas entradas foram gravadas"""
+    gravadas = 0
+    with _lock_gravacao:
+        while _fila:
+            lote = [_fila.popleft() for _ in range(min(len(_fila), settings.AUDITORIA_LOTE))]
+            try:
+                _gravar(engine, lote)
+            except Exception:
+                # Volta para o começo da fila, na mesma ordem, para a próxima tentativa
+                _fila.extendleft(reversed(lote))
+                raise
+            gravadas += len(lote)
+    return gravadas
+
+
+async def agendar_gravacao(intervalo: float):
+    """Grava as entradas confirmadas a cada `intervalo` segundos, em uma thread"""
+    global _gravacao_em_segundo_plano
+    _gravacao_em_segundo_plano = True
+    while True:
+        await asyncio.sleep(intervalo)
+        try:
+            await asyncio.to_thread(descarregar)
+        except Exception:
+            logger.exception("Falha na gravação da trilha de auditoria; %d entradas na fila", len(_fila))
+
+
+def encerrar():
+    """Volta a gravar no commit e grava o que ficou na fila (encerramento do app)"""
+    global _gravacao_em_segundo_plano
+    _gravacao_em_segundo_plano = False
+    try:
+        descarregar()
+    except Exception:
+        logger.exception("Trilha de auditoria: %d entradas perdidas no encerramento", len(_fila))
+
+
+def historico(db: Session, entidade: str, ref_id: int, antes_de: Optional[int], limite: int) -> list:
+    """Entradas de um registro, da mais recente para a mais antiga, pelo índice (entidade, ref_id, id)"""
+    stmt = select(
+        Auditoria.id, Auditoria.acao, Auditoria.usuario, Auditoria.alterado_em, Auditoria.alteracoes,
+    ).where(Auditoria.entidade == entidade, Auditoria.ref_id == ref_id)
+    if antes_de is not None:
+        stmt = stmt.where(Auditoria.id < antes_de)
+    linhas = db.execute(stmt.order_by(Auditoria.id.desc()).limit(limite)).all()
+    return [
+        {**linha._asdict(), "alteracoes": orjson.loads(linha.alteracoes)} for linha in linhas
+    ]
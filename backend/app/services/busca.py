@@ -0,0 +1,206 @@
+"""Busca textual em licitações (objeto, órgão) e contratos (objeto, fornecedor).
+
+SQLite: tabelas FTS5 de conteúdo externo, sem acentos (remove_diacritics) e com
+busca por prefixo do radical no lugar de stemming. Postgres: coluna tsvector
+gerada (configuração portuguesa + unaccent) com índice GIN. Nos dois casos o
+índice é mantido pelo próprio banco (triggers no SQLite, coluna gerada no
+Postgres), então inserções em lote e upserts também ficam sincronizados.
+"""
+import re
+import unicodedata
+from typing import List, Optional
+
+from sqlalchemy import Integer, column, func, literal, literal_column, select, table, text, union_all
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.contrato import Contrato
+from app.models.licitacao import Licitacao
+
+# Configuração de texto do Postgres: stemming português sem acentos
+CONFIG_PG = "pt_unaccent"
+
+
+def _vetor_pg(tabela: str, colunas: List[str]) -> List[str]:
+    # Coluna gerada: ts_rank lê o vetor pronto em vez de recalcular por linha
+    texto = " || ' ' || ".join(f"coalesce({c}, '')" for c in colunas)
+    return [
+        f"ALTER TABLE {tabela} ADD COLUMN IF NOT EXISTS busca_vetor tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{CONFIG_PG}'::regconfig, {texto})) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{tabela}_busca ON {tabela} USING gin (busca_vetor)",
+    ]
+
+
+DDL_POSTGRES = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    f"""DO $$ BEGIN
+        CREATE TEXT SEARCH CONFIGURATION {CONFIG_PG} (COPY = portuguese);
+        ALTER TEXT SEARCH CONFIGURATION {CONFIG_PG}
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+    EXCEPTION WHEN unique_violation THEN NULL;
+    END $$""",
+    *_vetor_pg("licitacoes", ["objeto", "orgao_responsavel"]),
+    *_vetor_pg("contratos", ["objeto", "fornecedor"]),
+]
+
+
+def _ddl_sqlite(tabela: str, chave: str, colunas: List[str]) -> List[str]:
+    fts = f"{tabela}_fts"
+    lista = ", ".join(colunas)
+    novos = ", ".join(f"new.{c}" for c in colunas)
+    antigos = ", ".join(f"old.{c}" for c in colunas)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({lista}, content='{tabela}', "
+        f"content_rowid='{chave}', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tabela} BEGIN "
+        f"INSERT INTO {fts}(rowid, {lista}) VALUES (new.{chave}, {novos}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tabela} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {lista}) VALUES ('delete', old.{chave}, {antigos}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {lista} ON {tabela} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {lista}) VALUES ('delete', old.{chave}, {antigos}); "
+        f"INSERT INTO {fts}(rowid, {lista}) VALUES (new.{chave}, {novos}); END",
+    ]
+
+
+INDICES_SQLITE = {
+    "licitacoes_fts": _ddl_sqlite("licitacoes", "id_licitacao", ["objeto", "orgao_responsavel"]),
+    "contratos_fts": _ddl_sqlite("contratos", "id", ["objeto", "fornecedor"]),
+}
+
+
+def garantir_indice_busca(conn: Connection):
+    """Cria os índices de busca se faltarem; no SQLite indexa as linhas já existentes"""
+    dialeto = conn.dialect.name
+    if dialeto == "postgresql":
+        for comando in DDL_POSTGRES:
+            conn.execute(text(comando))
+    elif dialeto == "sqlite":
+        for fts, comandos in INDICES_SQLITE.items():
+            existia = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :nome"), {"nome": fts}
+            ).first()
+            for comando in comandos:
+                conn.execute(text(comando))
+            if not existia:
+                conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+# Palavras ignoradas na busca do SQLite (o Postgres já descarta pela configuração)
+STOPWORDS = {
+    "a", "as", "o", "os", "de", "da", "das", "do", "dos", "e", "em", "na", "nas",
+    "no", "nos", "para", "por", "com", "um", "uma", "ao", "aos", "à", "às",
+}
+
+
+# Sufixos de plural e de "-ção" removidos antes da busca por prefixo, para que
+# "computadores" encontre "computador" e "aquisição" encontre "aquisições"
+SUFIXOS = ("oes", "aes", "aos", "ao", "es", "is", "s")
+
+
+def _radical(palavra: str) -> str:
+    palavra = unicodedata.normalize("NFKD", palavra).encode("ascii", "ignore").decode()
+    for sufixo in SUFIXOS:
+        if palavra.endswith(sufixo) and len(palavra) - len(sufixo) >= 4:
+            if sufixo == "es" and not palavra.endswith(("res", "zes", "ses")):
+                continue
+            return palavra[: -len(sufixo)]
+    return palavra
+
+
+def consulta_fts5(termos: str) -> Optional[str]:
+    """Converte o texto digitado em uma consulta FTS5: todos os termos, por prefixo do radical"""
+    palavras = [p for p in re.findall(r"\w+", termos.lower()) if p not in STOPWORDS]
+    if not palavras:
+        return None
+    return " ".join(f'"{_radical(p)}"*' for p in palavras)
+
+
+def _colunas(rotulo: str, id_, numero, objeto, orgao, fornecedor, data_ref, status):
+    return (
+        literal(rotulo).label("tipo"),
+        id_.label("id"),
+        numero.label("numero"),
+        objeto.label("objeto"),
+        orgao.label("orgao_responsavel"),
+        fornecedor.label("fornecedor"),
+        data_ref.label("data"),
+        status.label("status"),
+    )
+
+
+# tipo -> (tabela, chave, colunas do resultado)
+FONTES = {
+    "licitacoes": ("licitacoes", Licitacao.id_licitacao, _colunas(
+        "licitacao", Licitacao.id_licitacao, Licitacao.numero_processo, Licitacao.objeto,
+        Licitacao.orgao_responsavel, literal(None), Licitacao.data_abertura, Licitacao.status,
+    )),
+    "contratos": ("contratos", Contrato.id, _colunas(
+        "contrato", Contrato.id, Contrato.numero_contrato, Contrato.objeto,
+        literal(None), Contrato.fornecedor, Contrato.data_assinatura, Contrato.status,
+    )),
+}
+
+
+def _fonte(db: Session, tabela: str, chave, colunas, termos: str, limite: int):
+    """SELECT ranqueado de uma tabela, limitado aos candidatos mais recentes"""
+    if db.get_bind().dialect.name == "postgresql":
+        vetor = literal_column(f"{tabela}.busca_vetor")
+        consulta = func.websearch_to_tsquery(literal_column(f"'{CONFIG_PG}'"), termos)
+        casa = vetor.op("@@")(consulta)
+        relevancia = func.ts_rank_cd(vetor, consulta)
+        stmt = select(*colunas, relevancia.label("relevancia"))
+        id_candidato = chave
+    else:
+        fts = table(f"{tabela}_fts", column("rowid", Integer))
+        casa = literal_column(fts.name).op("MATCH")(termos)
+        # bm25 é menor quanto mais relevante; invertido para ordenar como no Postgres
+        relevancia = -func.bm25(literal_column(fts.name))
+        stmt = select(*colunas, relevancia.label("relevancia")).select_from(fts).join(
+            chave.class_, chave == fts.c.rowid
+        )
+        id_candidato = fts.c.rowid
+
+    # Termos muito comuns casam com milhões de linhas: o ranking fica restrito
+    # às BUSCA_MAX_CANDIDATOS mais recentes, e a rota limita offset + limit a
+    # esse número. O limiar não calcula relevância: no SQLite percorre só os
+    # rowids do índice FTS5; no Postgres o GIN devolve as linhas que casam
+    # (bitmap) e o id de cada uma ainda é lido da tabela para a ordenação
+    limiar = db.scalar(
+        select(id_candidato).where(casa).order_by(id_candidato.desc())
+        .offset(settings.BUSCA_MAX_CANDIDATOS - 1).limit(1)
+    )
+    stmt = stmt.where(casa)
+    if limiar is not None:
+        stmt = stmt.where(id_candidato >= limiar)
+    # Empates de relevância em ordem fixa: sem ela o offset das páginas
+    # seguintes poderia repetir ou pular linhas
+    return stmt.order_by(literal_column("relevancia").desc(), chave.desc()).limit(limite)
+
+
+def buscar(db: Session, termos: str, tipo: str = "ambos", offset: int = 0, limit: int = 20) -> List[dict]:
+    """Resultados ordenados por relevância; devolve até limit + 1 para indicar se há mais.
+
+    Só as posições abaixo de BUSCA_MAX_CANDIDATOS são confiáveis: além delas as
+    fontes já não têm candidatos.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        termos = consulta_fts5(termos)
+        if termos is None:
+            return []
+    # Cada fonte traz só as offset + limit + 1 melhores antes de intercalar
+    limite = offset + limit + 1
+    fontes = [
+        _fonte(db, *FONTES[t], termos, limite)
+        for t in ("licitacoes", "contratos")
+        if tipo in (t, "ambos")
+    ]
+
+    if len(fontes) == 1:
+        stmt = fontes[0].offset(offset)
+    else:
+        uniao = union_all(*(f.subquery().select() for f in fontes)).subquery()
+        stmt = select(uniao).order_by(
+            uniao.c.relevancia.desc(), uniao.c.tipo, uniao.c.id.desc()
+        ).limit(limit + 1).offset(offset)
+    return [dict(linha) for linha in db.execute(stmt).mappings()]
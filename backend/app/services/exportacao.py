@@ -0,0 +1,168 @@
+"""Exportação analítica de licitações e contratos em Parquet ou Arrow IPC.
+
+A tabela é lida em ordem de id com cursor do servidor (yield_per) e cada
+grupo de linhas vira um row group (Parquet) ou record batch (Arrow) já
+enviado adiante, sem montar o arquivo na memória. Contratos saem com as colunas da licitação.
+
+A marca d'água é o maior id exportado: a exportação incremental pede só
+id > marca, e o limite superior é fixado antes da leitura, então nenhuma
+linha sai duas vezes. Alterações em linhas já exportadas não são reenviadas.
+
+O id é reservado na inserção, mas a linha só aparece no commit: uma transação
+com id menor ainda aberta quando o max(id) é lido ficaria abaixo da marca para
+sempre. Por isso a marca é o maior id entre as linhas criadas há mais de
+SYNC_MARGEM segundos (a mesma margem do GET /sync); as mais novas ficam para a
+exportação seguinte.
+
+pyarrow é opcional: só é importado quando uma exportação começa.
+"""
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.contrato import Contrato
+from app.models.licitacao import Licitacao
+
+# Linhas por row group: grupos grandes comprimem melhor. As linhas vêm do
+# cursor em lotes menores, convertidos logo para colunas arrow (compactas)
+LINHAS_POR_GRUPO = 50_000
+LINHAS_POR_LOTE = 5_000
+MARCA_DAGUA_HEADER = "X-Export-Watermark"
+
+FORMATOS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", "arrow"),
+}
+
+# tabela -> (coluna do id, coluna de criação, [(nome no arquivo, coluna, tipo arrow)]); os tipos
+# são nomes de fábricas do pyarrow para não importá-lo aqui
+COLUNAS_LICITACAO = [
+    ("id_licitacao", Licitacao.id_licitacao, ("int64",)),
+    ("numero_processo", Licitacao.numero_processo, ("string",)),
+    ("modalidade", Licitacao.modalidade, ("string",)),
+    ("objeto", Licitacao.objeto, ("string",)),
+    ("orgao_responsavel", Licitacao.orgao_responsavel, ("string",)),
+    ("data_abertura", Licitacao.data_abertura, ("date32",)),
+    ("data_encerramento", Licitacao.data_encerramento, ("date32",)),
+    ("status", Licitacao.status, ("string",)),
+    ("criado_em", Licitacao.criado_em, ("timestamp", "us")),
+    ("atualizado_em", Licitacao.atualizado_em, ("timestamp", "us")),
+]
+TABELAS = {
+    "licitacoes": (Licitacao.id_licitacao, Licitacao.criado_em, COLUNAS_LICITACAO),
+    "contratos": (Contrato.id, Contrato.criado_em, [
+        ("id", Contrato.id, ("int64",)),
+        ("numero_contrato", Contrato.numero_contrato, ("string",)),
+        ("fornecedor", Contrato.fornecedor, ("string",)),
+        ("fornecedor_id", Contrato.fornecedor_id, ("int64",)),
+        ("objeto", Contrato.objeto, ("string",)),
+        ("valor_total", Contrato.valor_total, ("decimal128", 15, 2)),
+        ("data_assinatura", Contrato.data_assinatura, ("date32",)),
+        ("data_inicio", Contrato.data_inicio, ("date32",)),
+        ("data_fim", Contrato.data_fim, ("date32",)),
+        ("status", Contrato.status, ("string",)),
+        ("criado_em", Contrato.criado_em, ("timestamp", "us")),
+        ("atualizado_em", Contrato.atualizado_em, ("timestamp", "us")),
+        ("licitacao_id", Contrato.licitacao_id, ("int64",)),
+        *[
+            (f"licitacao_{nome}", coluna, tipo) for nome, coluna, tipo in COLUNAS_LICITACAO
+            if nome not in ("id_licitacao", "criado_em", "atualizado_em")
+        ],
+    ]),
+}
+
+
+def marca_dagua(db: Session, tabela: str) -> int:
+    """Limite superior de uma exportação que começa agora: o maior id entre as
+    linhas criadas há mais de SYNC_MARGEM segundos (sem criado_em = anteriores)"""
+    coluna_id, criado_em, _ = TABELAS[tabela]
+    limite = datetime.utcnow() - timedelta(seconds=settings.SYNC_MARGEM)
+    return db.scalar(
+        select(func.coalesce(func.max(coluna_id), 0))
+        .where(or_(criado_em.is_(None), criado_em <= limite))
+    )
+
+
+def _esquema(pa, tabela: str, desde: int, ate: int):
+    _, _, colunas = TABELAS[tabela]
+    campos = [pa.field(nome, getattr(pa, tipo[0])(*tipo[1:])) for nome, _, tipo in colunas]
+    # A marca vai no próprio arquivo: quem só tem o arquivo sabe de onde continuar
+    return pa.schema(campos, metadata={"tabela": tabela, "desde": str(desde), "watermark": str(ate)})
+
+
+class _Saida:
+    """Arquivo só de escrita para o pyarrow; o que foi escrito é drenado a cada lote"""
+
+    def __init__(self):
+        self.partes = []
+        self.posicao = 0
+        self.closed = False
+
+    def write(self, dados) -> int:
+        self.partes.append(bytes(dados))
+        self.posicao += len(dados)
+        return len(dados)
+
+    def tell(self) -> int:
+        return self.posicao
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drenar(self) -> bytes:
+        dados = b"".join(self.partes)
+        self.partes = []
+        return dados
+
+
+def exportar(
+    db: Session,
+    tabela: str,
+    formato: str,
+    desde: int = 0,
+    ate: Optional[int] = None,
+    linhas_por_grupo: int = LINHAS_POR_GRUPO,
+) -> Iterator[bytes]:
+    """Bytes do arquivo com as linhas de id em (desde, ate], em ordem de id, um lote por vez"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if ate is None:
+        ate = marca_dagua(db, tabela)
+    coluna_id, _, colunas = TABELAS[tabela]
+    esquema = _esquema(pa, tabela, desde, ate)
+    stmt = select(*(coluna for _, coluna, _ in colunas)).where(coluna_id > desde, coluna_id <= ate)
+    if tabela == "contratos":
+        stmt = stmt.join(Licitacao, Contrato.licitacao_id == Licitacao.id_licitacao)
+    stmt = stmt.order_by(coluna_id)
+
+    saida = _Saida()
+    if formato == "parquet":
+        escritor = pq.ParquetWriter(saida, esquema, compression="zstd")
+    else:
+        escritor = pa.ipc.new_file(saida, esquema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+    lotes, pendentes = [], 0
+    try:
+        linhas_por_lote = min(LINHAS_POR_LOTE, linhas_por_grupo)
+        for linhas in db.execute(stmt.execution_options(yield_per=linhas_por_lote)).partitions():
+            lotes.append(pa.RecordBatch.from_arrays(
+                [pa.array(valores, type=campo.type) for valores, campo in zip(zip(*linhas), esquema)],
+                schema=esquema,
+            ))
+            pendentes += len(linhas)
+            if pendentes >= linhas_por_grupo:
+                escritor.write_table(pa.Table.from_batches(lotes).combine_chunks())
+                lotes, pendentes = [], 0
+                yield saida.drenar()
+        if lotes:
+            escritor.write_table(pa.Table.from_batches(lotes).combine_chunks())
+    finally:
+        # Fecha também quando o cliente desiste no meio: o rodapé só sai aqui
+        escritor.close()
+    yield saida.drenar()
@@ -0,0 +1,218 @@
+"""Fornecedores normalizados e totais por fornecedor mantidos incrementalmente.
+
+Contrato.fornecedor continua gravado como veio; fornecedor_id aponta para um
+Fornecedor achado pelo CNPJ (quando informado) ou pelo nome normalizado (sem
+acentos, pontuação e caixa). Um fornecedor conhecido só pelo nome recebe o
+CNPJ na primeira vez que ele aparece junto desse nome.
+
+resumo_fornecedores guarda quantidade, valor e contratos ativos por
+(fornecedor, ano de assinatura), com ano = 0 para o total geral, ajustados na
+mesma transação de cada escrita, como resumo_dashboard. Contratos anteriores
+à tabela são ligados em segundo plano, em lotes (preencher_contratos).
+"""
+import asyncio
+import logging
+import re
+import unicodedata
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core import cache_http
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.upsert import insert_com_conflito
+from app.models.contrato import Contrato
+from app.models.fornecedor import Fornecedor, ResumoFornecedor
+
+logger = logging.getLogger(__name__)
+
+TODOS_OS_ANOS = 0
+
+Chave = Tuple[str, Optional[str]]  # (nome como veio, CNPJ só com dígitos)
+
+
+def normalizar_nome(nome: str) -> str:
+    """'Comércio S/A.' e 'COMERCIO SA' viram 'comercio sa'"""
+    texto = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode().lower()
+    palavras, sigla = [], False
+    for palavra in re.findall(r"[a-z0-9]+", texto):
+        # Letras soltas seguidas (S/A, S.A., M.E.) formam uma sigla só
+        if sigla and len(palavra) == 1 and palavra.isalpha():
+            palavras[-1] += palavra
+        else:
+            palavras.append(palavra)
+            sigla = len(palavra) == 1 and palavra.isalpha()
+    return " ".join(palavras)[:200]
+
+
+def _por_cnpj(db: Session, cnpjs: set) -> Dict[str, int]:
+    if not cnpjs:
+        return {}
+    return dict(db.execute(select(Fornecedor.cnpj, Fornecedor.id).where(Fornecedor.cnpj.in_(cnpjs))).all())
+
+
+def _por_nome(db: Session, nomes: set) -> Dict[str, Tuple[int, bool]]:
+    """nome normalizado -> (id, tem CNPJ); prefere o registro sem CNPJ, depois o mais antigo"""
+    encontrados = {}
+    if nomes:
+        for nome, fornecedor_id, cnpj in db.execute(
+            select(Fornecedor.nome_normalizado, Fornecedor.id, Fornecedor.cnpj)
+            .where(Fornecedor.nome_normalizado.in_(nomes))
+            .order_by(Fornecedor.cnpj.is_not(None), Fornecedor.id)
+        ):
+            encontrados.setdefault(nome, (fornecedor_id, cnpj is not None))
+    return encontrados
+
+
+def resolver_lote(db: Session, chaves: Iterable[Chave]) -> Dict[Chave, int]:
+    """Id do fornecedor de cada (nome, cnpj), criando os que faltam.
+
+    Sem CNPJ, o nome leva ao fornecedor com esse nome (de preferência o que
+    também não tem CNPJ). A criação usa ON CONFLICT DO NOTHING e relê os ids,
+    então dois workers criando o mesmo fornecedor chegam ao mesmo registro.
+    """
+    chaves = set(chaves)
+    normalizados = {nome: normalizar_nome(nome) for nome, _ in chaves}
+    por_cnpj = _por_cnpj(db, {cnpj for _, cnpj in chaves if cnpj})
+    por_nome = _por_nome(db, set(normalizados.values()))
+
+    # CNPJ novo cujo nome existe sem CNPJ: o fornecedor recebe o CNPJ.
+    # O WHERE cnpj IS NULL deixa só o primeiro CNPJ ficar com o registro.
+    for nome, cnpj in sorted(c for c in chaves if c[1] and c[1] not in por_cnpj):
+        fornecedor_id, tem_cnpj = por_nome.get(normalizados[nome], (None, True))
+        if not tem_cnpj and db.execute(
+            update(Fornecedor).where(Fornecedor.id == fornecedor_id, Fornecedor.cnpj.is_(None)).values(cnpj=cnpj)
+        ).rowcount:
+            por_cnpj[cnpj] = fornecedor_id
+            por_nome[normalizados[nome]] = (fornecedor_id, True)
+
+    novos = {}
+    for nome, cnpj in chaves:
+        if cnpj and cnpj not in por_cnpj:
+            novos[cnpj] = {"cnpj": cnpj, "nome": nome.strip()[:200], "nome_normalizado": normalizados[nome]}
+        elif not cnpj and normalizados[nome] not in por_nome:
+            novos[normalizados[nome]] = {"cnpj": None, "nome": nome.strip()[:200], "nome_normalizado": normalizados[nome]}
+    if novos:
+        db.execute(insert_com_conflito(db, Fornecedor).on_conflict_do_nothing(), list(novos.values()))
+        por_cnpj.update(_por_cnpj(db, {linha["cnpj"] for linha in novos.values() if linha["cnpj"]}))
+        por_nome.update(_por_nome(db, {linha["nome_normalizado"] for linha in novos.values() if not linha["cnpj"]}))
+
+    return {
+        (nome, cnpj): por_cnpj[cnpj] if cnpj else por_nome[normalizados[nome]][0]
+        for nome, cnpj in chaves
+    }
+
+
+def resolver(db: Session, nome: str, cnpj: Optional[str] = None) -> int:
+    return resolver_lote(db, [(nome, cnpj)])[(nome, cnpj)]
+
+
+class DeltasFornecedores:
+    """Acumula os ajustes de uma escrita (ou de um lote) e grava um upsert por (fornecedor, ano)"""
+
+    def __init__(self):
+        self.deltas = defaultdict(lambda: [0, Decimal(0), 0])
+
+    def somar(self, fornecedor_id: Optional[int], data_assinatura: date, valor, status: str, sinal: int):
+        # Contrato ainda não ligado a um fornecedor: entra nos totais no preenchimento
+        if fornecedor_id is None:
+            return
+        ativo = sinal if status in settings.ALERTA_STATUS_CONTRATO else 0
+        for ano in (data_assinatura.year, TODOS_OS_ANOS):
+            delta = self.deltas[(fornecedor_id, ano)]
+            delta[0] += sinal
+            delta[1] += Decimal(valor) * sinal
+            delta[2] += ativo
+
+    def aplicar(self, db: Session):
+        linhas = [
+            {"fornecedor_id": fornecedor_id, "ano": ano, "quantidade": quantidade, "valor_total": valor, "ativos": ativos}
+            for (fornecedor_id, ano), (quantidade, valor, ativos) in self.deltas.items()
+            if quantidade or valor or ativos
+        ]
+        if not linhas:
+            return
+        stmt = insert_com_conflito(db, ResumoFornecedor)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["fornecedor_id", "ano"],
+            set_={
+                "quantidade": ResumoFornecedor.quantidade + stmt.excluded.quantidade,
+                "valor_total": ResumoFornecedor.valor_total + stmt.excluded.valor_total,
+                "ativos": ResumoFornecedor.ativos + stmt.excluded.ativos,
+            },
+        ), linhas)
+
+
+def ajustar_contrato(db: Session, contrato: Contrato, sinal: int):
+    """Soma (ou subtrai) o contrato nos totais do fornecedor, na mesma transação da escrita"""
+    deltas = DeltasFornecedores()
+    deltas.somar(contrato.fornecedor_id, contrato.data_assinatura, contrato.valor_total, contrato.status, sinal)
+    deltas.aplicar(db)
+
+
+def preencher_contratos(db: Session, lote: int) -> int:
+    """Liga um lote de contratos sem fornecedor_id e soma-os nos totais; devolve quantos leu.
+
+    O UPDATE só pega linhas ainda nulas e devolve os valores gravados
+    (RETURNING), então uma escrita concorrente no mesmo contrato não é contada
+    duas vezes e vários workers podem preencher ao mesmo tempo.
+    """
+    linhas = db.execute(
+        select(Contrato.id, Contrato.fornecedor)
+        .where(Contrato.fornecedor_id.is_(None))
+        .order_by(Contrato.id)
+        .limit(lote)
+    ).all()
+    if not linhas:
+        return 0
+    ids = resolver_lote(db, [(nome, None) for _, nome in linhas])
+    contratos_por_fornecedor = defaultdict(list)
+    for contrato_id, nome in linhas:
+        contratos_por_fornecedor[ids[(nome, None)]].append(contrato_id)
+
+    deltas = DeltasFornecedores()
+    for fornecedor_id, contratos in contratos_por_fornecedor.items():
+        for data_assinatura, valor, status in db.execute(
+            update(Contrato)
+            .where(Contrato.id.in_(contratos), Contrato.fornecedor_id.is_(None))
+            # Nova versão: um PUT que leu o contrato antes daqui recebe 412
+            .values(fornecedor_id=fornecedor_id, versao=Contrato.versao + 1)
+            .returning(Contrato.data_assinatura, Contrato.valor_total, Contrato.status)
+            .execution_options(synchronize_session=False)
+        ):
+            deltas.somar(fornecedor_id, data_assinatura, valor, status, 1)
+    deltas.aplicar(db)
+    db.commit()
+    # Versão, fornecedor_id e totais mudaram: /contratos e /fornecedores em cache ficam velhos
+    cache_http.invalidar("contratos")
+    return len(linhas)
+
+
+def preencher_todos(lote: int) -> int:
+    total = 0
+    while True:
+        db = SessionLocal()
+        try:
+            lidos = preencher_contratos(db, lote)
+        finally:
+            db.close()
+        if not lidos:
+            return total
+        total += lidos
+        logger.info("Fornecedores: %d contratos ligados até agora", total)
+
+
+async def preencher_em_segundo_plano(lote: int):
+    """Liga os contratos antigos aos fornecedores sem segurar a inicialização"""
+    try:
+        total = await asyncio.to_thread(preencher_todos, lote)
+    except Exception:
+        logger.exception("Falha no preenchimento de fornecedores")
+        return
+    if total:
+        logger.info("Fornecedores: preenchimento concluído (%d contratos)", total)
@@ -0,0 +1,98 @@
+"""Idempotency-Key nos POSTs: repetir a requisição não cria o registro de novo.
+
+A resposta é guardada em chaves_idempotencia na mesma transação da escrita,
+então ou os dois ficam ou nenhum fica. Uma repetição com a mesma chave (retry
+depois de um timeout) recebe a resposta guardada, marcada com
+Idempotent-Replayed. Se duas chegam juntas, a segunda esbarra na chave
+primária (ou na unicidade do próprio registro) ao gravar, volta a transação e
+devolve a resposta da primeira. A mesma chave com outro corpo é erro (422).
+
+As chaves valem por IDEMPOTENCIA_TTL segundos; agendar_limpeza apaga as
+vencidas pelo índice em criado_em.
+"""
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+import orjson
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.idempotencia import ChaveIdempotencia
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCIA_HEADER = "Idempotency-Key"
+REPETIDA_HEADER = "Idempotent-Replayed"
+LIMPEZA_INTERVALO = 3600
+
+
+def impressao(payload: BaseModel) -> str:
+    """Hash do corpo validado: a mesma requisição dá o mesmo hash, qualquer que seja a formatação"""
+    return hashlib.sha256(orjson.dumps(payload.model_dump(mode="json"), option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _vencimento() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=settings.IDEMPOTENCIA_TTL)
+
+
+def buscar(db: Session, escopo: str, chave: str, impressao_atual: str) -> Optional[Response]:
+    """Resposta guardada para a chave, ou None se ela ainda não foi usada (ou venceu)"""
+    guardada = db.execute(
+        select(
+            ChaveIdempotencia.impressao, ChaveIdempotencia.status_code,
+            ChaveIdempotencia.resposta, ChaveIdempotencia.criado_em,
+        ).where(ChaveIdempotencia.escopo == escopo, ChaveIdempotencia.chave == chave)
+    ).first()
+    if guardada is None:
+        return None
+    if guardada.criado_em < _vencimento():
+        # Vencida e ainda não limpa: sai agora para a chave poder ser gravada de novo
+        db.execute(delete(ChaveIdempotencia).where(ChaveIdempotencia.escopo == escopo, ChaveIdempotencia.chave == chave))
+        return None
+    if guardada.impressao != impressao_atual:
+        raise HTTPException(422, f"{IDEMPOTENCIA_HEADER} já usada com outro corpo de requisição")
+    return Response(
+        guardada.resposta, status_code=guardada.status_code, media_type="application/json",
+        headers={REPETIDA_HEADER: "true"},
+    )
+
+
+def guardar(db: Session, escopo: str, chave: str, impressao_atual: str, status_code: int, corpo: BaseModel):
+    """Registra a resposta na transação atual; a chave repetida falha no commit (IntegrityError)"""
+    db.add(ChaveIdempotencia(
+        escopo=escopo, chave=chave, impressao=impressao_atual,
+        status_code=status_code, resposta=corpo.model_dump_json(),
+    ))
+
+
+def limpar_vencidas(db: Session) -> int:
+    apagadas = db.execute(delete(ChaveIdempotencia).where(ChaveIdempotencia.criado_em < _vencimento())).rowcount
+    db.commit()
+    return apagadas
+
+
+def _limpar_com_sessao() -> int:
+    db = SessionLocal()
+    try:
+        return limpar_vencidas(db)
+    finally:
+        db.close()
+
+
+async def agendar_limpeza():
+    """Apaga as chaves vencidas a cada hora, em uma thread"""
+    while True:
+        try:
+            apagadas = await asyncio.to_thread(_limpar_com_sessao)
+            if apagadas:
+                logger.info("Idempotência: %d chaves vencidas removidas", apagadas)
+        except Exception:
+            logger.exception("Falha na limpeza das chaves de idempotência")
+        await asyncio.sleep(LIMPEZA_INTERVALO)
@@ -0,0 +1,264 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from decimal import Decimal
+from typing import BinaryIO, Iterator, List, Tuple
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.upsert import insert_com_conflito
+from app.models.contrato import Contrato
+from app.models.licitacao import Licitacao
+from app.services import auditoria, fornecedores, resumo
+
+class RelatorioImportacao:
+    """Totais e erros por linha de uma importação em lote"""
+
+    def __init__(self):
+        self.inseridas = 0
+        self.atualizadas = 0
+        self.ignoradas = 0
+        self.erros: List[dict] = []
+
+    def erro(self, linha: int, mensagem: str):
+        self.erros.append({"linha": linha, "erro": mensagem})
+
+    def somar(self, outro: "RelatorioImportacao"):
+        self.inseridas += outro.inseridas
+        self.atualizadas += outro.atualizadas
+        self.ignoradas += outro.ignoradas
+        self.erros.extend(outro.erros)
+
+    def como_dict(self) -> dict:
+        return {
+            "inseridas": self.inseridas,
+            "atualizadas": self.atualizadas,
+            "ignoradas": self.ignoradas,
+            "total_erros": len(self.erros),
+            "erros": self.erros,
+        }
+
+
+def ler_registros(arquivo: BinaryIO, formato: str) -> Iterator[Tuple[int, object]]:
+    """Lê o arquivo linha a linha devolvendo (número da linha, dict ou mensagem de erro)"""
+    texto = io.TextIOWrapper(arquivo, encoding="utf-8-sig", newline="")
+    if formato == "csv":
+        leitor = csv.DictReader(texto)
+        for registro in leitor:
+            # Campos vazios no CSV viram None para os opcionais do schema
+            yield leitor.line_num, {k: (v if v != "" else None) for k, v in registro.items()}
+        return
+
+    for numero, linha in enumerate(texto, 1):
+        if not linha.strip():
+            continue
+        try:
+            yield numero, json.loads(linha)
+        except json.JSONDecodeError as exc:
+            yield numero, f"JSON inválido: {exc.msg}"
+
+
+def _validar(registro, schema, numero: int, relatorio: RelatorioImportacao):
+    if isinstance(registro, str):
+        relatorio.erro(numero, registro)
+        return None
+    try:
+        return schema(**registro)
+    except ValidationError as exc:
+        relatorio.erro(numero, "; ".join(
+            f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in exc.errors()
+        ))
+    except TypeError:
+        relatorio.erro(numero, "Registro deve ser um objeto")
+    return None
+
+
+def importar(
+    db: Session,
+    arquivo: BinaryIO,
+    formato: str,
+    schema,
+    processar_lote,
+    tamanho_lote: int,
+    conflito: str,
+) -> dict:
+    """Valida os registros com o schema e grava em lotes, com commit por lote"""
+    relatorio = RelatorioImportacao()
+    lote: List[Tuple[int, BaseModel]] = []
+    for numero, registro in ler_registros(arquivo, formato):
+        item = _validar(registro, schema, numero, relatorio)
+        if item is not None:
+            lote.append((numero, item))
+        if len(lote) >= tamanho_lote:
+            _gravar_lote(db, lote, processar_lote, conflito, relatorio)
+            lote = []
+    if lote:
+        _gravar_lote(db, lote, processar_lote, conflito, relatorio)
+    return relatorio.como_dict()
+
+
+def _gravar_lote(db: Session, lote, processar_lote, conflito: str, relatorio: RelatorioImportacao):
+    """Grava um lote em transação própria; só entra no relatório depois do commit
+
+    Um IntegrityError vem de uma gravação concorrente entre a consulta dos
+    existentes e o INSERT (mesma chave ou licitação excluída). O lote é desfeito
+    e processado de novo uma vez, já vendo o que a outra transação gravou; se
+    falhar outra vez, as linhas do lote vão para o relatório como erro.
+    """
+    for _ in range(2):
+        parcial = RelatorioImportacao()
+        try:
+            processar_lote(db, lote, conflito, parcial)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            continue
+        relatorio.somar(parcial)
+        return
+    for numero, _ in lote:
+        relatorio.erro(numero, "Conflito com gravação concorrente; linha não gravada")
+
+
+def _separar_por_chave(lote, chave: str, existentes: set, conflito: str, relatorio, rotulo: str):
+    """Remove duplicados do próprio lote e aplica a política de conflito aos já existentes"""
+    novos, atualizar, vistos = [], [], set()
+    for numero, item in lote:
+        valor = getattr(item, chave)
+        if valor in vistos:
+            relatorio.erro(numero, f"{rotulo} repetido no arquivo")
+            continue
+        vistos.add(valor)
+        if valor not in existentes:
+            novos.append((numero, item))
+        elif conflito == "atualizar":
+            atualizar.append((numero, item))
+        elif conflito == "ignorar":
+            relatorio.ignoradas += 1
+        else:
+            relatorio.erro(numero, f"{rotulo} já cadastrado")
+    return novos, atualizar
+
+
+def _upsert(db: Session, modelo, chave: str, linhas: List[dict]):
+    # executemany: o SQLAlchemy agrupa em INSERT multi-VALUES respeitando o limite de parâmetros
+    stmt = insert_com_conflito(db, modelo)
+    colunas = [c for c in linhas[0] if c != chave]
+    # O ON CONFLICT DO UPDATE não aplica o onupdate do modelo nem a versão do ORM
+    set_ = {**{c: stmt.excluded[c] for c in colunas}, "atualizado_em": stmt.excluded.atualizado_em}
+    if "versao" in modelo.__table__.c:
+        set_["versao"] = modelo.__table__.c.versao + 1
+    return db.execute(stmt.on_conflict_do_update(index_elements=[chave], set_=set_), linhas)
+
+
+def processar_lote_licitacoes(db: Session, lote, conflito: str, relatorio: RelatorioImportacao):
+    # Uma consulta por lote para duplicados (e linhas antigas, para os contadores e a auditoria)
+    chaves = [item.numero_processo for _, item in lote]
+    antigos = {
+        linha.numero_processo: linha
+        for linha in db.execute(
+            select(*Licitacao.__table__.columns).where(Licitacao.numero_processo.in_(chaves))
+        )
+    }
+    novos, atualizar = _separar_por_chave(lote, "numero_processo", antigos.keys(), conflito, relatorio, "Número de processo")
+
+    deltas = defaultdict(int)
+    if novos:
+        linhas = [item.model_dump() for _, item in novos]
+        ids = db.scalars(
+            insert(Licitacao).returning(Licitacao.id_licitacao, sort_by_parameter_order=True), linhas
+        ).all()
+        relatorio.inseridas += len(linhas)
+        for id_licitacao, linha in zip(ids, linhas):
+            deltas[(linha["data_abertura"].year, linha["data_abertura"].month, linha["status"])] += 1
+            auditoria.registrar(db, "licitacoes", id_licitacao, auditoria.INCLUSAO, auditoria.valores(linha))
+    if atualizar:
+        linhas = [item.model_dump() for _, item in atualizar]
+        _upsert(db, Licitacao, "numero_processo", linhas)
+        relatorio.atualizadas += len(linhas)
+        for linha in linhas:
+            antigo = antigos[linha["numero_processo"]]
+            deltas[(antigo.data_abertura.year, antigo.data_abertura.month, antigo.status)] -= 1
+            deltas[(linha["data_abertura"].year, linha["data_abertura"].month, linha["status"])] += 1
+            auditoria.registrar(
+                db, "licitacoes", antigo.id_licitacao, auditoria.ALTERACAO, auditoria.diferencas(antigo._asdict(), linha)
+            )
+
+    for (ano, mes, status), quantidade in deltas.items():
+        if quantidade:
+            resumo.ajustar(db, resumo.LICITACOES, quantidade, ano=ano, mes=mes, status=status)
+
+
+def processar_lote_contratos(db: Session, lote, conflito: str, relatorio: RelatorioImportacao):
+    # Licitações referenciadas que não existem invalidam a linha
+    ids_licitacao = {item.licitacao_id for _, item in lote}
+    licitacoes_existentes = set(db.scalars(
+        select(Licitacao.id_licitacao).where(Licitacao.id_licitacao.in_(ids_licitacao))
+    ))
+    validos = []
+    for numero, item in lote:
+        if item.licitacao_id in licitacoes_existentes:
+            validos.append((numero, item))
+        else:
+            relatorio.erro(numero, "Licitação não encontrada")
+
+    chaves = [item.numero_contrato for _, item in validos]
+    antigos = {
+        linha.numero_contrato: linha
+        for linha in db.execute(
+            select(*Contrato.__table__.columns).where(Contrato.numero_contrato.in_(chaves))
+        )
+    }
+    novos, atualizar = _separar_por_chave(validos, "numero_contrato", antigos.keys(), conflito, relatorio, "Número de contrato")
+
+    deltas = defaultdict(lambda: [0, Decimal(0)])
+    def somar(data_ref, status, sinal, valor):
+        delta = deltas[(data_ref.year, data_ref.month, status)]
+        delta[0] += sinal
+        delta[1] += Decimal(valor) * sinal
+
+    # Fornecedores do lote resolvidos de uma vez
+    ids_fornecedor = fornecedores.resolver_lote(
+        db, [(item.fornecedor, item.fornecedor_cnpj) for _, item in novos + atualizar]
+    )
+    deltas_fornecedores = fornecedores.DeltasFornecedores()
+
+    def linhas_de(itens):
+        return [
+            {**item.model_dump(exclude={"fornecedor_cnpj"}),
+             "fornecedor_id": ids_fornecedor[(item.fornecedor, item.fornecedor_cnpj)]}
+            for _, item in itens
+        ]
+
+    if novos:
+        linhas = linhas_de(novos)
+        ids = db.scalars(insert(Contrato).returning(Contrato.id, sort_by_parameter_order=True), linhas).all()
+        relatorio.inseridas += len(linhas)
+        for id_contrato, linha in zip(ids, linhas):
+            somar(linha["data_assinatura"], linha["status"], 1, linha["valor_total"])
+            deltas_fornecedores.somar(linha["fornecedor_id"], linha["data_assinatura"], linha["valor_total"], linha["status"], 1)
+            auditoria.registrar(db, "contratos", id_contrato, auditoria.INCLUSAO, auditoria.valores(linha))
+    if atualizar:
+        linhas = linhas_de(atualizar)
+        _upsert(db, Contrato, "numero_contrato", linhas)
+        relatorio.atualizadas += len(linhas)
+        for linha in linhas:
+            antigo = antigos[linha["numero_contrato"]]
+            somar(antigo.data_assinatura, antigo.status, -1, antigo.valor_total)
+            somar(linha["data_assinatura"], linha["status"], 1, linha["valor_total"])
+            deltas_fornecedores.somar(
+                antigo.fornecedor_id, antigo.data_assinatura, antigo.valor_total, antigo.status, -1
+            )
+            deltas_fornecedores.somar(linha["fornecedor_id"], linha["data_assinatura"], linha["valor_total"], linha["status"], 1)
+            auditoria.registrar(
+                db, "contratos", antigo.id, auditoria.ALTERACAO, auditoria.diferencas(antigo._asdict(), linha)
+            )
+    deltas_fornecedores.aplicar(db)
+
+    for (ano, mes, status), (quantidade, valor) in deltas.items():
+        if quantidade or valor:
+            resumo.ajustar(db, resumo.CONTRATOS, quantidade, ano=ano, mes=mes, status=status, valor=valor)
+
@@ -0,0 +1,193 @@
+"""Estado de leitura por usuário das notificações globais.
+
+Cada usuário tem uma marca (lida_ate_id): toda global com id menor ou igual a
+ela está lida. Leituras avulsas acima da marca viram linhas em
+notificacoes_leituras. "Marcar todas" só avança a marca e apaga as
+confirmações que ficaram abaixo dela; a data de leitura dessas globais passa a
+ser a da marca.
+
+O id é reservado na inserção, mas a global só aparece no commit: uma com id
+menor ainda aberta quando a marca avança ficaria lida sem o usuário tê-la
+visto. Por isso a marca só passa das globais criadas há mais de SYNC_MARGEM
+segundos; as mais novas visíveis ganham confirmações avulsas.
+
+Esse estado não toca a coluna compartilhada `lida` das globais, nem o contador
+resumo.NOTIFICACOES_NAO_LIDAS, que conta só essa coluna.
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Select, and_, case, delete, exists, func, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.respostas import linhas_como_dicts
+from app.db.upsert import insert_com_conflito
+from app.models.notificacao import Notificacao, NotificacaoLeitura, NotificacaoMarcaLeitura
+
+
+def marca_de_leitura(usuario_id: int):
+    """Subconsulta escalar com a marca do usuário (0 quando ele nunca marcou todas)"""
+    return func.coalesce(
+        select(NotificacaoMarcaLeitura.lida_ate_id)
+        .where(NotificacaoMarcaLeitura.usuario_id == usuario_id)
+        .scalar_subquery(),
+        0,
+    )
+
+
+def momento_da_marca(usuario_id: int):
+    """Subconsulta escalar com quando a marca do usuário foi avançada pela última vez"""
+    return (
+        select(NotificacaoMarcaLeitura.atualizado_em)
+        .where(NotificacaoMarcaLeitura.usuario_id == usuario_id)
+        .scalar_subquery()
+    )
+
+
+# Colunas de NotificacaoOut que vêm direto da tabela; lida e data_leitura
+# dependem do usuário e são calculadas na consulta
+COLUNAS_NOTIFICACAO = (
+    Notificacao.id,
+    Notificacao.titulo,
+    Notificacao.mensagem,
+    Notificacao.tipo,
+    Notificacao.usuario_id,
+    Notificacao.data_criacao,
+)
+
+
+def consulta_notificacoes(usuario_id: Optional[int] = None, apenas_nao_lidas: bool = False) -> Select:
+    """SELECT das colunas de NotificacaoOut com o estado de leitura visto pelo usuário"""
+    if not usuario_id:
+        stmt = select(*COLUNAS_NOTIFICACAO, Notificacao.lida, Notificacao.data_leitura)
+        if apenas_nao_lidas:
+            stmt = stmt.where(Notificacao.lida == False)
+        return stmt.order_by(Notificacao.data_criacao.desc())
+
+    marca = marca_de_leitura(usuario_id)
+    global_lida = or_(Notificacao.id <= marca, NotificacaoLeitura.notificacao_id.is_not(None))
+    lida = case((Notificacao.usuario_id.is_(None), global_lida), else_=Notificacao.lida)
+    # Confirmações abaixo da marca foram apagadas: vale o momento da marca
+    data_leitura = case(
+        (Notificacao.usuario_id.is_(None), func.coalesce(
+            NotificacaoLeitura.data_leitura,
+            case((Notificacao.id <= marca, momento_da_marca(usuario_id))),
+        )),
+        else_=Notificacao.data_leitura,
+    )
+
+    # Notificações específicas do usuário + notificações globais
+    stmt = (
+        select(*COLUNAS_NOTIFICACAO, lida.label("lida"), data_leitura.label("data_leitura"))
+        .outerjoin(
+            NotificacaoLeitura,
+            and_(
+                NotificacaoLeitura.notificacao_id == Notificacao.id,
+                NotificacaoLeitura.usuario_id == usuario_id,
+            ),
+        )
+        .where(or_(Notificacao.usuario_id == usuario_id, Notificacao.usuario_id.is_(None)))
+    )
+    if apenas_nao_lidas:
+        stmt = stmt.where(or_(
+            and_(Notificacao.usuario_id == usuario_id, Notificacao.lida == False),
+            and_(
+                Notificacao.usuario_id.is_(None),
+                Notificacao.id > marca,
+                NotificacaoLeitura.notificacao_id.is_(None),
+            ),
+        ))
+    return stmt.order_by(Notificacao.data_criacao.desc())
+
+
+def montar_notificacoes(linhas: Iterable) -> List[dict]:
+    """Converte as linhas de consulta_notificacoes no formato de NotificacaoOut"""
+    notificacoes = linhas_como_dicts(linhas)
+    for notificacao in notificacoes:
+        # No SQLite o CASE volta 0/1
+        notificacao["lida"] = bool(notificacao["lida"])
+    return notificacoes
+
+
+def _contar_proprias_nao_lidas(db: Session, usuario_id: int) -> int:
+    return db.scalar(
+        select(func.count())
+        .select_from(Notificacao)
+        .where(Notificacao.usuario_id == usuario_id, Notificacao.lida == False)
+    )
+
+
+def _contar_globais_nao_lidas(db: Session, usuario_id: int) -> int:
+    # Só percorre as globais acima da marca, pelo índice (usuario_id, id)
+    return db.scalar(
+        select(func.count())
+        .select_from(Notificacao)
+        .where(
+            Notificacao.usuario_id.is_(None),
+            Notificacao.id > marca_de_leitura(usuario_id),
+            ~exists().where(
+                NotificacaoLeitura.usuario_id == usuario_id,
+                NotificacaoLeitura.notificacao_id == Notificacao.id,
+            ),
+        )
+    )
+
+
+def contar_nao_lidas(db: Session, usuario_id: int) -> int:
+    """Próprias não lidas + globais acima da marca sem confirmação de leitura"""
+    return _contar_proprias_nao_lidas(db, usuario_id) + _contar_globais_nao_lidas(db, usuario_id)
+
+
+def confirmar_leitura_globais(db: Session, usuario_id: int, filtro_ids) -> int:
+    """Registra a leitura das globais selecionadas por `filtro_ids` (append, sem UPDATE)"""
+    agora = datetime.utcnow()
+    origem = select(
+        literal(usuario_id), Notificacao.id, literal(agora)
+    ).where(
+        Notificacao.usuario_id.is_(None),
+        Notificacao.id > marca_de_leitura(usuario_id),
+        filtro_ids,
+    )
+    stmt = insert_com_conflito(db, NotificacaoLeitura).from_select(
+        ["usuario_id", "notificacao_id", "data_leitura"], origem
+    ).on_conflict_do_nothing()
+    return db.execute(stmt).rowcount
+
+
+def marcar_proprias(db: Session, usuario_id: int, filtro_ids=None) -> int:
+    """UPDATE das notificações do próprio usuário ainda não lidas"""
+    stmt = update(Notificacao).where(Notificacao.usuario_id == usuario_id, Notificacao.lida == False)
+    if filtro_ids is not None:
+        stmt = stmt.where(filtro_ids)
+    return db.execute(stmt.values(lida=True, data_leitura=datetime.utcnow())).rowcount
+
+
+def avancar_marca(db: Session, usuario_id: int) -> int:
+    """Marca todas as globais como lidas para o usuário; devolve quantas estavam não lidas"""
+    nao_lidas = _contar_globais_nao_lidas(db, usuario_id)
+    limite = datetime.utcnow() - timedelta(seconds=settings.SYNC_MARGEM)
+    maior_antiga, marca_atual = db.execute(select(
+        select(func.max(Notificacao.id)).where(
+            Notificacao.usuario_id.is_(None),
+            or_(Notificacao.data_criacao.is_(None), Notificacao.data_criacao <= limite),
+        ).scalar_subquery(),
+        marca_de_leitura(usuario_id),
+    )).one()
+    # A marca nunca recua
+    nova_marca = max(maior_antiga or 0, marca_atual)
+    stmt = insert_com_conflito(db, NotificacaoMarcaLeitura).values(
+        usuario_id=usuario_id, lida_ate_id=nova_marca, atualizado_em=datetime.utcnow()
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["usuario_id"],
+        set_={"lida_ate_id": stmt.excluded.lida_ate_id, "atualizado_em": stmt.excluded.atualizado_em},
+    ))
+    # Confirmações abaixo da marca não são mais necessárias
+    db.execute(delete(NotificacaoLeitura).where(
+        NotificacaoLeitura.usuario_id == usuario_id,
+        NotificacaoLeitura.notificacao_id <= nova_marca,
+    ))
+    # As globais mais novas que a margem que já estão visíveis: leitura avulsa
+    confirmar_leitura_globais(db, usuario_id, Notificacao.id > nova_marca)
+    return nao_lidas
@@ -0,0 +1,233 @@
+import csv
+import heapq
+import io
+import json
+from datetime import date, datetime
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.contrato import Contrato
+from app.models.licitacao import Licitacao
+
+# Quantidade de linhas buscadas por vez no cursor do servidor
+LINHAS_POR_LOTE = 500
+
+COLUNAS = ["tipo", "numero", "descricao", "orgao", "modalidade", "fornecedor", "data", "status", "valor"]
+
+
+def _linhas_licitacoes(db: Session, status, modalidade, orgao, data_inicio, data_fim) -> Iterator[dict]:
+    stmt = select(
+        Licitacao.numero_processo,
+        Licitacao.objeto,
+        Licitacao.orgao_responsavel,
+        Licitacao.modalidade,
+        Licitacao.data_abertura,
+        Licitacao.status,
+    )
+    if status:
+        stmt = stmt.where(Licitacao.status == status)
+    if modalidade:
+        stmt = stmt.where(Licitacao.modalidade == modalidade)
+    if orgao:
+        stmt = stmt.where(Licitacao.orgao_responsavel == orgao)
+    if data_inicio:
+        stmt = stmt.where(Licitacao.data_abertura >= data_inicio)
+    if data_fim:
+        stmt = stmt.where(Licitacao.data_abertura <= data_fim)
+    stmt = stmt.order_by(Licitacao.data_abertura.desc(), Licitacao.id_licitacao.desc())
+
+    for numero, objeto, orgao_resp, mod, data_ref, st in db.execute(
+        stmt.execution_options(yield_per=LINHAS_POR_LOTE)
+    ):
+        yield {
+            "tipo": "Licitação",
+            "numero": numero,
+            "descricao": objeto,
+            "orgao": orgao_resp,
+            "modalidade": mod,
+            "fornecedor": None,
+            "data": data_ref,
+            "status": st,
+            "valor": None,
+        }
+
+
+def _linhas_contratos(db: Session, status, modalidade, orgao, data_inicio, data_fim) -> Iterator[dict]:
+    stmt = select(
+        Contrato.numero_contrato,
+        Contrato.objeto,
+        Licitacao.orgao_responsavel,
+        Licitacao.modalidade,
+        Contrato.fornecedor,
+        Contrato.data_assinatura,
+        Contrato.status,
+        Contrato.valor_total,
+    ).join(Licitacao, Contrato.licitacao_id == Licitacao.id_licitacao)
+    if status:
+        stmt = stmt.where(Contrato.status == status)
+    if modalidade:
+        stmt = stmt.where(Licitacao.modalidade == modalidade)
+    if orgao:
+        stmt = stmt.where(Licitacao.orgao_responsavel == orgao)
+    if data_inicio:
+        stmt = stmt.where(Contrato.data_assinatura >= data_inicio)
+    if data_fim:
+        stmt = stmt.where(Contrato.data_assinatura <= data_fim)
+    stmt = stmt.order_by(Contrato.data_assinatura.desc(), Contrato.id.desc())
+
+    for numero, objeto, orgao_resp, mod, fornecedor, data_ref, st, valor in db.execute(
+        stmt.execution_options(yield_per=LINHAS_POR_LOTE)
+    ):
+        yield {
+            "tipo": "Contrato",
+            "numero": numero,
+            "descricao": objeto,
+            "orgao": orgao_resp,
+            "modalidade": mod,
+            "fornecedor": fornecedor,
+            "data": data_ref,
+            "status": st,
+            "valor": valor,
+        }
+
+
+def linhas_relatorio(
+    db: Session,
+    tipo: str = "ambos",
+    status: Optional[str] = None,
+    modalidade: Optional[str] = None,
+    orgao: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+) -> Iterator[dict]:
+    """Linhas do relatório ordenadas por data (mais recentes primeiro), lidas em lotes"""
+    filtros = (status, modalidade, orgao, data_inicio, data_fim)
+    fontes = []
+    if tipo in ("licitacoes", "ambos"):
+        fontes.append(_linhas_licitacoes(db, *filtros))
+    if tipo in ("contratos", "ambos"):
+        fontes.append(_linhas_contratos(db, *filtros))
+    # Intercala os dois cursores já ordenados sem materializar nenhum deles
+    return heapq.merge(*fontes, key=lambda linha: linha["data"], reverse=True)
+
+
+def _texto(valor) -> str:
+    if valor is None:
+        return ""
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return str(valor)
+
+
+def gerar_csv(linhas: Iterable[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUNAS)
+    for i, linha in enumerate(linhas, 1):
+        writer.writerow([_texto(linha[c]) for c in COLUNAS])
+        if i % LINHAS_POR_LOTE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def gerar_ndjson(linhas: Iterable[dict]) -> Iterator[str]:
+    lote = []
+    for linha in linhas:
+        lote.append(json.dumps({c: _texto(linha[c]) or None for c in COLUNAS}, ensure_ascii=False))
+        if len(lote) == LINHAS_POR_LOTE:
+            yield "\n".join(lote) + "\n"
+            lote = []
+    if lote:
+        yield "\n".join(lote) + "\n"
+
+
+class _EscritorPDF:
+    """Gera um PDF simples (texto em Helvetica, A4 paisagem) página a página.
+
+    Só os offsets dos objetos ficam em memória; o conteúdo de cada página é
+    emitido assim que ela é fechada.
+    """
+
+    LARGURA, ALTURA = 842, 595
+    LINHAS_POR_PAGINA = 45
+    # Objetos fixos: 1 catálogo, 2 árvore de páginas, 3 fonte
+    PRIMEIRO_OBJETO_LIVRE = 4
+
+    def __init__(self, titulo: str):
+        self.titulo = titulo
+        self.offsets = {}
+        self.posicao = 0
+        self.paginas = []
+        self.proximo_objeto = self.PRIMEIRO_OBJETO_LIVRE
+
+    def _emitir(self, dados: bytes) -> bytes:
+        self.posicao += len(dados)
+        return dados
+
+    def _objeto(self, numero: int, corpo: bytes) -> bytes:
+        self.offsets[numero] = self.posicao
+        return self._emitir(b"%d 0 obj\n" % numero + corpo + b"\nendobj\n")
+
+    @staticmethod
+    def _escapar(texto: str) -> bytes:
+        bruto = texto.encode("cp1252", errors="replace")
+        return bruto.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+    def inicio(self) -> bytes:
+        fonte = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+        return self._emitir(b"%PDF-1.4\n") + self._objeto(3, fonte)
+
+    def pagina(self, linhas: list) -> bytes:
+        comandos = [b"BT /F1 9 Tf 30 %d Td 12 TL" % (self.ALTURA - 40)]
+        comandos.append(b"/F1 12 Tf (" + self._escapar(self.titulo) + b") Tj T* T* /F1 8 Tf")
+        for linha in linhas:
+            comandos.append(b"(" + self._escapar(linha) + b") Tj T*")
+        comandos.append(b"ET")
+        conteudo = b"\n".join(comandos)
+
+        num_conteudo, num_pagina = self.proximo_objeto, self.proximo_objeto + 1
+        self.proximo_objeto += 2
+        self.paginas.append(num_pagina)
+        saida = self._objeto(
+            num_conteudo, b"<< /Length %d >>\nstream\n" % len(conteudo) + conteudo + b"\nendstream"
+        )
+        saida += self._objeto(
+            num_pagina,
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (self.LARGURA, self.ALTURA, num_conteudo),
+        )
+        return saida
+
+    def fim(self) -> bytes:
+        kids = b" ".join(b"%d 0 R" % n for n in self.paginas)
+        saida = self._objeto(2, b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(self.paginas))
+        saida += self._objeto(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        inicio_xref = self.posicao
+        total = self.proximo_objeto
+        xref = [b"xref\n0 %d\n0000000000 65535 f \n" % total]
+        xref += [b"%010d 00000 n \n" % self.offsets[n] for n in range(1, total)]
+        xref.append(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (total, inicio_xref))
+        return saida + self._emitir(b"".join(xref))
+
+
+def gerar_pdf(linhas: Iterable[dict], titulo: str = "Relatório de Licitações e Contratos") -> Iterator[bytes]:
+    escritor = _EscritorPDF(titulo)
+    yield escritor.inicio()
+    pagina = []
+    for linha in linhas:
+        valor = f"R$ {linha['valor']}" if linha["valor"] is not None else ""
+        pagina.append(
+            f"{linha['tipo']:<10} {_texto(linha['data']):<11} {linha['numero'][:20]:<20} "
+            f"{linha['status'][:15]:<15} {(linha['orgao'] or '')[:25]:<25} {linha['descricao'][:60]:<60} {valor}"
+        )
+        if len(pagina) == escritor.LINHAS_POR_PAGINA:
+            yield escritor.pagina(pagina)
+            pagina = []
+    if pagina or not escritor.paginas:
+        yield escritor.pagina(pagina)
+    yield escritor.fim()
@@ -0,0 +1,106 @@
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import delete, extract, func, select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import insert_com_conflito
+from app.models.contrato import Contrato
+from app.models.licitacao import Licitacao
+from app.models.notificacao import Notificacao
+from app.models.resumo import ResumoDashboard
+from app.models.user import Usuario
+
+LICITACOES = "licitacoes"
+CONTRATOS = "contratos"
+USUARIOS = "usuarios"
+# Notificações com a coluna compartilhada `lida` falsa. Leituras de globais por
+# usuário (services/leituras.py) não entram: o total de um usuário é
+# /notificacoes/nao-lidas/total
+NOTIFICACOES_NAO_LIDAS = "notificacoes_nao_lidas"
+
+
+def ajustar(
+    db: Session,
+    entidade: str,
+    quantidade: int,
+    ano: int = 0,
+    mes: int = 0,
+    status: Optional[str] = "",
+    valor: Decimal = Decimal(0),
+):
+    """Soma (ou subtrai) um delta no contador agregado, na mesma transação da escrita"""
+    stmt = insert_com_conflito(db, ResumoDashboard).values(
+        entidade=entidade,
+        ano=ano,
+        mes=mes,
+        status=status or "",
+        quantidade=quantidade,
+        valor_total=valor,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["entidade", "ano", "mes", "status"],
+        set_={
+            "quantidade": ResumoDashboard.quantidade + stmt.excluded.quantidade,
+            "valor_total": ResumoDashboard.valor_total + stmt.excluded.valor_total,
+        },
+    )
+    db.execute(stmt)
+
+
+def ajustar_licitacao(db: Session, licitacao: Licitacao, sinal: int):
+    ajustar(
+        db,
+        LICITACOES,
+        sinal,
+        ano=licitacao.data_abertura.year,
+        mes=licitacao.data_abertura.month,
+        status=licitacao.status,
+    )
+
+
+def ajustar_contrato(db: Session, contrato: Contrato, sinal: int):
+    ajustar(
+        db,
+        CONTRATOS,
+        sinal,
+        ano=contrato.data_assinatura.year,
+        mes=contrato.data_assinatura.month,
+        status=contrato.status,
+        valor=Decimal(contrato.valor_total) * sinal,
+    )
+
+
+def recalcular(db: Session):
+    """Reconstrói os contadores a partir das tabelas base com GROUP BY"""
+    db.execute(delete(ResumoDashboard))
+
+    ano_lic = extract("year", Licitacao.data_abertura)
+    mes_lic = extract("month", Licitacao.data_abertura)
+    for ano, mes, status, quantidade in db.execute(
+        select(ano_lic, mes_lic, Licitacao.status, func.count())
+        .group_by(ano_lic, mes_lic, Licitacao.status)
+    ):
+        ajustar(db, LICITACOES, quantidade, ano=int(ano), mes=int(mes), status=status)
+
+    ano_con = extract("year", Contrato.data_assinatura)
+    mes_con = extract("month", Contrato.data_assinatura)
+    for ano, mes, status, quantidade, valor in db.execute(
+        select(ano_con, mes_con, Contrato.status, func.count(), func.sum(Contrato.valor_total))
+        .group_by(ano_con, mes_con, Contrato.status)
+    ):
+        ajustar(db, CONTRATOS, quantidade, ano=int(ano), mes=int(mes), status=status, valor=Decimal(valor or 0))
+
+    ajustar(db, USUARIOS, db.scalar(select(func.count()).select_from(Usuario)))
+    ajustar(
+        db,
+        NOTIFICACOES_NAO_LIDAS,
+        db.scalar(select(func.count()).select_from(Notificacao).where(Notificacao.lida == False)),
+    )
+    db.commit()
+
+
+def garantir_resumo(db: Session):
+    """Popula os contadores na primeira inicialização após a criação da tabela"""
+    if db.scalar(select(ResumoDashboard.entidade).limit(1)) is None:
+        recalcular(db)
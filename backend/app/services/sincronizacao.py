@@ -0,0 +1,179 @@
+"""Sincronização incremental (GET /sync): o que mudou desde um token.
+
+Licitações, contratos e usuários têm criado_em/atualizado_em, preenchidos na
+gravação (default/onupdate dos modelos), e um índice (atualizado_em, id).
+Exclusões deixam uma lápide em `exclusoes`, gravada pelo after_delete do
+mapper na mesma transação; o registro em si continua sendo apagado. DELETEs do
+Core (sem o mapper) chamam registrar_exclusao.
+
+O token guarda, por fonte, a posição (atualizado_em, id) da última linha
+entregue, e a chamada seguinte continua dali pelo índice: o custo é o número
+de alterações, não o tamanho da tabela. Sem token é a sincronização completa:
+primeiro as linhas anteriores ao controle de alterações (atualizado_em nulo),
+em ordem de id, depois as demais por horário.
+
+Os horários vêm do relógio do app e a linha só aparece no commit: uma
+transação que grava às 10:00:00 e confirma às 10:00:02 ficaria para trás de
+um token já em 10:00:01. Por isso cada resposta vai só até agora menos
+SYNC_MARGEM segundos; o que for mais novo sai na chamada seguinte.
+"""
+import asyncio
+import base64
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, event, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.respostas import colunas_de
+from app.db.session import SessionLocal
+from app.models.contrato import Contrato
+from app.models.exclusao import Exclusao
+from app.models.licitacao import Licitacao
+from app.models.user import Usuario
+from app.schemas.contrato import ContratoOut
+from app.schemas.licitacao import LicitacaoOut
+from app.schemas.sincronizacao import UsuarioSync
+
+logger = logging.getLogger(__name__)
+
+EXCLUIDOS = "excluidos"
+LIMPEZA_INTERVALO = 24 * 3600
+
+# fonte -> (modelo, coluna de horário, coluna de id, colunas da saída)
+FONTES = {
+    "licitacoes": (Licitacao, Licitacao.atualizado_em, Licitacao.id_licitacao, colunas_de(Licitacao, LicitacaoOut)),
+    "contratos": (Contrato, Contrato.atualizado_em, Contrato.id, colunas_de(Contrato, ContratoOut)),
+    "usuarios": (Usuario, Usuario.atualizado_em, Usuario.id, colunas_de(Usuario, UsuarioSync)),
+    EXCLUIDOS: (Exclusao, Exclusao.excluido_em, Exclusao.id, [
+        Exclusao.entidade, Exclusao.ref_id.label("id"), Exclusao.excluido_em,
+    ]),
+}
+
+# (horário, id) da última linha entregue. Horário None: ainda nas linhas sem
+# atualizado_em, em ordem de id. Id None: tudo até esse horário já foi entregue.
+Posicao = Tuple[Optional[datetime], Optional[int]]
+
+
+def _registrar_exclusao(entidade: str, coluna_id):
+    def registrar(mapper, connection, target):
+        connection.execute(insert(Exclusao).values(entidade=entidade, ref_id=getattr(target, coluna_id.key)))
+    return registrar
+
+for _fonte in ("licitacoes", "contratos", "usuarios"):
+    event.listen(FONTES[_fonte][0], "after_delete", _registrar_exclusao(_fonte, FONTES[_fonte][2]))
+
+
+def registrar_exclusao(db: Session, entidade: str, ref_id: int):
+    """Lápide de um registro apagado por DELETE do Core, na transação da exclusão"""
+    db.execute(insert(Exclusao).values(entidade=entidade, ref_id=ref_id))
+
+
+def codificar_token(posicoes: dict) -> str:
+    bruto = json.dumps(
+        {fonte: [ts.isoformat() if ts else None, ultimo_id] for fonte, (ts, ultimo_id) in posicoes.items()},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip("=")
+
+
+def decodificar_token(token: str) -> dict:
+    try:
+        bruto = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        posicoes = {}
+        for fonte in FONTES:
+            ts, ultimo_id = bruto[fonte]
+            posicoes[fonte] = (
+                datetime.fromisoformat(ts) if ts else None,
+                int(ultimo_id) if ultimo_id is not None else None,
+            )
+            if posicoes[fonte] == (None, None) or (fonte == EXCLUIDOS and posicoes[fonte][0] is None):
+                raise ValueError(fonte)
+        return posicoes
+    except (ValueError, TypeError, KeyError, UnicodeDecodeError):
+        raise HTTPException(400, "Token de sincronização inválido")
+
+
+def _pagina(db: Session, fonte: str, posicao: Posicao, ate: datetime, limite: int):
+    """Até `limite` linhas depois da posição, a nova posição e se pode haver mais"""
+    _, coluna_ts, coluna_id, colunas = FONTES[fonte]
+    # Horário e id rotulados à parte: também estão entre as colunas da saída
+    stmt = select(coluna_ts.label("_ts"), coluna_id.label("_id"), *colunas)
+    ts, ultimo_id = posicao
+    linhas = []
+    if ts is None:
+        linhas = db.execute(
+            stmt.where(coluna_ts.is_(None), coluna_id > ultimo_id).order_by(coluna_id).limit(limite)
+        ).all()
+        if len(linhas) == limite:
+            return linhas, (None, linhas[-1][1]), True
+        # Acabaram as linhas sem horário: segue pelas demais, desde o começo
+        ts, ultimo_id = datetime.min, None
+
+    depois = coluna_ts > ts if ultimo_id is None else or_(
+        coluna_ts > ts, and_(coluna_ts == ts, coluna_id > ultimo_id)
+    )
+    restante = limite - len(linhas)
+    linhas += db.execute(
+        stmt.where(depois, coluna_ts <= ate).order_by(coluna_ts, coluna_id).limit(restante)
+    ).all()
+    if len(linhas) == limite:
+        return linhas, (linhas[-1][0], linhas[-1][1]), True
+    return linhas, (max(ts, ate), None), False
+
+
+def sincronizar(db: Session, token: Optional[str], limite: int) -> dict:
+    """Alterações e exclusões desde o token (até `limite` por fonte) e o token seguinte"""
+    agora = datetime.utcnow()
+    ate = agora - timedelta(seconds=settings.SYNC_MARGEM)
+    if token:
+        posicoes = decodificar_token(token)
+        excluidos_desde = posicoes[EXCLUIDOS][0]
+        if settings.SYNC_RETENCAO_DIAS and excluidos_desde < agora - timedelta(days=settings.SYNC_RETENCAO_DIAS):
+            # As lápides desse período já podem ter sido limpas
+            raise HTTPException(410, "Token expirado: sincronize do início (sem since)")
+    else:
+        # Quem ainda não tem nada não precisa das exclusões anteriores
+        posicoes = {fonte: (None, 0) for fonte in FONTES}
+        posicoes[EXCLUIDOS] = (ate, None)
+
+    resposta, mais = {}, False
+    for fonte in FONTES:
+        linhas, posicoes[fonte], pode_haver_mais = _pagina(db, fonte, posicoes[fonte], ate, limite)
+        resposta[fonte] = [dict(zip(linha._fields[2:], linha[2:])) for linha in linhas]
+        mais = mais or pode_haver_mais
+    resposta["proximo"] = codificar_token(posicoes)
+    resposta["mais"] = mais
+    return resposta
+
+
+def limpar_exclusoes(db: Session) -> int:
+    """Apaga as lápides mais velhas que SYNC_RETENCAO_DIAS"""
+    limite = datetime.utcnow() - timedelta(days=settings.SYNC_RETENCAO_DIAS)
+    apagadas = db.execute(delete(Exclusao).where(Exclusao.excluido_em < limite)).rowcount
+    db.commit()
+    return apagadas
+
+
+def _limpar_com_sessao() -> int:
+    db = SessionLocal()
+    try:
+        return limpar_exclusoes(db)
+    finally:
+        db.close()
+
+
+async def agendar_limpeza():
+    """Limpa as lápides vencidas uma vez por dia, em uma thread"""
+    while True:
+        try:
+            apagadas = await asyncio.to_thread(_limpar_com_sessao)
+            if apagadas:
+                logger.info("Sincronização: %d lápides de exclusão removidas", apagadas)
+        except Exception:
+            logger.exception("Falha na limpeza das lápides de exclusão")
+        await asyncio.sleep(LIMPEZA_INTERVALO)
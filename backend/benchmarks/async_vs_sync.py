@@ -0,0 +1,69 @@
+"""Compara req/s e p99 das rotas de leitura nos modos síncrono e ASYNC_DB.
+
+Uso: python benchmarks/async_vs_sync.py [--concorrencia 200] [--duracao 10] [--linhas 5000]
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+
+from benchmarks.comum import banco_temporario, medir, servidor
+
+
+def popular(database_url: str, linhas: int):
+    from app.db.base import Base
+    from app.models.licitacao import Licitacao
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    inicio = date(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Licitacao), [
+            {
+                "numero_processo": f"BENCH-{i}",
+                "modalidade": random.choice(["Pregão", "Dispensa Eletrônica", "Inexigibilidade"]),
+                "objeto": f"Objeto de teste {i}",
+                "orgao_responsavel": random.choice(["SEDUC", "SESAU", "SEFAZ"]),
+                "data_abertura": inicio + timedelta(days=i % 1500),
+                "status": random.choice(["Em andamento", "Concluído"]),
+            }
+            for i in range(linhas)
+        ])
+    engine.dispose()
+
+
+async def listar_pagina(client, i, n):
+    return await client.get("/licitacoes", params={"limit": 50})
+
+
+async def obter(client, i, n):
+    return await client.get(f"/licitacoes/{(i * 7919 + n) % 1000 + 1}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concorrencia", type=int, default=200)
+    parser.add_argument("--duracao", type=float, default=10.0)
+    parser.add_argument("--linhas", type=int, default=5000)
+    args = parser.parse_args()
+
+    database_url = banco_temporario()
+    popular(database_url, args.linhas)
+
+    print(f"{'modo':<8} {'rota':<20} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'erros':>6}")
+    for modo, async_db in (("sync", "false"), ("async", "true")):
+        with servidor(database_url, ASYNC_DB=async_db) as base_url:
+            for nome, requisicao in (("GET /licitacoes", listar_pagina), ("GET /licitacoes/id", obter)):
+                r = medir(base_url, requisicao, args.concorrencia, args.duracao)
+                print(f"{modo:<8} {nome:<20} {r['req_por_s']:>9} {r['p50_ms']:>9} {r['p99_ms']:>9} {r['erros']:>6}")
+
+    os.remove(database_url.replace("sqlite:///", ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Latência da busca textual (/busca) comparada a LIKE '%termo%' no objeto.
+
+Popula um SQLite temporário com licitações de objetos sintéticos (os índices
+FTS5 são alimentados pelos triggers durante a carga) e mede cada consulta.
+
+Uso: python benchmarks/busca.py [--linhas 1000000] [--repeticoes 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import Session
+
+from benchmarks.comum import banco_temporario, percentil
+
+VERBOS = ["Aquisição de", "Contratação de", "Fornecimento de", "Locação de", "Manutenção de", "Prestação de serviços de"]
+ITENS = [
+    "computadores", "notebooks", "impressoras", "material de escritório", "merenda escolar",
+    "medicamentos", "combustível", "veículos", "mobiliário", "limpeza urbana", "vigilância",
+    "equipamentos hospitalares", "software de gestão", "obras de pavimentação", "uniformes",
+]
+COMPLEMENTOS = ["para a secretaria de educação", "para a saúde", "para o hospital municipal",
+                "para as escolas da rede", "para a administração", "em caráter emergencial"]
+ORGAOS = ["Prefeitura Municipal", "Secretaria de Saúde", "Secretaria de Educação", "Câmara Municipal"]
+CONSULTAS = ["aquisição de computadores", "merenda escolar", "equipamentos hospitalares emergencial", "pavimentação"]
+# Consulta rara (uma linha): LIKE precisa varrer a tabela inteira
+
+
+def popular(database_url: str, linhas: int):
+    from app.db.base import Base
+    from app.models.licitacao import Licitacao
+    from app.services.busca import garantir_indice_busca
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        garantir_indice_busca(conn)
+    rnd = random.Random(42)
+    inicio = date(2020, 1, 1)
+    lote = 20000
+    with engine.begin() as conn:
+        for base in range(0, linhas, lote):
+            conn.execute(insert(Licitacao), [
+                {
+                    "numero_processo": f"B{i:08d}",
+                    "modalidade": "Pregão",
+                    "objeto": f"{rnd.choice(VERBOS)} {rnd.choice(ITENS)} {rnd.choice(COMPLEMENTOS)} - lote {i}",
+                    "orgao_responsavel": rnd.choice(ORGAOS),
+                    "data_abertura": inicio + timedelta(days=i % 2000),
+                    "status": "Aberta",
+                }
+                for i in range(base, min(base + lote, linhas))
+            ])
+    return engine
+
+
+def cronometrar(funcao, repeticoes: int) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {"p50_ms": round(percentil(tempos, 50) * 1000, 2), "p95_ms": round(percentil(tempos, 95) * 1000, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    engine = popular(banco_temporario(), args.linhas)
+    print(f"{args.linhas} licitações carregadas em {time.perf_counter() - inicio:.1f}s")
+
+    from app.models.licitacao import Licitacao
+    from app.services.busca import buscar
+
+    print(f"{'consulta':<40} {'fts p50':>9} {'fts p95':>9} {'like p50':>9} {'like p95':>9}")
+    with Session(engine) as db:
+        for consulta in CONSULTAS + [f"lote {args.linhas // 2}"]:
+            fts = cronometrar(lambda: buscar(db, consulta, "licitacoes", 0, 20), args.repeticoes)
+            # Base de comparação: substring sem índice (varre a tabela), mais recentes primeiro
+            filtros = [Licitacao.objeto.like(f"%{p}%") for p in consulta.split() if len(p) > 2]
+            like = cronometrar(
+                lambda: db.scalars(
+                    select(Licitacao).where(*filtros).order_by(Licitacao.data_abertura.desc()).limit(20)
+                ).all(),
+                max(1, args.repeticoes // 5),
+            )
+            print(f"{consulta:<40} {fts['p50_ms']:>9} {fts['p95_ms']:>9} {like['p50_ms']:>9} {like['p95_ms']:>9}")
+        total = db.scalar(select(func.count()).select_from(Licitacao))
+    print(f"linhas na tabela: {total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Suíte de carga da API com baseline de regressão.
+
+Popula um banco SQLite com dados sintéticos (benchmarks/dados.py), sobe o app
+em um uvicorn separado por grupo e dispara clientes concorrentes contra cada
+rota. Login (bcrypt), listagens e relatórios são grupos separados, para que o
+custo de um não esconda a regressão do outro. O cache HTTP fica desligado:
+com ele, as repetições da mesma URL mediriam só o cache.
+
+Cada cenário registra req/s e p50/p95/p99. Com --salvar o resultado vira a
+baseline (JSON); sem ele, o resultado é comparado com a baseline e o script
+sai com código 1 se algum cenário tiver erros, p95 maior ou req/s menor que a
+baseline além de --tolerancia. A baseline vale para a máquina e a escala em
+que foi gravada.
+
+Uso: python benchmarks/carga.py [--escala 10000] [--grupos login,listagens,...]
+     [--concorrencia 20] [--duracao 5] [--banco arquivo.db] [--baseline arquivo.json]
+     [--tolerancia 0.2] [--salvar]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.comum import BACKEND_DIR, banco_temporario, medir, servidor
+from benchmarks.dados import SENHA, popular, quantidades
+
+# Diferenças de p95 abaixo disso são ruído de medição, não regressão
+FOLGA_MS = 2.0
+
+
+def cenarios(escala: int) -> dict:
+    """grupo -> (variáveis de ambiente do servidor, [(nome, requisição, concorrência relativa)])"""
+    n = quantidades(escala)
+
+    def licitacao(i, k):
+        return (i * 7919 + k * 104729) % n["licitacoes"] + 1
+
+    def contrato(i, k):
+        return (i * 6151 + k * 92821) % n["contratos"] + 1
+
+    def usuario(i, k):
+        return (i * 31 + k) % n["usuarios"] + 1
+
+    async def login(client, i, k):
+        return await client.post("/login", data={"username": f"bench{usuario(i, k) - 1}", "password": SENHA})
+
+    async def pagina_licitacoes(client, i, k):
+        return await client.get("/licitacoes", params={"limit": 50})
+
+    async def licitacoes_filtradas(client, i, k):
+        return await client.get("/licitacoes", params={"limit": 50, "status": "Aberta", "orgao_responsavel": "SEDUC"})
+
+    async def licitacoes_com_contratos(client, i, k):
+        return await client.get("/licitacoes", params={"limit": 50, "expand": "contratos"})
+
+    async def obter_licitacao(client, i, k):
+        return await client.get(f"/licitacoes/{licitacao(i, k)}")
+
+    async def detalhe_licitacao(client, i, k):
+        return await client.get(f"/licitacoes/{licitacao(i, k)}/detalhe")
+
+    async def pagina_contratos(client, i, k):
+        return await client.get("/contratos/", params={"skip": (i * 100 + k) % 1000, "limit": 100})
+
+    async def obter_contrato(client, i, k):
+        return await client.get(f"/contratos/{contrato(i, k)}")
+
+    async def contratos_da_licitacao(client, i, k):
+        return await client.get(f"/contratos/licitacao/{licitacao(i, k)}")
+
+    async def notificacoes_do_usuario(client, i, k):
+        return await client.get("/notificacoes/", params={"usuario_id": usuario(i, k)})
+
+    async def total_nao_lidas(client, i, k):
+        return await client.get("/notificacoes/nao-lidas/total", params={"usuario_id": usuario(i, k)})
+
+    async def usuario_atual(client, i, k):
+        return await client.get("/usuarios/me")
+
+    async def buscar(client, i, k):
+        return await client.get("/busca", params={"q": ("computadores", "medicamentos", "limpeza")[k % 3]})
+
+    async def resumo_dashboard(client, i, k):
+        return await client.get("/dashboard/resumo")
+
+    async def pool(client, i, k):
+        return await client.get("/monitoramento/pool")
+
+    def relatorio(formato, **filtros):
+        async def requisicao(client, i, k):
+            return await client.get("/relatorios", params={"formato": formato, **filtros})
+        return requisicao
+
+    async def criar_licitacao(client, i, k):
+        return await client.post("/licitacoes", json={
+            "numero_processo": f"CARGA-{time.time_ns()}-{i}-{k}",
+            "modalidade": "Pregão Eletrônico",
+            "objeto": "Aquisição de material de consumo",
+            "orgao_responsavel": "SEDUC",
+            "data_abertura": "2024-06-01",
+            "status": "Aberta",
+        })
+
+    async def criar_notificacao(client, i, k):
+        return await client.post("/notificacoes/", json={
+            "titulo": "Carga", "mensagem": "Notificação de teste", "tipo": "info", "usuario_id": usuario(i, k),
+        })
+
+    async def marcar_lida(client, i, k):
+        # As particulares têm dono sorteado (outro usuário levaria 404): vão
+        # sem usuario_id; as globais (uma a cada 1000) são lidas por usuário
+        if k % 2:
+            notificacao = (i * 7 + k) % n["notificacoes"] + 1
+            return await client.patch(f"/notificacoes/{notificacao}/marcar-lida")
+        notificacao = (i * 7 + k) * 1000 % n["notificacoes"] + 1
+        return await client.patch(f"/notificacoes/{notificacao}/marcar-lida", params={"usuario_id": usuario(i, k)})
+
+    # Um mês de um órgão: relatórios inteiros na escala de 1M levariam minutos
+    filtro_relatorio = {"orgao": "SEDUC", "data_inicio": "2023-01-01", "data_fim": "2023-01-31"}
+    return {
+        # Sem o cache de credenciais: mede o bcrypt de cada login
+        "login": ({"LOGIN_CACHE_TTL": "0"}, [("POST /login", login, 1.0)]),
+        "listagens": ({}, [
+            ("GET /licitacoes", pagina_licitacoes, 1.0),
+            ("GET /licitacoes (filtros)", licitacoes_filtradas, 1.0),
+            ("GET /licitacoes?expand=contratos", licitacoes_com_contratos, 1.0),
+            ("GET /licitacoes/{id}", obter_licitacao, 1.0),
+            ("GET /licitacoes/{id}/detalhe", detalhe_licitacao, 1.0),
+            ("GET /contratos/", pagina_contratos, 1.0),
+            ("GET /contratos/{id}", obter_contrato, 1.0),
+            ("GET /contratos/licitacao/{id}", contratos_da_licitacao, 1.0),
+            ("GET /notificacoes/?usuario_id", notificacoes_do_usuario, 1.0),
+            ("GET /notificacoes/nao-lidas/total", total_nao_lidas, 1.0),
+            ("GET /usuarios/me", usuario_atual, 1.0),
+        ]),
+        "consultas": ({}, [
+            ("GET /busca", buscar, 1.0),
+            ("GET /dashboard/resumo", resumo_dashboard, 1.0),
+            ("GET /monitoramento/pool", pool, 1.0),
+        ]),
+        # Menos clientes: cada relatório é uma leitura longa
+        "relatorios": ({}, [
+            ("GET /relatorios csv", relatorio("csv", **filtro_relatorio), 0.25),
+            ("GET /relatorios ndjson", relatorio("ndjson", **filtro_relatorio), 0.25),
+            ("GET /relatorios pdf", relatorio("pdf", tipo="contratos", **filtro_relatorio), 0.25),
+        ]),
+        "escritas": ({}, [
+            ("POST /licitacoes", criar_licitacao, 1.0),
+            ("POST /notificacoes/", criar_notificacao, 1.0),
+            ("PATCH /notificacoes/{id}/marcar-lida", marcar_lida, 1.0),
+        ]),
+    }
+
+
+def token(base_url: str) -> str:
+    resposta = httpx.post(base_url + "/login", data={"username": "bench0", "password": SENHA}, timeout=30)
+    resposta.raise_for_status()
+    return resposta.json()["access_token"]
+
+
+def executar(database_url: str, escala: int, grupos: list, concorrencia: int, duracao: float) -> dict:
+    resultados = {}
+    todos = cenarios(escala)
+    for grupo in grupos:
+        env, lista = todos[grupo]
+        env = {"ALERTA_INTERVALO": "0", "RESPOSTA_CACHE_SIZE": "0", **env}
+        with servidor(database_url, **env) as base_url:
+            cabecalhos = {"Authorization": f"Bearer {token(base_url)}"}
+            for nome, requisicao, fator in lista:
+                r = medir(base_url, requisicao, max(1, int(concorrencia * fator)), duracao, cabecalhos)
+                resultados[nome] = {"grupo": grupo, **r}
+                print(
+                    f"{grupo:<11} {nome:<38} {r['req_por_s']:>9} {r['p50_ms']:>9} "
+                    f"{r['p95_ms']:>9} {r['p99_ms']:>9} {r['erros']:>6}"
+                    + (f"  ({r['falhas_transporte']} sem resposta)" if r["falhas_transporte"] else ""),
+                    flush=True,
+                )
+    return resultados
+
+
+def comparar(resultados: dict, baseline: dict, tolerancia: float) -> list:
+    """Cenários que pioraram além da tolerância, com o motivo"""
+    regressoes = []
+    for nome, atual in resultados.items():
+        falhas = atual.get("falhas_transporte", 0)
+        if atual["erros"] - falhas:
+            regressoes.append(f"{nome}: {atual['erros'] - falhas} respostas com erro")
+        if falhas:
+            regressoes.append(f"{nome}: {falhas} requisições sem resposta (erro de transporte)")
+        anterior = baseline.get(nome)
+        if anterior is None:
+            continue
+        limite_p95 = max(anterior["p95_ms"] * (1 + tolerancia), anterior["p95_ms"] + FOLGA_MS)
+        if atual["p95_ms"] > limite_p95:
+            regressoes.append(f"{nome}: p95 {anterior['p95_ms']} -> {atual['p95_ms']} ms")
+        if atual["req_por_s"] < anterior["req_por_s"] * (1 - tolerancia):
+            regressoes.append(f"{nome}: req/s {anterior['req_por_s']} -> {atual['req_por_s']}")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--escala", type=int, default=10_000, help="licitações no banco (10000, 100000, 1000000)")
+    parser.add_argument("--grupos", default="login,listagens,consultas,relatorios,escritas")
+    parser.add_argument("--concorrencia", type=int, default=20)
+    parser.add_argument("--duracao", type=float, default=5.0, help="segundos por cenário")
+    parser.add_argument("--banco", help="arquivo SQLite reaproveitado entre execuções (populado só na primeira)")
+    parser.add_argument("--baseline", help="padrão: benchmarks/baseline_<escala>.json")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="piora aceita (0.2 = 20%%)")
+    parser.add_argument("--salvar", action="store_true", help="grava o resultado como nova baseline")
+    args = parser.parse_args()
+
+    grupos = args.grupos.split(",")
+    caminho_baseline = args.baseline or os.path.join(BACKEND_DIR, "benchmarks", f"baseline_{args.escala}.json")
+    database_url = f"sqlite:///{os.path.abspath(args.banco)}" if args.banco else banco_temporario()
+
+    inicio = time.perf_counter()
+    if popular(database_url, args.escala):
+        print(f"Banco populado em {time.perf_counter() - inicio:.0f} s: {quantidades(args.escala)}")
+
+    print(f"{'grupo':<11} {'cenário':<38} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'erros':>6}")
+    try:
+        resultados = executar(database_url, args.escala, grupos, args.concorrencia, args.duracao)
+    finally:
+        if not args.banco:
+            os.remove(database_url.removeprefix("sqlite:///"))
+
+    if args.salvar:
+        with open(caminho_baseline, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "escala": args.escala,
+                "concorrencia": args.concorrencia,
+                "duracao": args.duracao,
+                "gravado_em": datetime.now().isoformat(timespec="seconds"),
+                "maquina": f"{platform.node()} / Python {platform.python_version()}",
+                "cenarios": resultados,
+            }, arquivo, indent=2, ensure_ascii=False)
+        print(f"Baseline gravada em {caminho_baseline}")
+        return
+
+    if not os.path.exists(caminho_baseline):
+        print(f"Sem baseline em {caminho_baseline}; rode com --salvar para gravar uma")
+        return
+    with open(caminho_baseline, encoding="utf-8") as arquivo:
+        baseline = json.load(arquivo)
+    if (baseline["escala"], baseline["concorrencia"]) != (args.escala, args.concorrencia):
+        sys.exit("Baseline gravada com outra escala ou concorrência; compare nas mesmas condições")
+    regressoes = comparar(resultados, baseline["cenarios"], args.tolerancia)
+    if regressoes:
+        print("Regressões acima da tolerância:")
+        for regressao in regressoes:
+            print(f"  {regressao}")
+        sys.exit(1)
+    print(f"Sem regressões (tolerância {args.tolerancia:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Utilitários compartilhados pelos benchmarks: servidor uvicorn isolado e gerador de carga."""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# base_url -> processo do uvicorn, para medir memória
+_processos = {}
+
+
+def porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def banco_temporario() -> str:
+    """Cria um arquivo SQLite temporário e devolve a DATABASE_URL"""
+    fd, caminho = tempfile.mkstemp(suffix=".db", prefix="bench_")
+    os.close(fd)
+    return f"sqlite:///{caminho}"
+
+
+@contextmanager
+def servidor(database_url: str, workers: int = 1, **env_extra):
+    """Sobe o app em um uvicorn separado e devolve a URL base"""
+    porta = porta_livre()
+    env = dict(os.environ, DATABASE_URL=database_url, PYTHONPATH=BACKEND_DIR, **env_extra)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(porta),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{porta}"
+    _processos[base_url] = proc
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(base_url + "/", timeout=0.5)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("servidor não respondeu")
+        yield base_url
+    finally:
+        _processos.pop(base_url, None)
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def memoria_mb(base_url: str):
+    """RSS do processo do servidor em MB (só Linux; None se indisponível)"""
+    proc = _processos.get(base_url)
+    try:
+        with open(f"/proc/{proc.pid}/status") as status:
+            for linha in status:
+                if linha.startswith("VmRSS:"):
+                    return round(int(linha.split()[1]) / 1024, 1)
+    except (AttributeError, OSError):
+        return None
+
+
+def percentil(valores: list, p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+async def _carga(base_url, requisicao, concorrencia, duracao, cabecalhos):
+    latencias, erros, falhas = [], 0, 0
+    fim = time.perf_counter() + duracao
+    limits = httpx.Limits(max_connections=concorrencia)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30, headers=cabecalhos) as client:
+        async def cliente(i):
+            nonlocal erros, falhas
+            n = 0
+            while time.perf_counter() < fim:
+                inicio = time.perf_counter()
+                try:
+                    resp = await requisicao(client, i, n)
+                except httpx.TransportError:
+                    # Conexão recusada/derrubada ou timeout: conta como erro
+                    # (sem latência) em vez de derrubar o cenário inteiro
+                    erros += 1
+                    falhas += 1
+                    n += 1
+                    continue
+                latencias.append(time.perf_counter() - inicio)
+                if resp.status_code >= 400:
+                    erros += 1
+                n += 1
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente(i) for i in range(concorrencia)))
+        decorrido = time.perf_counter() - inicio
+    return latencias, erros, falhas, decorrido
+
+
+def medir(base_url: str, requisicao, concorrencia: int = 50, duracao: float = 10.0, cabecalhos=None) -> dict:
+    """Dispara `concorrencia` clientes em paralelo por `duracao` segundos.
+
+    `requisicao(client, id_cliente, n)` deve ser uma corrotina que devolve a resposta.
+    `erros` conta respostas 4xx/5xx e falhas de transporte; estas também saem
+    sozinhas em `falhas_transporte`.
+    """
+    latencias, erros, falhas, decorrido = asyncio.run(
+        _carga(base_url, requisicao, concorrencia, duracao, cabecalhos)
+    )
+    return {
+        "requisicoes": len(latencias),
+        "erros": erros,
+        "falhas_transporte": falhas,
+        "req_por_s": round(len(latencias) / decorrido, 1),
+        "p50_ms": round(percentil(latencias, 50) * 1000, 2),
+        "p95_ms": round(percentil(latencias, 95) * 1000, 2),
+        "p99_ms": round(percentil(latencias, 99) * 1000, 2),
+    }
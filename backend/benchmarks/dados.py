@@ -0,0 +1,149 @@
+"""Dados sintéticos para os benchmarks, em escala configurável.
+
+`escala` é o número de licitações; contratos e notificações seguem o mesmo
+número e usuários entram na proporção de 1 para 100 (mínimo 20). Quase todas
+as notificações são de um usuário; 1 em 1000 é global, como no uso real.
+Os valores saem de um gerador com semente fixa, então a mesma escala gera
+sempre o mesmo banco.
+
+Uso direto: python benchmarks/dados.py sqlite:///caminho.db [--escala 100000]
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert, select
+
+SENHA = "senha-de-teste"
+LOTE = 20_000
+
+MODALIDADES = ["Pregão Eletrônico", "Concorrência", "Dispensa Eletrônica", "Inexigibilidade", "Tomada de Preços"]
+ORGAOS = ["SEDUC", "SESAU", "SEFAZ", "SEINFRA", "SEMAS", "PGE", "DETRAN", "Prefeitura Municipal"]
+STATUS_LICITACAO = ["Aberta", "Em andamento", "Concluído", "Cancelada"]
+STATUS_CONTRATO = ["Ativo", "Vigente", "Encerrado", "Rescindido"]
+ITENS = [
+    "material de consumo", "computadores e notebooks", "serviços de limpeza", "medicamentos",
+    "merenda escolar", "manutenção predial", "locação de veículos", "material de expediente",
+    "equipamentos hospitalares", "serviços de vigilância", "obras de pavimentação", "combustível",
+]
+INICIO = date(2020, 1, 1)
+
+
+def quantidades(escala: int) -> dict:
+    return {
+        "usuarios": max(escala // 100, 20),
+        "licitacoes": escala,
+        "contratos": escala,
+        "notificacoes": escala,
+    }
+
+
+def _usuarios(n: int, hash_senha: str):
+    for i in range(n):
+        yield {"username": f"bench{i}", "email": f"bench{i}@teste.gov.br", "password": hash_senha}
+
+
+def _licitacoes(n: int, rnd: random.Random):
+    for i in range(n):
+        abertura = INICIO + timedelta(days=rnd.randrange(2200))
+        yield {
+            "numero_processo": f"BENCH-{i:08d}",
+            "modalidade": rnd.choice(MODALIDADES),
+            "objeto": f"Aquisição de {rnd.choice(ITENS)} - lote {i}",
+            "orgao_responsavel": rnd.choice(ORGAOS),
+            "data_abertura": abertura,
+            "data_encerramento": abertura + timedelta(days=rnd.randrange(15, 90)),
+            "status": rnd.choice(STATUS_LICITACAO),
+        }
+
+
+def _contratos(n: int, licitacoes: int, rnd: random.Random):
+    for i in range(n):
+        assinatura = INICIO + timedelta(days=rnd.randrange(2200))
+        yield {
+            "numero_contrato": f"BENCH-{i:08d}/C",
+            "licitacao_id": rnd.randrange(licitacoes) + 1,
+            "fornecedor": f"Fornecedor {rnd.randrange(max(n // 50, 10))} Ltda",
+            "objeto": f"Fornecimento de {rnd.choice(ITENS)} - contrato {i}",
+            "valor_total": Decimal(rnd.randrange(100_00, 5_000_000_00)) / 100,
+            "data_assinatura": assinatura,
+            "data_inicio": assinatura,
+            "data_fim": assinatura + timedelta(days=rnd.choice([180, 365, 730])),
+            "status": rnd.choice(STATUS_CONTRATO),
+        }
+
+
+def _notificacoes(n: int, usuarios: int, rnd: random.Random):
+    criacao = datetime(2024, 1, 1)
+    for i in range(n):
+        yield {
+            "titulo": f"Notificação {i}",
+            "mensagem": "Contrato próximo do vencimento",
+            "tipo": rnd.choice(["info", "warning", "error", "success"]),
+            "usuario_id": None if i % 1000 == 0 else rnd.randrange(usuarios) + 1,
+            "lida": rnd.random() < 0.5,
+            "data_criacao": criacao + timedelta(minutes=i),
+        }
+
+
+def _inserir(conn, tabela, linhas):
+    while True:
+        lote = list(islice(linhas, LOTE))
+        if not lote:
+            return
+        conn.execute(insert(tabela), lote)
+
+
+def popular(database_url: str, escala: int) -> bool:
+    """Cria as tabelas e insere os dados; não faz nada se o banco já tiver licitações.
+
+    Devolve True se inseriu. O esquema vem das migrações, antes dos dados:
+    os triggers da busca textual (FTS5) já indexam as linhas inseridas. O
+    resumo do dashboard e os fornecedores são montados pelo próprio app na
+    inicialização.
+    """
+    from passlib.context import CryptContext
+    from app.db.migracoes import migrar
+    from app.models.contrato import Contrato
+    from app.models.licitacao import Licitacao
+    from app.models.notificacao import Notificacao
+    from app.models.user import Usuario
+
+    engine = create_engine(database_url)
+    try:
+        migrar(engine)
+        with engine.begin() as conn:
+            if conn.scalar(select(func.count()).select_from(Licitacao)):
+                return False
+            n = quantidades(escala)
+            rnd = random.Random(escala)
+            # Um hash só para todos: gerar um por usuário levaria horas no bcrypt
+            hash_senha = CryptContext(schemes=["bcrypt"]).hash(SENHA)
+            _inserir(conn, Usuario, _usuarios(n["usuarios"], hash_senha))
+            _inserir(conn, Licitacao, _licitacoes(n["licitacoes"], rnd))
+            _inserir(conn, Contrato, _contratos(n["contratos"], n["licitacoes"], rnd))
+            _inserir(conn, Notificacao, _notificacoes(n["notificacoes"], n["usuarios"], rnd))
+        return True
+    finally:
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("database_url")
+    parser.add_argument("--escala", type=int, default=10_000)
+    args = parser.parse_args()
+    if popular(args.database_url, args.escala):
+        print(quantidades(args.escala))
+    else:
+        print("Banco já populado; nada a fazer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Rajada de logins concorrentes medindo também uma rota comum no mesmo período.
+
+Mostra o efeito do pool de bcrypt e do cache de credenciais (LOGIN_CACHE_TTL)
+sobre a latência das demais rotas.
+
+Uso: python benchmarks/login.py [--concorrencia 100] [--duracao 10] [--usuarios 20]
+"""
+import argparse
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+
+from benchmarks.comum import banco_temporario, medir, servidor
+
+SENHA = "senha-de-teste"
+
+
+def popular(database_url: str, usuarios: int):
+    from passlib.context import CryptContext
+    from app.db.base import Base
+    from app.models.user import Usuario
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    hash_senha = CryptContext(schemes=["bcrypt"]).hash(SENHA)
+    with engine.begin() as conn:
+        conn.execute(insert(Usuario), [
+            {"username": f"bench{i}", "email": f"bench{i}@teste.com", "password": hash_senha}
+            for i in range(usuarios)
+        ])
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concorrencia", type=int, default=100)
+    parser.add_argument("--duracao", type=float, default=10.0)
+    parser.add_argument("--usuarios", type=int, default=20)
+    args = parser.parse_args()
+
+    database_url = banco_temporario()
+    popular(database_url, args.usuarios)
+
+    async def login(client, i, n):
+        return await client.post("/login", data={"username": f"bench{i % args.usuarios}", "password": SENHA})
+
+    async def raiz(client, i, n):
+        return await client.get("/")
+
+    print(f"{'cenário':<14} {'rota':<8} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'erros/503':>10}")
+    for cenario, ttl in (("sem cache", "0"), ("com cache", "60")):
+        with servidor(database_url, LOGIN_CACHE_TTL=ttl) as base_url:
+            resultados = {}
+            carga_login = threading.Thread(
+                target=lambda: resultados.setdefault("login", medir(base_url, login, args.concorrencia, args.duracao))
+            )
+            carga_login.start()
+            resultados["GET /"] = medir(base_url, raiz, 10, args.duracao)
+            carga_login.join()
+            for rota, r in resultados.items():
+                print(f"{cenario:<14} {rota:<8} {r['req_por_s']:>9} {r['p50_ms']:>9} {r['p99_ms']:>9} {r['erros']:>10}")
+
+    os.remove(database_url.replace("sqlite:///", ""))
+
+
+if __name__ == "__main__":
+    main()
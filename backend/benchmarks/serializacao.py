@@ -0,0 +1,180 @@
+"""Custo de serialização das listagens: caminho antigo x resposta orjson.
+
+"antes" reproduz o que as rotas faziam: objetos ORM + jsonable_encoder (sem
+response_model) ou validação em List[Schema] + JSONResponse. "depois" chama a
+rota atual, que seleciona só as colunas e serializa com orjson. Os dois
+corpos são comparados antes de medir, para garantir o mesmo conteúdo.
+
+Uso: python benchmarks/serializacao.py [--linhas 10000] [--repeticoes 20]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.comum import banco_temporario, percentil
+
+
+def popular(engine, linhas: int):
+    from sqlalchemy import insert
+    from app.models.contrato import Contrato
+    from app.models.licitacao import Licitacao
+    from app.models.notificacao import Notificacao
+    from app.models.user import Usuario
+
+    inicio = date(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Usuario), [
+            {"username": f"usuario{i}", "email": f"usuario{i}@exemplo.gov.br", "password": "$2b$12$" + "x" * 53}
+            for i in range(linhas)
+        ])
+        conn.execute(insert(Licitacao), [
+            {
+                "numero_processo": f"S{i:08d}",
+                "modalidade": "Pregão Eletrônico",
+                "objeto": f"Aquisição de material de consumo para a secretaria - lote {i}",
+                "orgao_responsavel": "Prefeitura Municipal",
+                "data_abertura": inicio + timedelta(days=i % 2000),
+                "data_encerramento": inicio + timedelta(days=i % 2000 + 30),
+                "status": "Aberta",
+            }
+            for i in range(linhas)
+        ])
+        conn.execute(insert(Contrato), [
+            {
+                "numero_contrato": f"S{i:08d}/2024",
+                "licitacao_id": i + 1,
+                "fornecedor": f"Fornecedor {i % 500} Ltda",
+                "objeto": f"Fornecimento de material de consumo - lote {i}",
+                "valor_total": Decimal("12345.67") + i,
+                "data_assinatura": inicio + timedelta(days=i % 2000),
+                "data_inicio": inicio + timedelta(days=i % 2000),
+                "data_fim": inicio + timedelta(days=i % 2000 + 365),
+                "status": "Ativo",
+            }
+            for i in range(linhas)
+        ])
+        conn.execute(insert(Notificacao), [
+            {
+                "titulo": f"Notificação {i}",
+                "mensagem": "Contrato próximo do vencimento",
+                "tipo": "warning",
+                "usuario_id": None if i % 2 else 1,
+                "lida": False,
+                "data_criacao": datetime(2024, 1, 1) + timedelta(minutes=i),
+            }
+            for i in range(linhas)
+        ])
+
+
+def cronometrar(funcao, repeticoes: int) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {"p50_ms": round(percentil(tempos, 50) * 1000, 1), "p95_ms": round(percentil(tempos, 95) * 1000, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=10_000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    database_url = banco_temporario()
+    os.environ["DATABASE_URL"] = database_url
+
+    from fastapi import Response
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+    from sqlalchemy import select
+    from app.db.base import Base  # registra os modelos antes das rotas
+    from app.api.routes import contratos, licitacoes, notificacoes, users
+    from app.db.session import SessionLocal, engine
+    from app.models.contrato import Contrato
+    from app.models.licitacao import Licitacao
+    from app.models.notificacao import Notificacao
+    from app.models.user import Usuario
+    from app.schemas.contrato import ContratoOut
+    from app.schemas.notificacao import NotificacaoOut
+
+    Base.metadata.create_all(engine)
+    popular(engine, args.linhas)
+    limite_licitacoes = min(args.linhas, 1000)  # máximo aceito pela rota
+    contratos_out = TypeAdapter(List[ContratoOut])
+    notificacoes_out = TypeAdapter(List[NotificacaoOut])
+
+    def com_modelo(adaptador, dados) -> bytes:
+        # O que o FastAPI faz com response_model: valida, converte e serializa
+        return JSONResponse(adaptador.dump_python(adaptador.validate_python(dados), mode="json")).body
+
+    casos = {
+        f"GET /licitacoes?limit={limite_licitacoes}": (
+            lambda db: JSONResponse(jsonable_encoder(db.scalars(
+                select(Licitacao).order_by(Licitacao.data_abertura.desc(), Licitacao.id_licitacao.desc())
+                .limit(limite_licitacoes)
+            ).all())).body,
+            lambda db: licitacoes.listar(
+                response=Response(), status_filtro=None, modalidade=None, orgao_responsavel=None,
+                data_inicio=None, data_fim=None, cursor=None, limit=limite_licitacoes, expand=None, db=db,
+            ).body,
+        ),
+        f"GET /contratos/?limit={args.linhas}": (
+            lambda db: com_modelo(
+                contratos_out, db.query(Contrato).order_by(Contrato.id).limit(args.linhas).all()
+            ),
+            lambda db: contratos.listar_contratos(skip=0, limit=args.linhas, db=db).body,
+        ),
+        "GET /notificacoes/": (
+            lambda db: com_modelo(notificacoes_out, [
+                {**n.__dict__, "lida": bool(lida), "data_leitura": data_leitura}
+                for n, lida, data_leitura in db.execute(
+                    select(Notificacao, Notificacao.lida, Notificacao.data_leitura)
+                    .order_by(Notificacao.data_criacao.desc())
+                )
+            ]),
+            lambda db: notificacoes.listar_notificacoes(usuario_id=None, apenas_nao_lidas=False, db=db).body,
+        ),
+        "GET /usuarios": (
+            lambda db: JSONResponse(jsonable_encoder(db.query(Usuario).all())).body,
+            lambda db: users.listar_usuarios(db=db).body,
+        ),
+    }
+
+    print(f"{'rota':<32} {'itens':>6} {'antes p50':>10} {'antes p95':>10} {'depois p50':>11} {'depois p95':>11} {'ganho':>6}")
+    try:
+        for rota, (antes, depois) in casos.items():
+            with SessionLocal() as db:
+                esperado, obtido = json.loads(antes(db)), json.loads(depois(db))
+            if rota == "GET /usuarios":
+                # O caminho antigo expunha o hash da senha
+                esperado = [{k: v for k, v in u.items() if k != "password"} for u in esperado]
+            assert esperado == obtido, f"{rota}: conteúdo diferente"
+
+            def requisicao(funcao):
+                # Sessão nova a cada repetição, como em uma requisição
+                with SessionLocal() as db:
+                    funcao(db)
+
+            medida_antes = cronometrar(lambda: requisicao(antes), args.repeticoes)
+            medida_depois = cronometrar(lambda: requisicao(depois), args.repeticoes)
+            ganho = medida_antes["p50_ms"] / max(medida_depois["p50_ms"], 0.1)
+            print(
+                f"{rota:<32} {len(obtido):>6} {medida_antes['p50_ms']:>10} {medida_antes['p95_ms']:>10} "
+                f"{medida_depois['p50_ms']:>11} {medida_depois['p95_ms']:>11} {ganho:>5.1f}x"
+            )
+    finally:
+        engine.dispose()
+        os.remove(database_url.removeprefix("sqlite:///"))
+
+
+if __name__ == "__main__":
+    main()
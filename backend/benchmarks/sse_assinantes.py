@@ -0,0 +1,94 @@
+"""Quantas conexões SSE um worker mantém e quanto demora o fan-out.
+
+Para cada quantidade de assinantes abre as conexões em /notificacoes/stream,
+cria uma notificação global e mede o tempo até cada conexão recebê-la, além da
+memória do servidor. O cliente roda na mesma máquina, então em poucos núcleos
+ele também disputa CPU com o servidor.
+
+Uso: python benchmarks/sse_assinantes.py [--assinantes 100 500 1000 2000] [--rodadas 5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.comum import banco_temporario, memoria_mb, percentil, servidor
+
+
+async def assinante(client, i, conectado: asyncio.Event, recebidos: dict, todos: asyncio.Event, total: int):
+    async with client.stream("GET", "/notificacoes/stream", params={"usuario_id": i + 1}) as resp:
+        buffer = ""
+        async for trecho in resp.aiter_text():
+            buffer += trecho
+            while "\n\n" in buffer:
+                evento, buffer = buffer.split("\n\n", 1)
+                if evento.startswith("retry:"):
+                    conectado.set()
+                elif "event: notificacao" in evento:
+                    recebidos[i] = time.perf_counter()
+                    if len(recebidos) == total:
+                        todos.set()
+
+
+async def rodada(base_url: str, quantidade: int, rodadas: int) -> dict:
+    limits = httpx.Limits(max_connections=quantidade + 10, max_keepalive_connections=0)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=None) as client:
+        conectados = [asyncio.Event() for _ in range(quantidade)]
+        recebidos: dict = {}
+        todos = asyncio.Event()
+
+        inicio = time.perf_counter()
+        tarefas = [
+            asyncio.create_task(assinante(client, i, conectados[i], recebidos, todos, quantidade))
+            for i in range(quantidade)
+        ]
+        await asyncio.gather(*(e.wait() for e in conectados))
+        tempo_conexao = time.perf_counter() - inicio
+        memoria = memoria_mb(base_url)
+
+        latencias, totais = [], []
+        for _ in range(rodadas):
+            recebidos.clear()
+            todos.clear()
+            publicado = time.perf_counter()
+            await client.post("/notificacoes/", json={"titulo": "bench", "mensagem": "fan-out", "tipo": "info"})
+            await asyncio.wait_for(todos.wait(), timeout=60)
+            latencias += [t - publicado for t in recebidos.values()]
+            totais.append(max(recebidos.values()) - publicado)
+
+        for tarefa in tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*tarefas, return_exceptions=True)
+
+    return {
+        "assinantes": quantidade,
+        "conexao_s": round(tempo_conexao, 2),
+        "memoria_mb": memoria,
+        "p50_ms": round(percentil(latencias, 50) * 1000, 1),
+        "p99_ms": round(percentil(latencias, 99) * 1000, 1),
+        "todos_ms": round(max(totais) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--assinantes", type=int, nargs="+", default=[100, 500, 1000, 2000])
+    parser.add_argument("--rodadas", type=int, default=5)
+    args = parser.parse_args()
+
+    with servidor(banco_temporario()) as base_url:
+        print(f"memória ociosa: {memoria_mb(base_url)} MB")
+        print(f"{'assinantes':>10} {'conexão (s)':>12} {'memória (MB)':>13} {'p50 (ms)':>9} {'p99 (ms)':>9} {'todos (ms)':>11}")
+        for quantidade in args.assinantes:
+            r = asyncio.run(rodada(base_url, quantidade, args.rodadas))
+            print(f"{r['assinantes']:>10} {r['conexao_s']:>12} {r['memoria_mb']:>13} "
+                  f"{r['p50_ms']:>9} {r['p99_ms']:>9} {r['todos_ms']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Exporta licitações ou contratos para Parquet/Arrow, completo ou incremental.
+
+Cada execução grava <tabela>_<desde>-<marca>.<formato> no diretório de saída.
+Com --incremental a exportação continua da maior marca já gravada lá, então
+rodar o comando periodicamente (cron) gera só arquivos com as linhas novas.
+
+Uso: python exportar.py contratos [--formato parquet|arrow] [--saida exportacoes]
+     [--desde 0 | --incremental] [--linhas-por-grupo 50000] [--banco sqlite:///...]
+"""
+import argparse
+import os
+import re
+import sys
+
+# Adicionar o diretório backend ao path
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, backend_dir)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import base  # noqa: F401  (registra os modelos)
+from app.services import exportacao
+
+
+def ultima_marca(saida: str, tabela: str, extensao: str) -> int:
+    padrao = re.compile(rf"^{tabela}_\d+-(\d+)\.{extensao}$")
+    marcas = [int(m.group(1)) for nome in os.listdir(saida) if (m := padrao.match(nome))]
+    return max(marcas, default=0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("tabela", choices=sorted(exportacao.TABELAS))
+    parser.add_argument("--formato", choices=sorted(exportacao.FORMATOS), default="parquet")
+    parser.add_argument("--saida", default="exportacoes", help="diretório dos arquivos")
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument("--desde", type=int, default=0, help="marca d'água (maior id já exportado)")
+    grupo.add_argument("--incremental", action="store_true", help="continua da última marca em --saida")
+    parser.add_argument("--linhas-por-grupo", type=int, default=exportacao.LINHAS_POR_GRUPO)
+    parser.add_argument("--banco", default=settings.DATABASE_URL, help="padrão: DATABASE_URL")
+    args = parser.parse_args()
+
+    _, extensao = exportacao.FORMATOS[args.formato]
+    os.makedirs(args.saida, exist_ok=True)
+    desde = ultima_marca(args.saida, args.tabela, extensao) if args.incremental else args.desde
+
+    engine = create_engine(args.banco)
+    try:
+        with Session(engine) as db:
+            ate = max(exportacao.marca_dagua(db, args.tabela), desde)
+            if ate == desde:
+                print(f"Nada novo em {args.tabela} desde {desde}")
+                return
+            caminho = os.path.join(args.saida, f"{args.tabela}_{desde}-{ate}.{extensao}")
+            # Grava num temporário: um arquivo interrompido não vira marca para o --incremental
+            with open(caminho + ".parcial", "wb") as arquivo:
+                for parte in exportacao.exportar(db, args.tabela, args.formato, desde, ate, args.linhas_por_grupo):
+                    arquivo.write(parte)
+            os.replace(caminho + ".parcial", caminho)
+    finally:
+        engine.dispose()
+    print(f"{caminho}: ids {desde + 1}..{ate} ({os.path.getsize(caminho)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Ambiente do Alembic: banco de DATABASE_URL e metadata dos modelos do app."""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.config import settings
+from app.db.base import Base
+
+config = context.config
+# Pela linha de comando usa os logs do alembic.ini; dentro do app, os do app
+if config.config_file_name is not None and not config.attributes.get("logs_do_app"):
+    fileConfig(config.config_file_name)
+target_metadata = Base.metadata
+
+
+def _gerenciado_pela_busca(objeto, nome, tipo, refletido, comparado_com) -> bool:
+    # FTS5 (SQLite) e busca_vetor/GIN (Postgres) ficam fora dos modelos: são
+    # criados pela baseline, então o autogenerate não deve propor removê-los
+    return refletido and comparado_com is None and (
+        "_fts" in (nome or "") or nome == "busca_vetor" or (nome or "").endswith("_busca")
+    )
+
+
+def _configurar(**kwargs):
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=lambda *args: not _gerenciado_pela_busca(*args),
+        # SQLite não altera colunas/constraints no lugar: recria a tabela
+        render_as_batch=True,
+        compare_type=True,
+        **kwargs,
+    )
+
+
+def run_migrations_offline():
+    _configurar(url=config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    engine = create_engine(
+        config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL, poolclass=pool.NullPool
+    )
+    with engine.connect() as conexao:
+        _configurar(connection=conexao)
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
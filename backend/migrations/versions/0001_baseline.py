@@ -0,0 +1,150 @@
+"""baseline: esquema criado pelo create_all antes das migrações
+
+Tudo é IF NOT EXISTS: num banco criado antes das migrações (pelo create_all
+de qualquer versão anterior) ela só cria as tabelas e índices que faltarem.
+Os índices compostos de leitura ficam na 0002, criados sem bloquear escritas
+em tabelas que já têm dados. numero_processo tem só a restrição nomeada
+uq_numero_processo (o create_all antigo criava também uma sem nome, igual).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 16:40:53.424797
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.busca import garantir_indice_busca
+
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usuarios",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(length=50), nullable=False),
+        sa.Column("email", sa.String(length=120), nullable=False),
+        sa.Column("password", sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_usuarios_id", "usuarios", ["id"], if_not_exists=True)
+    op.create_index("ix_usuarios_username", "usuarios", ["username"], unique=True, if_not_exists=True)
+
+    op.create_table(
+        "licitacoes",
+        sa.Column("id_licitacao", sa.Integer(), nullable=False),
+        sa.Column("numero_processo", sa.String(length=50), nullable=False),
+        sa.Column("modalidade", sa.String(length=30), nullable=False),
+        sa.Column("objeto", sa.String(), nullable=False),
+        sa.Column("orgao_responsavel", sa.String(length=100), nullable=False),
+        sa.Column("data_abertura", sa.Date(), nullable=False),
+        sa.Column("data_encerramento", sa.Date(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.PrimaryKeyConstraint("id_licitacao"),
+        sa.UniqueConstraint("numero_processo", name="uq_numero_processo"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_licitacoes_id_licitacao", "licitacoes", ["id_licitacao"], if_not_exists=True)
+
+    op.create_table(
+        "contratos",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("numero_contrato", sa.String(length=50), nullable=False),
+        sa.Column("licitacao_id", sa.Integer(), nullable=False),
+        sa.Column("fornecedor", sa.String(length=200), nullable=False),
+        sa.Column("objeto", sa.Text(), nullable=False),
+        sa.Column("valor_total", sa.DECIMAL(precision=15, scale=2), nullable=False),
+        sa.Column("data_assinatura", sa.Date(), nullable=False),
+        sa.Column("data_inicio", sa.Date(), nullable=False),
+        sa.Column("data_fim", sa.Date(), nullable=True),
+        sa.Column("status", sa.String(length=30), nullable=False),
+        sa.ForeignKeyConstraint(["licitacao_id"], ["licitacoes.id_licitacao"]),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_contratos_id", "contratos", ["id"], if_not_exists=True)
+    op.create_index(
+        "ix_contratos_numero_contrato", "contratos", ["numero_contrato"], unique=True,
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "notificacoes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("titulo", sa.String(length=200), nullable=False),
+        sa.Column("mensagem", sa.Text(), nullable=False),
+        sa.Column("tipo", sa.String(length=50), nullable=False),
+        sa.Column("usuario_id", sa.Integer(), nullable=True),
+        sa.Column("lida", sa.Boolean(), nullable=True),
+        sa.Column("data_criacao", sa.DateTime(), nullable=True),
+        sa.Column("data_leitura", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["usuario_id"], ["usuarios.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True,
+        if_not_exists=True,
+    )
+    op.create_index("ix_notificacoes_id", "notificacoes", ["id"], if_not_exists=True)
+
+    op.create_table(
+        "notificacoes_leituras",
+        sa.Column("usuario_id", sa.Integer(), nullable=False),
+        sa.Column("notificacao_id", sa.Integer(), nullable=False),
+        sa.Column("data_leitura", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["notificacao_id"], ["notificacoes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["usuario_id"], ["usuarios.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("usuario_id", "notificacao_id"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "notificacoes_marcas_leitura",
+        sa.Column("usuario_id", sa.Integer(), nullable=False),
+        sa.Column("lida_ate_id", sa.Integer(), nullable=False),
+        sa.Column("atualizado_em", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["usuario_id"], ["usuarios.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("usuario_id"),
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "resumo_dashboard",
+        sa.Column("entidade", sa.String(length=30), nullable=False),
+        sa.Column("ano", sa.Integer(), nullable=False),
+        sa.Column("mes", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=30), nullable=False),
+        sa.Column("quantidade", sa.Integer(), nullable=False),
+        sa.Column("valor_total", sa.DECIMAL(precision=17, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint("entidade", "ano", "mes", "status"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "alertas_enviados",
+        sa.Column("entidade", sa.String(length=20), nullable=False),
+        sa.Column("ref_id", sa.Integer(), nullable=False),
+        sa.Column("horizonte", sa.Integer(), nullable=False),
+        sa.Column("data_referencia", sa.Date(), nullable=False),
+        sa.Column("criado_em", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("entidade", "ref_id", "horizonte", "data_referencia"),
+        if_not_exists=True,
+    )
+
+    # Busca textual: FTS5 e triggers no SQLite, busca_vetor + GIN no Postgres
+    garantir_indice_busca(op.get_bind())
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        # Os triggers caem com as tabelas; as tabelas FTS não
+        op.execute("DROP TABLE IF EXISTS licitacoes_fts")
+        op.execute("DROP TABLE IF EXISTS contratos_fts")
+    for tabela in (
+        "alertas_enviados", "resumo_dashboard", "notificacoes_marcas_leitura", "notificacoes_leituras",
+        "notificacoes", "contratos", "licitacoes", "usuarios",
+    ):
+        op.drop_table(tabela)
@@ -0,0 +1,68 @@
+"""índices de leitura: paginação, varredura de alertas, notificações e contratos por licitação
+
+Os compostos atendem a paginação por cursor com filtros de licitações, a
+varredura de contratos a vencer e de licitações vencidas e as listagens de
+notificações por usuário. Eles também cobrem os filtros simples por
+licitacoes.status e data_abertura, contratos.data_fim e notificacoes.usuario_id
+(primeira coluna); só contratos.licitacao_id precisava de um índice próprio.
+
+No Postgres os índices são criados com CONCURRENTLY, sem bloquear escritas nas
+tabelas; isso não roda dentro de transação, por isso o autocommit_block. Lá
+também sai a restrição UNIQUE sem nome que o create_all antigo criava em
+licitacoes.numero_processo, repetindo uq_numero_processo (no SQLite removê-la
+exigiria recriar a tabela; ela fica).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 16:52:10.118204
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDICES = [
+    ("ix_licitacoes_abertura_id", "licitacoes", ["data_abertura", "id_licitacao"]),
+    ("ix_licitacoes_status_abertura_id", "licitacoes", ["status", "data_abertura", "id_licitacao"]),
+    ("ix_licitacoes_modalidade_abertura_id", "licitacoes", ["modalidade", "data_abertura", "id_licitacao"]),
+    ("ix_licitacoes_orgao_abertura_id", "licitacoes", ["orgao_responsavel", "data_abertura", "id_licitacao"]),
+    ("ix_licitacoes_status_encerramento_id", "licitacoes", ["status", "data_encerramento", "id_licitacao"]),
+    ("ix_contratos_fim_id", "contratos", ["data_fim", "id"]),
+    ("ix_contratos_licitacao_id", "contratos", ["licitacao_id"]),
+    ("ix_notificacoes_usuario_lida_criacao", "notificacoes", ["usuario_id", "lida", "data_criacao"]),
+    ("ix_notificacoes_usuario_id_id", "notificacoes", ["usuario_id", "id"]),
+]
+
+
+def _remover_se_invalido(nome: str):
+    # Um CONCURRENTLY interrompido deixa o índice INVALID (não usado, mas mantido
+    # nas escritas); o IF NOT EXISTS o aceitaria, então ele sai antes
+    invalido = op.get_bind().execute(text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :nome AND NOT i.indisvalid"
+    ), {"nome": nome}).first()
+    if invalido:
+        op.execute(f"DROP INDEX CONCURRENTLY {nome}")
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas in INDICES:
+            if postgres and not op.get_context().as_sql:
+                _remover_se_invalido(nome)
+            op.create_index(nome, tabela, colunas, if_not_exists=True, postgresql_concurrently=True)
+    if postgres:
+        # Só o catálogo muda: o índice de uq_numero_processo continua garantindo a unicidade
+        op.execute("ALTER TABLE licitacoes DROP CONSTRAINT IF EXISTS licitacoes_numero_processo_key")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for nome, tabela, _ in INDICES:
+            op.drop_index(nome, tabela, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,77 @@
+"""fornecedores normalizados e totais por fornecedor
+
+Cria fornecedores e resumo_fornecedores e a coluna contratos.fornecedor_id
+(nula). Os contratos existentes são ligados depois, em lotes, pela tarefa de
+preenchimento do app (FORNECEDOR_PREENCHIMENTO_LOTE), e não aqui: em tabelas
+grandes a migração seguraria o deploy.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 17:31:47.502118
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fornecedores",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("cnpj", sa.String(length=14), nullable=True),
+        sa.Column("nome", sa.String(length=200), nullable=False),
+        sa.Column("nome_normalizado", sa.String(length=200), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("cnpj"),
+    )
+    op.create_index(
+        "uq_fornecedores_nome_sem_cnpj", "fornecedores", ["nome_normalizado"], unique=True,
+        sqlite_where=sa.text("cnpj IS NULL"), postgresql_where=sa.text("cnpj IS NULL"),
+    )
+    op.create_index("ix_fornecedores_nome_normalizado", "fornecedores", ["nome_normalizado"])
+
+    op.create_table(
+        "resumo_fornecedores",
+        sa.Column("fornecedor_id", sa.Integer(), nullable=False),
+        sa.Column("ano", sa.Integer(), nullable=False),
+        sa.Column("quantidade", sa.Integer(), nullable=False),
+        sa.Column("valor_total", sa.DECIMAL(precision=17, scale=2), nullable=False),
+        sa.Column("ativos", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("fornecedor_id", "ano"),
+    )
+    op.create_index(
+        "ix_resumo_fornecedores_ano_valor", "resumo_fornecedores", ["ano", "valor_total", "fornecedor_id"]
+    )
+    op.create_index(
+        "ix_resumo_fornecedores_ano_quantidade", "resumo_fornecedores", ["ano", "quantidade", "fornecedor_id"]
+    )
+
+    # Coluna nula sem default: no Postgres e no SQLite não reescreve a tabela.
+    # O SQLite não aceita ADD CONSTRAINT e o batch_alter_table recriaria
+    # contratos, perdendo os triggers da busca; lá a FK fica só no modelo.
+    op.add_column("contratos", sa.Column("fornecedor_id", sa.Integer(), nullable=True))
+    if op.get_bind().dialect.name != "sqlite":
+        op.create_foreign_key(
+            "fk_contratos_fornecedor_id", "contratos", "fornecedores", ["fornecedor_id"], ["id"]
+        )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contratos_fornecedor_id", "contratos", ["fornecedor_id"],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_contratos_fornecedor_id", "contratos", if_exists=True, postgresql_concurrently=True)
+    if op.get_bind().dialect.name != "sqlite":
+        op.drop_constraint("fk_contratos_fornecedor_id", "contratos", type_="foreignkey")
+    op.drop_column("contratos", "fornecedor_id")
+    op.drop_table("resumo_fornecedores")
+    op.drop_table("fornecedores")
@@ -0,0 +1,56 @@
+"""controle de alterações: criado_em/atualizado_em e lápides de exclusão
+
+As colunas entram nulas e sem default no banco (o horário vem do app), então
+nenhuma tabela é reescrita; as linhas que já existiam ficam com nulo e saem
+na sincronização completa (GET /sync sem token).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 19:12:05.318842
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# tabela -> coluna de id do índice (atualizado_em, id)
+TABELAS = {"licitacoes": "id_licitacao", "contratos": "id", "usuarios": "id"}
+
+
+def upgrade() -> None:
+    for tabela in TABELAS:
+        op.add_column(tabela, sa.Column("criado_em", sa.DateTime(), nullable=True))
+        op.add_column(tabela, sa.Column("atualizado_em", sa.DateTime(), nullable=True))
+
+    op.create_table(
+        "exclusoes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("entidade", sa.String(length=20), nullable=False),
+        sa.Column("ref_id", sa.Integer(), nullable=False),
+        sa.Column("excluido_em", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True,
+    )
+    op.create_index("ix_exclusoes_excluido_id", "exclusoes", ["excluido_em", "id"])
+
+    with op.get_context().autocommit_block():
+        for tabela, coluna_id in TABELAS.items():
+            op.create_index(
+                f"ix_{tabela}_atualizado_id", tabela, ["atualizado_em", coluna_id],
+                if_not_exists=True, postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for tabela in TABELAS:
+            op.drop_index(f"ix_{tabela}_atualizado_id", tabela, if_exists=True, postgresql_concurrently=True)
+    op.drop_table("exclusoes")
+    for tabela in TABELAS:
+        op.drop_column(tabela, "atualizado_em")
+        op.drop_column(tabela, "criado_em")
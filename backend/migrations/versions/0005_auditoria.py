@@ -0,0 +1,39 @@
+"""trilha de auditoria de licitações e contratos
+
+Tabela nova, só de inserções: o índice (entidade, ref_id, id) atende o
+histórico de um registro. Não há carga inicial; o histórico começa aqui.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 20:41:26.770913
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "auditoria",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("entidade", sa.String(length=20), nullable=False),
+        sa.Column("ref_id", sa.Integer(), nullable=False),
+        sa.Column("acao", sa.String(length=10), nullable=False),
+        sa.Column("usuario", sa.String(length=50), nullable=True),
+        sa.Column("alterado_em", sa.DateTime(), nullable=False),
+        sa.Column("alteracoes", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True,
+    )
+    op.create_index("ix_auditoria_entidade_ref_id", "auditoria", ["entidade", "ref_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_auditoria_entidade_ref_id", "auditoria")
+    op.drop_table("auditoria")
@@ -0,0 +1,41 @@
+"""versão dos contratos (If-Match) e chaves de idempotência
+
+contratos.versao entra NOT NULL com default constante: o Postgres (11+) e o
+SQLite só gravam o default no catálogo, sem reescrever a tabela; as linhas
+existentes ficam na versão 1.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 21:35:12.604117
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("contratos", sa.Column("versao", sa.Integer(), server_default="1", nullable=False))
+
+    op.create_table(
+        "chaves_idempotencia",
+        sa.Column("escopo", sa.String(length=50), nullable=False),
+        sa.Column("chave", sa.String(length=200), nullable=False),
+        sa.Column("impressao", sa.String(length=64), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=False),
+        sa.Column("resposta", sa.Text(), nullable=False),
+        sa.Column("criado_em", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("escopo", "chave"),
+    )
+    op.create_index("ix_chaves_idempotencia_criado_em", "chaves_idempotencia", ["criado_em"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chaves_idempotencia_criado_em", "chaves_idempotencia")
+    op.drop_table("chaves_idempotencia")
+    op.drop_column("contratos", "versao")
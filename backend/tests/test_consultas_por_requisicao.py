@@ -0,0 +1,123 @@
+"""Quantidade de comandos SQL por requisição nas leituras de licitações.
+
+Regressão contra N+1: a listagem com expand=contratos e o
+/licitacoes/{id}/detalhe precisam emitir um número fixo de consultas, qualquer
+que seja o tamanho da página. Os comandos são contados pelo evento
+before_cursor_execute do engine.
+
+Uso (na pasta backend): python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LICITACOES = 200
+CONTRATOS = 5
+
+# rota -> consultas esperadas (independente do limit)
+ESPERADO = {
+    "/licitacoes?limit={limit}": 1,
+    "/licitacoes?limit={limit}&expand=contratos": 3,
+    "/licitacoes/{id}/detalhe": 3,
+}
+
+
+def popular(engine):
+    from sqlalchemy import insert
+    from app.models.contrato import Contrato
+    from app.models.licitacao import Licitacao
+
+    inicio = date(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Licitacao), [
+            {
+                "id_licitacao": i + 1,
+                "numero_processo": f"Q{i:06d}",
+                "modalidade": "Pregão",
+                "objeto": f"Objeto {i}",
+                "orgao_responsavel": "Prefeitura",
+                "data_abertura": inicio + timedelta(days=i),
+                "status": "Aberta",
+            }
+            for i in range(LICITACOES)
+        ])
+        conn.execute(insert(Contrato), [
+            {
+                "numero_contrato": f"Q{i:06d}/{j}",
+                "licitacao_id": i + 1,
+                "fornecedor": f"Fornecedor {j}",
+                "objeto": "Objeto",
+                "valor_total": Decimal("1000.50"),
+                "data_assinatura": inicio,
+                "data_inicio": inicio,
+                "status": "Ativo" if j % 2 == 0 else "Encerrado",
+            }
+            for i in range(LICITACOES)
+            for j in range(CONTRATOS)
+        ])
+
+
+@pytest.fixture(scope="module")
+def cliente():
+    """App sobre um SQLite temporário populado, com o contador de comandos"""
+    fd, caminho = tempfile.mkstemp(suffix=".db", prefix="teste_")
+    os.close(fd)
+    os.environ["DATABASE_URL"] = f"sqlite:///{caminho}"
+    os.environ["ALERTA_INTERVALO"] = "0"
+    # Sem o cache HTTP: cada requisição precisa chegar ao banco
+    os.environ["RESPOSTA_CACHE_SIZE"] = "0"
+    os.environ["FORNECEDOR_PREENCHIMENTO_LOTE"] = "0"
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app.db.session import engine
+    from app.main import app
+
+    contador = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def contar(conn, cursor, statement, parameters, context, executemany):
+        contador["n"] += 1
+
+    def consultas(client, url) -> int:
+        contador["n"] = 0
+        resposta = client.get(url)
+        assert resposta.status_code == 200, (url, resposta.status_code, resposta.text)
+        return contador["n"]
+
+    try:
+        with TestClient(app) as client:
+            popular(engine)
+            yield client, consultas
+    finally:
+        event.remove(engine, "before_cursor_execute", contar)
+        engine.dispose()
+        os.remove(caminho)
+
+
+@pytest.mark.parametrize("limit", [10, 100])
+@pytest.mark.parametrize("rota", list(ESPERADO))
+def test_consultas_fixas_por_requisicao(cliente, rota, limit):
+    client, consultas = cliente
+    assert consultas(client, rota.format(limit=limit, id=1)) <= ESPERADO[rota]
+
+
+def test_expand_nao_cresce_com_a_pagina(cliente):
+    client, consultas = cliente
+    rota = "/licitacoes?limit={limit}&expand=contratos"
+    assert consultas(client, rota.format(limit=10)) == consultas(client, rota.format(limit=LICITACOES))
+
+
+def test_detalhe_resume_os_contratos(cliente):
+    client, _ = cliente
+    detalhe = client.get("/licitacoes/1/detalhe").json()
+    resumo = detalhe["resumo_contratos"]
+    assert resumo["quantidade"] == CONTRATOS == len(detalhe["contratos"])
+    assert resumo["ativos"] == (CONTRATOS + 1) // 2
+    assert Decimal(resumo["valor_total"]) == Decimal("1000.50") * CONTRATOS
@@ -2,6 +2,7 @@ import { Drawer, List, ListItem, ListItemButton, ListItemIcon, ListItemText, Bad
 import { Dashboard, Description, Work, Notifications, People, Assessment } from "@mui/icons-material";
 import { NavLink } from "react-router-dom";
 import { useState, useEffect } from "react";
+import { abrirStreamNotificacoes, NOTIFICACOES_ALTERADAS } from "../services/notificacoesStream";
 
 const Sidebar = () => {
   const [notificacoes, setNotificacoes] = useState(0);
@@ -10,13 +11,13 @@ const Sidebar = () => {
     try {
       const user = JSON.parse(localStorage.getItem("user") || "{}");
       const url = user.id 
-        ? `http://127.0.0.1:8000/notificacoes/?usuario_id=${user.id}&apenas_nao_lidas=true`
+        ? `http://127.0.0.1:8000/notificacoes/nao-lidas/total?usuario_id=${user.id}`
         : "http://127.0.0.1:8000/notificacoes/?apenas_nao_lidas=true";
         
-      const response = await fetch(url);
+      const response = await fetch(url, { credentials: "include" });
       if (response.ok) {
         const data = await response.json();
-        setNotificacoes(data.length);
+        setNotificacoes(user.id ? data.total : data.length);
       }
     } catch (error) {
       console.error("Erro ao buscar notificações:", error);
@@ -25,9 +26,16 @@ const Sidebar = () => {
 
   useEffect(() => {
     fetchNotificacoesCount();
-    // Atualizar a cada 30 segundos
-    const interval = setInterval(fetchNotificacoesCount, 30000);
-    return () => clearInterval(interval);
+    // Notificações novas chegam pelo stream; leituras feitas na página recarregam a contagem
+    const fecharStream = abrirStreamNotificacoes({
+      onNotificacao: () => setNotificacoes((total) => total + 1),
+      onSincronizar: fetchNotificacoesCount,
+    });
+    window.addEventListener(NOTIFICACOES_ALTERADAS, fetchNotificacoesCount);
+    return () => {
+      fecharStream();
+      window.removeEventListener(NOTIFICACOES_ALTERADAS, fetchNotificacoesCount);
+    };
   }, []);
 
   return (
@@ -38,7 +38,7 @@ const Contratos = () => {
   useEffect(() => {
     const fetchContratos = async () => {
       try {
-        const response = await fetch("http://127.0.0.1:8000/contratos/");
+        const response = await fetch("http://127.0.0.1:8000/contratos/", { credentials: "include" });
         if (!response.ok) {
           throw new Error("Erro ao buscar contratos");
         }
@@ -63,6 +63,7 @@ const Contratos = () => {
     e.preventDefault();
     try {
       const response = await fetch("http://127.0.0.1:8000/contratos/", {
+        credentials: "include",
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -99,8 +100,11 @@ const Contratos = () => {
   const handleDeleteConfirm = async () => {
     const { contrato } = deleteDialog;
     try {
+      // If-Match: não exclui se alguém alterou o contrato depois que a lista foi carregada (412)
       const response = await fetch(`http://127.0.0.1:8000/contratos/${contrato.id}`, {
+        credentials: "include",
         method: "DELETE",
+        headers: { "If-Match": `"${contrato.versao}"` },
       });
 
       if (!response.ok) {
@@ -102,45 +102,29 @@ export default function Dashboard() {
     let mounted = true;
     async function fetchAll() {
       try {
-        const [lics, cons, users, notifs] = await Promise.all([
-          api.get("/licitacoes/"),
-          api.get("/contratos/").catch(() => ({ data: [] })),
-          api.get("/usuarios/").catch(() => ({ data: [] })),
-          api.get("/notificacoes/?apenas_nao_lidas=true").catch(() => ({ data: [] })),
-        ]);
+        // Indicadores já agregados pelo backend
+        const { data } = await api.get("/dashboard/resumo");
 
         if (!mounted) return;
 
-        const licitacoes = lics.data || [];
-        const contratos = cons.data || [];
-        const usuarios = users.data || [];
-        const notificacoes = notifs.data || [];
-
         // KPIs
         setKpis({
-          licitacoes: licitacoes.length,
-          contratos: contratos.length,
-          usuarios: usuarios.length,
-          notificacoes: notificacoes.length,
+          licitacoes: data.total_licitacoes,
+          contratos: data.total_contratos,
+          usuarios: data.total_usuarios,
+          notificacoes: data.notificacoes_nao_lidas,
         });
 
         // Últimas licitações (5)
-        const ult = [...licitacoes]
-          .sort((a, b) => new Date(b.data_abertura) - new Date(a.data_abertura))
-          .slice(0, 5);
-        setUltimas(ult);
+        setUltimas(data.ultimas_licitacoes || []);
 
         // Série mensal (contagem por mês do ano corrente)
-        const year = dayjs().year();
-        const counts = Array.from({ length: 12 }, (_, m) => ({
-          mes: dayjs().month(m).format("MMM"),
-          total: 0,
-        }));
-        licitacoes.forEach((l) => {
-          const d = dayjs(l.data_abertura);
-          if (d.year() === year) counts[d.month()].total += 1;
-        });
-        setSerie(counts);
+        setSerie(
+          data.licitacoes_por_mes.map((total, m) => ({
+            mes: dayjs().month(m).format("MMM"),
+            total,
+          }))
+        );
       } catch (e) {
         // fallback demo
         setKpis({ licitacoes: 0, contratos: 0, usuarios: 0, notificacoes: 0 });
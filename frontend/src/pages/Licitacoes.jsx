@@ -52,16 +52,27 @@ const Licitacoes = () => {
     "Inexigibilidade"
   ];
 
+  const [nextCursor, setNextCursor] = useState(null);
+
+  // Busca uma página de licitações já filtrada no servidor
+  const fetchLicitacoes = async (cursor = null) => {
+    const params = new URLSearchParams();
+    if (modalidadeFilter) params.append("modalidade", modalidadeFilter);
+    if (cursor) params.append("cursor", cursor);
+    const response = await fetch(`http://127.0.0.1:8000/licitacoes/?${params.toString()}`, { credentials: "include" });
+    if (!response.ok) {
+      throw new Error("Erro ao buscar licitações");
+    }
+    const data = await response.json();
+    setNextCursor(response.headers.get("X-Next-Cursor"));
+    return data;
+  };
+
   useEffect(() => {
-    const fetchLicitacoes = async () => {
+    const carregarLicitacoes = async () => {
       try {
-        const response = await fetch("http://127.0.0.1:8000/licitacoes/");
-        if (!response.ok) {
-          throw new Error("Erro ao buscar licitações");
-        }
-        const data = await response.json();
+        const data = await fetchLicitacoes();
         setLicitacoes(data);
-        setFilteredLicitacoes(data);
         
         // Verificar se há um ID na URL para destacar
         const urlParams = new URLSearchParams(location.search);
@@ -80,20 +91,22 @@ const Licitacoes = () => {
       }
     };
 
-    fetchLicitacoes();
-  }, [location.search]);
+    carregarLicitacoes();
+  }, [location.search, modalidadeFilter]);
 
-  // Filtrar licitações por modalidade
+  // O filtro de modalidade já é aplicado pelo servidor
   useEffect(() => {
-    if (modalidadeFilter === "") {
-      setFilteredLicitacoes(licitacoes);
-    } else {
-      const filtered = licitacoes.filter(licitacao => 
-        licitacao.modalidade?.toLowerCase().includes(modalidadeFilter.toLowerCase())
-      );
-      setFilteredLicitacoes(filtered);
+    setFilteredLicitacoes(licitacoes);
+  }, [licitacoes]);
+
+  const handleLoadMore = async () => {
+    try {
+      const data = await fetchLicitacoes(nextCursor);
+      setLicitacoes([...licitacoes, ...data]);
+    } catch (error) {
+      console.error("Erro ao buscar licitações:", error);
     }
-  }, [licitacoes, modalidadeFilter]);
+  };
 
   const handleInputChange = (e) => {
     const { name, value } = e.target;
@@ -112,6 +125,7 @@ const Licitacoes = () => {
     e.preventDefault();
     try {
       const response = await fetch("http://127.0.0.1:8000/licitacoes/", {
+        credentials: "include",
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -147,6 +161,7 @@ const Licitacoes = () => {
     const { licitacao } = deleteDialog;
     try {
       const response = await fetch(`http://127.0.0.1:8000/licitacoes/${licitacao.id_licitacao}`, {
+        credentials: "include",
         method: "DELETE",
       });
 
@@ -296,7 +311,7 @@ const Licitacoes = () => {
           )}
           
           <Typography variant="body2" color="textSecondary">
-            {filteredLicitacoes.length} de {licitacoes.length} licitações
+            {filteredLicitacoes.length} licitações carregadas
           </Typography>
         </Box>
       </Box>
@@ -354,6 +369,14 @@ const Licitacoes = () => {
         </TableBody>
       </Table>
 
+      {nextCursor && (
+        <Box sx={{ display: "flex", justifyContent: "center", mt: 2 }}>
+          <Button variant="outlined" onClick={handleLoadMore}>
+            Carregar mais
+          </Button>
+        </Box>
+      )}
+
       {/* Modal de confirmação de delete */}
       <Dialog
         open={deleteDialog.open}
@@ -27,6 +27,7 @@ import {
   MarkEmailRead,
   Refresh,
 } from "@mui/icons-material";
+import { abrirStreamNotificacoes, NOTIFICACOES_ALTERADAS } from "../services/notificacoesStream";
 
 const Notificacoes = () => {
   const [notificacoes, setNotificacoes] = useState([]);
@@ -43,7 +44,7 @@ const Notificacoes = () => {
         ? `http://127.0.0.1:8000/notificacoes/?usuario_id=${user.id}`
         : "http://127.0.0.1:8000/notificacoes/";
         
-      const response = await fetch(url);
+      const response = await fetch(url, { credentials: 'include' });
       if (!response.ok) {
         throw new Error("Erro ao buscar notificações");
       }
@@ -58,7 +59,12 @@ const Notificacoes = () => {
 
   const marcarComoLida = async (id) => {
     try {
-      const response = await fetch(`http://127.0.0.1:8000/notificacoes/${id}/marcar-lida`, {
+      const user = JSON.parse(localStorage.getItem("user") || "{}");
+      const url = user.id
+        ? `http://127.0.0.1:8000/notificacoes/${id}/marcar-lida?usuario_id=${user.id}`
+        : `http://127.0.0.1:8000/notificacoes/${id}/marcar-lida`;
+      const response = await fetch(url, {
+        credentials: 'include',
         method: 'PATCH',
       });
       
@@ -69,6 +75,7 @@ const Notificacoes = () => {
             notif.id === id ? { ...notif, lida: true, data_leitura: new Date().toISOString() } : notif
           )
         );
+        window.dispatchEvent(new Event(NOTIFICACOES_ALTERADAS));
       }
     } catch (error) {
       console.error("Erro ao marcar como lida:", error);
@@ -82,13 +89,14 @@ const Notificacoes = () => {
         ? `http://127.0.0.1:8000/notificacoes/marcar-todas-lidas?usuario_id=${user.id}`
         : "http://127.0.0.1:8000/notificacoes/marcar-todas-lidas";
         
-      const response = await fetch(url, { method: 'PATCH' });
+      const response = await fetch(url, { credentials: 'include', method: 'PATCH' });
       
       if (response.ok) {
         // Atualizar todas como lidas
         setNotificacoes(prev => 
           prev.map(notif => ({ ...notif, lida: true, data_leitura: new Date().toISOString() }))
         );
+        window.dispatchEvent(new Event(NOTIFICACOES_ALTERADAS));
       }
     } catch (error) {
       console.error("Erro ao marcar todas como lidas:", error);
@@ -98,12 +106,14 @@ const Notificacoes = () => {
   const deletarNotificacao = async (id) => {
     try {
       const response = await fetch(`http://127.0.0.1:8000/notificacoes/${id}`, {
+        credentials: 'include',
         method: 'DELETE',
       });
       
       if (response.ok) {
         setNotificacoes(prev => prev.filter(notif => notif.id !== id));
         setOpenDialog(false);
+        window.dispatchEvent(new Event(NOTIFICACOES_ALTERADAS));
       }
     } catch (error) {
       console.error("Erro ao deletar notificação:", error);
@@ -134,6 +144,12 @@ const Notificacoes = () => {
 
   useEffect(() => {
     fetchNotificacoes();
+    // Novas notificações entram no topo da lista sem recarregar
+    return abrirStreamNotificacoes({
+      onNotificacao: (nova) =>
+        setNotificacoes(prev => prev.some(n => n.id === nova.id) ? prev : [nova, ...prev]),
+      onSincronizar: fetchNotificacoes,
+    });
   }, []);
 
   if (loading) {
@@ -30,13 +30,9 @@ import {
   FilterList,
   Download
 } from '@mui/icons-material';
-import { jsPDF } from 'jspdf';
-import 'jspdf-autotable';
 import dayjs from 'dayjs';
 
 const Relatorios = () => {
-  const [licitacoes, setLicitacoes] = useState([]);
-  const [contratos, setContratos] = useState([]);
   const [loading, setLoading] = useState(false);
   const [filtros, setFiltros] = useState({
     tipoRelatorio: 'ambos', // 'licitacoes', 'contratos', 'ambos'
@@ -62,34 +58,17 @@ const Relatorios = () => {
     "Suspenso"
   ];
 
-  const fetchLicitacoes = async () => {
-    try {
-      const response = await fetch("http://127.0.0.1:8000/licitacoes/");
-      if (response.ok) {
-        const data = await response.json();
-        setLicitacoes(data);
-      }
-    } catch (error) {
-      console.error("Erro ao buscar licitações:", error);
-    }
-  };
-
-  const fetchContratos = async () => {
-    try {
-      const response = await fetch("http://127.0.0.1:8000/contratos/");
-      if (response.ok) {
-        const data = await response.json();
-        setContratos(data);
-      }
-    } catch (error) {
-      console.error("Erro ao buscar contratos:", error);
-    }
+  // Monta a URL do relatório com os filtros aplicados no servidor
+  const urlRelatorio = (formato) => {
+    const params = new URLSearchParams({ tipo: filtros.tipoRelatorio, formato });
+    if (filtros.dataInicio) params.append('data_inicio', filtros.dataInicio);
+    if (filtros.dataFim) params.append('data_fim', filtros.dataFim);
+    if (filtros.modalidade) params.append('modalidade', filtros.modalidade);
+    if (filtros.status) params.append('status', filtros.status);
+    return `http://127.0.0.1:8000/relatorios?${params.toString()}`;
   };
 
   useEffect(() => {
-    fetchLicitacoes();
-    fetchContratos();
-    
     // Debug: verificar se as listas de opções estão carregadas
     console.log('Modalidades disponíveis:', modalidades);
     console.log('Status disponíveis:', statusOptions);
@@ -109,388 +88,39 @@ const Relatorios = () => {
     }));
   };
 
-  const aplicarFiltros = () => {
+  const aplicarFiltros = async () => {
     setLoading(true);
-    let dadosFiltrados = [];
-
-    // Filtrar licitações
-    if (filtros.tipoRelatorio === 'licitacoes' || filtros.tipoRelatorio === 'ambos') {
-      let licitacoesFiltradas = [...licitacoes];
-
-      if (filtros.dataInicio) {
-        licitacoesFiltradas = licitacoesFiltradas.filter(item => 
-          dayjs(item.data_abertura).isAfter(dayjs(filtros.dataInicio).subtract(1, 'day'))
-        );
-      }
-
-      if (filtros.dataFim) {
-        licitacoesFiltradas = licitacoesFiltradas.filter(item => 
-          dayjs(item.data_abertura).isBefore(dayjs(filtros.dataFim).add(1, 'day'))
-        );
-      }
-
-      if (filtros.modalidade) {
-        licitacoesFiltradas = licitacoesFiltradas.filter(item => 
-          item.modalidade?.toLowerCase().includes(filtros.modalidade.toLowerCase())
-        );
-      }
-
-      if (filtros.status) {
-        licitacoesFiltradas = licitacoesFiltradas.filter(item => 
-          item.status?.toLowerCase().includes(filtros.status.toLowerCase())
-        );
-      }
-
-      licitacoesFiltradas.forEach(item => {
-        dadosFiltrados.push({
-          ...item,
-          tipo: 'Licitação',
-          numero: item.numero_processo,
-          descricao: item.objeto,
-          orgao: item.orgao_responsavel,
-          data: item.data_abertura,
-          valor: item.valor_estimado || 'N/A'
-        });
-      });
-    }
-
-    // Filtrar contratos
-    if (filtros.tipoRelatorio === 'contratos' || filtros.tipoRelatorio === 'ambos') {
-      let contratosFiltrados = [...contratos];
-
-      if (filtros.dataInicio) {
-        contratosFiltrados = contratosFiltrados.filter(item => 
-          dayjs(item.data_assinatura).isAfter(dayjs(filtros.dataInicio).subtract(1, 'day'))
-        );
-      }
-
-      if (filtros.dataFim) {
-        contratosFiltrados = contratosFiltrados.filter(item => 
-          dayjs(item.data_assinatura).isBefore(dayjs(filtros.dataFim).add(1, 'day'))
-        );
-      }
-
-      if (filtros.status) {
-        contratosFiltrados = contratosFiltrados.filter(item => 
-          item.status?.toLowerCase().includes(filtros.status.toLowerCase())
-        );
-      }
-
-      contratosFiltrados.forEach(item => {
-        dadosFiltrados.push({
-          ...item,
-          tipo: 'Contrato',
-          numero: item.numero_contrato,
-          descricao: item.objeto,
-          orgao: item.orgao_responsavel,
-          data: item.data_assinatura,
-          valor: item.valor_contrato || 'N/A'
-        });
-      });
-    }
-
-    // Ordenar por data
-    dadosFiltrados.sort((a, b) => dayjs(b.data).diff(dayjs(a.data)));
-
-    setDadosRelatorio(dadosFiltrados);
-    setRelatorioGerado(true);
-    setLoading(false);
-  };
-
-  const gerarPDF = async () => {
     try {
-      console.log('Iniciando geração do PDF completo...');
-      
-      if (!dadosRelatorio || dadosRelatorio.length === 0) {
-        alert('Nenhum dado encontrado para gerar o relatório. Por favor, execute a busca primeiro.');
-        return;
+      const response = await fetch(urlRelatorio('ndjson'), { credentials: 'include' });
+      if (!response.ok) {
+        throw new Error('Erro ao gerar relatório');
       }
-
-      // Importação dinâmica como fallback
-      let PDF;
-      try {
-        PDF = new jsPDF();
-      } catch (e1) {
-        try {
-          const jsPDFModule = await import('jspdf');
-          PDF = new jsPDFModule.jsPDF();
-        } catch (e2) {
-          throw new Error('Não foi possível carregar a biblioteca jsPDF');
-        }
-      }
-
-      console.log('jsPDF carregado com sucesso');
-
-      // Configurações do documento
-      PDF.setFont('helvetica');
-      
-      // Cabeçalho
-      PDF.setFontSize(20);
-      PDF.setFont('helvetica', 'bold');
-      PDF.text('RELATÓRIO COMPLETO DE PROCESSOS', 105, 20, { align: 'center' });
-      
-      PDF.setFontSize(14);
-      PDF.setFont('helvetica', 'normal');
-      PDF.text('Sistema de Licitações e Contratos - SALC', 105, 30, { align: 'center' });
-      
-      // Informações do relatório
-      const dataAtual = dayjs().format('DD/MM/YYYY HH:mm');
-      PDF.setFontSize(10);
-      PDF.text(`Data de geração: ${dataAtual}`, 20, 45);
-      PDF.text(`Total de registros: ${dadosRelatorio.length}`, 20, 52);
-      
-      // Filtros aplicados
-      let filtrosAtivos = [];
-      if (filtros.tipoRelatorio !== 'ambos') filtrosAtivos.push(`Tipo: ${filtros.tipoRelatorio}`);
-      if (filtros.modalidade) filtrosAtivos.push(`Modalidade: ${filtros.modalidade}`);
-      if (filtros.status) filtrosAtivos.push(`Status: ${filtros.status}`);
-      if (filtros.dataInicio) filtrosAtivos.push(`De: ${dayjs(filtros.dataInicio).format('DD/MM/YYYY')}`);
-      if (filtros.dataFim) filtrosAtivos.push(`Até: ${dayjs(filtros.dataFim).format('DD/MM/YYYY')}`);
-      
-      if (filtrosAtivos.length > 0) {
-        PDF.text(`Filtros aplicados: ${filtrosAtivos.join(' | ')}`, 20, 59);
-      }
-      
-      // Linha de separação
-      PDF.line(20, 65, 190, 65);
-      
-      let yPosition = 75;
-      let pageNumber = 1;
-      
-      // Função para adicionar nova página
-      const addNewPage = () => {
-        PDF.addPage();
-        yPosition = 20;
-        pageNumber++;
-      };
-      
-      // Função para verificar espaço na página
-      const checkPageSpace = (requiredSpace) => {
-        if (yPosition + requiredSpace > 250) {
-          addNewPage();
-        }
-      };
-      
-      // Processar cada item do relatório
-      dadosRelatorio.forEach((item, index) => {
-        checkPageSpace(50); // Verificar se há espaço suficiente
-        
-        // Cabeçalho do item
-        PDF.setFontSize(12);
-        PDF.setFont('helvetica', 'bold');
-        PDF.text(`${index + 1}. ${item.tipo.toUpperCase()}`, 20, yPosition);
-        yPosition += 8;
-        
-        // Caixa de contorno para cada processo
-        const startY = yPosition - 3;
-        
-        PDF.setFont('helvetica', 'normal');
-        PDF.setFontSize(9);
-        
-        // Informações básicas
-        if (item.numero) {
-          PDF.setFont('helvetica', 'bold');
-          PDF.text('Número:', 25, yPosition);
-          PDF.setFont('helvetica', 'normal');
-          PDF.text(item.numero, 50, yPosition);
-          yPosition += 5;
-        }
-        
-        if (item.descricao) {
-          PDF.setFont('helvetica', 'bold');
-          PDF.text('Descrição/Objeto:', 25, yPosition);
-          yPosition += 5;
-          PDF.setFont('helvetica', 'normal');
-          
-          // Quebrar texto longo
-          const splitText = PDF.splitTextToSize(item.descricao, 150);
-          PDF.text(splitText, 25, yPosition);
-          yPosition += splitText.length * 5;
-        }
-        
-        if (item.orgao) {
-          PDF.setFont('helvetica', 'bold');
-          PDF.text('Órgão Responsável:', 25, yPosition);
-          PDF.setFont('helvetica', 'normal');
-          PDF.text(item.orgao, 70, yPosition);
-          yPosition += 5;
-        }
-        
-        // Informações específicas por tipo
-        if (item.tipo === 'Licitação') {
-          // Campos específicos de licitação
-          if (item.modalidade) {
-            PDF.setFont('helvetica', 'bold');
-            PDF.text('Modalidade:', 25, yPosition);
-            PDF.setFont('helvetica', 'normal');
-            PDF.text(item.modalidade, 60, yPosition);
-            yPosition += 5;
-          }
-          
-          if (item.data_abertura) {
-            PDF.setFont('helvetica', 'bold');
-            PDF.text('Data de Abertura:', 25, yPosition);
-            PDF.setFont('helvetica', 'normal');
-            PDF.text(dayjs(item.data_abertura).format('DD/MM/YYYY'), 70, yPosition);
-            yPosition += 5;
-          }
-          
-          if (item.data_encerramento) {
-            PDF.setFont('helvetica', 'bold');
-            PDF.text('Data de Encerramento:', 25, yPosition);
-            PDF.setFont('helvetica', 'normal');
-            PDF.text(dayjs(item.data_encerramento).format('DD/MM/YYYY'), 80, yPosition);
-            yPosition += 5;
-          }
-          
-          if (item.valor_estimado) {
-            PDF.setFont('helvetica', 'bold');
-            PDF.text('Valor Estimado:', 25, yPosition);
-            PDF.setFont('helvetica', 'normal');
-            PDF.text(`R$ ${item.valor_estimado.toLocaleString('pt-BR', { minimumFractionDigits: 2 })}`, 65, yPosition);
-            yPosition += 5;
-          }
-          
-        } else if (item.tipo === 'Contrato') {
-          // Campos específicos de contrato
-          if (item.numero_contrato) {
-            PDF.setFont('helvetica', 'bold');
-            PDF.text('Número do Contrato:', 25, yPosition);
-            PDF.setFont('helvetica', 'normal');
-            PDF.text(item.numero_contrato, 75, yPosition);
-            yPosition += 5;
-          }
-          
-          if (item.data_assinatura) {
-            PDF.setFont('helvetica', 'bold');
-            PDF.text('Data de Assinatura:', 25, yPosition);
-            PDF.setFont('helvetica', 'normal');
-            PDF.text(dayjs(item.data_assinatura).format('DD/MM/YYYY'), 75, yPosition);
-            yPosition += 5;
-          }
-          
-          if (item.data_inicio) {
-            PDF.setFont('helvetica', 'bold');
-            PDF.text('Data de Início:', 25, yPosition);
-            PDF.setFont('helvetica', 'normal');
-            PDF.text(dayjs(item.data_inicio).format('DD/MM/YYYY'), 65, yPosition);
-            yPosition += 5;
-          }
-          
-          if (item.data_fim) {
-            PDF.setFont('helvetica', 'bold');
-            PDF.text('Data de Fim:', 25, yPosition);
-            PDF.setFont('helvetica', 'normal');
-            PDF.text(dayjs(item.data_fim).format('DD/MM/YYYY'), 60, yPosition);
-            yPosition += 5;
-          }
-          
-          if (item.valor_contrato) {
-            PDF.setFont('helvetica', 'bold');
-            PDF.text('Valor do Contrato:', 25, yPosition);
-            PDF.setFont('helvetica', 'normal');
-            PDF.text(`R$ ${item.valor_contrato.toLocaleString('pt-BR', { minimumFractionDigits: 2 })}`, 70, yPosition);
-            yPosition += 5;
-          }
-          
-          if (item.fornecedor) {
-            PDF.setFont('helvetica', 'bold');
-            PDF.text('Fornecedor:', 25, yPosition);
-            PDF.setFont('helvetica', 'normal');
-            PDF.text(item.fornecedor, 60, yPosition);
-            yPosition += 5;
-          }
-        }
-        
-        // Status
-        if (item.status) {
-          PDF.setFont('helvetica', 'bold');
-          PDF.text('Status:', 25, yPosition);
-          PDF.setFont('helvetica', 'normal');
-          PDF.text(item.status, 50, yPosition);
-          yPosition += 5;
-        }
-        
-        // Observações se houver
-        if (item.observacoes) {
-          PDF.setFont('helvetica', 'bold');
-          PDF.text('Observações:', 25, yPosition);
-          yPosition += 5;
-          PDF.setFont('helvetica', 'normal');
-          const splitObs = PDF.splitTextToSize(item.observacoes, 150);
-          PDF.text(splitObs, 25, yPosition);
-          yPosition += splitObs.length * 5;
-        }
-        
-        // Caixa de contorno
-        const endY = yPosition + 2;
-        PDF.rect(22, startY, 166, endY - startY);
-        
-        yPosition += 10; // Espaço entre processos
-      });
-      
-      // Resumo final
-      checkPageSpace(30);
-      PDF.setFontSize(12);
-      PDF.setFont('helvetica', 'bold');
-      PDF.text('RESUMO ESTATÍSTICO', 20, yPosition);
-      yPosition += 10;
-      
-      PDF.setFontSize(10);
-      PDF.setFont('helvetica', 'normal');
-      const totalLicitacoes = dadosRelatorio.filter(item => item.tipo === 'Licitação').length;
-      const totalContratos = dadosRelatorio.filter(item => item.tipo === 'Contrato').length;
-      
-      PDF.text(`Total de Licitações: ${totalLicitacoes}`, 20, yPosition);
-      yPosition += 6;
-      PDF.text(`Total de Contratos: ${totalContratos}`, 20, yPosition);
-      yPosition += 6;
-      PDF.text(`Total Geral de Processos: ${dadosRelatorio.length}`, 20, yPosition);
-
-      // Rodapé em todas as páginas
-      const totalPages = PDF.internal.getNumberOfPages();
-      for (let i = 1; i <= totalPages; i++) {
-        PDF.setPage(i);
-        PDF.setFontSize(8);
-        PDF.setFont('helvetica', 'normal');
-        PDF.text(`Relatório gerado em ${dataAtual} - Página ${i} de ${totalPages}`, 105, 285, { align: 'center' });
-        PDF.text('Sistema de Licitações e Contratos - SALC', 105, 292, { align: 'center' });
-      }
-
-      // Salvar o PDF
-      const nomeArquivo = `relatorio_completo_processos_${dayjs().format('YYYYMMDD_HHmm')}.pdf`;
-      console.log('Tentando salvar PDF completo com nome:', nomeArquivo);
-      
-      // Método de download forçado
-      try {
-        PDF.save(nomeArquivo);
-        console.log('PDF completo salvo usando doc.save()');
-      } catch (saveError) {
-        console.log('Erro com doc.save(), tentando método alternativo:', saveError);
-        
-        // Método alternativo usando blob
-        const pdfBlob = PDF.output('blob');
-        const url = URL.createObjectURL(pdfBlob);
-        const downloadLink = document.createElement('a');
-        downloadLink.href = url;
-        downloadLink.download = nomeArquivo;
-        downloadLink.style.display = 'none';
-        document.body.appendChild(downloadLink);
-        downloadLink.click();
-        document.body.removeChild(downloadLink);
-        URL.revokeObjectURL(url);
-        console.log('PDF completo salvo usando método de blob');
-      }
-      
-      alert(`PDF completo gerado com sucesso!\n\nContém informações detalhadas de ${dadosRelatorio.length} processos.\nO download deve começar automaticamente.`);
-      console.log('PDF completo gerado e download iniciado com sucesso!');
-      
+      const texto = await response.text();
+      const dadosFiltrados = texto
+        .split('\n')
+        .filter(linha => linha.trim())
+        .map(linha => JSON.parse(linha))
+        .map(item => ({ ...item, valor: item.valor ? Number(item.valor) : 'N/A' }));
+
+      setDadosRelatorio(dadosFiltrados);
+      setRelatorioGerado(true);
     } catch (error) {
-      console.error('Erro detalhado ao gerar PDF completo:', error);
-      alert(`Erro ao gerar PDF completo: ${error.message}\n\nVerifique o console do navegador para mais detalhes.`);
+      console.error('Erro ao gerar relatório:', error);
+    } finally {
+      setLoading(false);
     }
   };
 
+  // O PDF é gerado e enviado em streaming pelo backend
+  const gerarPDF = () => {
+    const downloadLink = document.createElement('a');
+    downloadLink.href = urlRelatorio('pdf');
+    downloadLink.style.display = 'none';
+    document.body.appendChild(downloadLink);
+    downloadLink.click();
+    document.body.removeChild(downloadLink);
+  };
+
   const limparFiltros = () => {
     setFiltros({
       tipoRelatorio: 'ambos',
@@ -22,6 +22,7 @@ const TestLogin = () => {
       console.log("Dados:", { username, password });
 
       const response = await fetch("http://127.0.0.1:8000/login", {
+        credentials: "include",
         method: "POST",
         headers: {
           "Content-Type": "application/x-www-form-urlencoded",
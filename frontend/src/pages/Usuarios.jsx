@@ -31,7 +31,7 @@ const Usuarios = () => {
   const fetchUsuarios = async () => {
     try {
       setLoading(true);
-      const response = await fetch("http://127.0.0.1:8000/usuarios/");
+      const response = await fetch("http://127.0.0.1:8000/usuarios/", { credentials: "include" });
       if (!response.ok) {
         throw new Error("Erro ao buscar usuários");
       }
@@ -2,6 +2,8 @@ import axios from "axios";
 
 const api = axios.create({
   baseURL: "http://127.0.0.1:8000", // URL do backend FastAPI
+  // Envia o cookie de leitura no primário depois de uma escrita (réplicas)
+  withCredentials: true,
 });
 
 export default api;
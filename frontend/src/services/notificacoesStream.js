@@ -0,0 +1,17 @@
+// Conexão SSE com o backend: notificações novas chegam sem polling.
+// O navegador reconecta sozinho enviando Last-Event-ID, e o backend reenvia as perdidas.
+export const abrirStreamNotificacoes = ({ onNotificacao, onSincronizar }) => {
+  const user = JSON.parse(localStorage.getItem("user") || "{}");
+  const url = user.id
+    ? `http://127.0.0.1:8000/notificacoes/stream?usuario_id=${user.id}`
+    : "http://127.0.0.1:8000/notificacoes/stream";
+
+  const fonte = new EventSource(url);
+  fonte.addEventListener("notificacao", (e) => onNotificacao(JSON.parse(e.data)));
+  // Eventos descartados no servidor: recarregar a lista/contagem
+  fonte.addEventListener("sincronizar", () => onSincronizar());
+  return () => fonte.close();
+};
+
+// Disparado na window quando o estado de leitura muda (badge da Sidebar recarrega a contagem)
+export const NOTIFICACOES_ALTERADAS = "notificacoes-alteradas";